@@ -0,0 +1,8 @@
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app
+
+# ASGI entry point, e.g. `uvicorn asgi:asgi_app --workers 1`.
+# LLM calls already run on the dispatcher's event loop, so request threads are
+# only held for the configured LLM_DEADLINE_SECONDS at most.
+asgi_app = WsgiToAsgi(app)
@@ -0,0 +1,55 @@
+# Production server: gunicorn -c gunicorn.conf.py app:app
+#
+# The app (and GravityOrchestrator) is imported once in the master, warmed up and
+# then forked, so workers start instantly and share the preloaded pages.
+# Streaming sessions live in worker memory: route a session's requests to one
+# worker (sticky load balancing) or run a single worker with more threads.
+import multiprocessing
+import os
+import time
+
+from gunicorn.workers.gthread import ThreadWorker
+
+bind = os.getenv("BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+
+
+class QueueTimedThreadWorker(ThreadWorker):
+    """
+    gthread worker that records when each request was queued for a thread, so
+    admission control (services/admission.py) sees in-process queueing even
+    without a proxy-set X-Request-Start.
+    """
+
+    def enqueue_req(self, conn):
+        conn.queued_at = time.time()
+        super().enqueue_req(conn)
+
+    def handle(self, conn):
+        from services.admission import note_request_queued
+        note_request_queued(getattr(conn, "queued_at", None))
+        return super().handle(conn)
+
+
+# Threads cover requests waiting on the LLM deadline and open SSE streams
+# (admission control defaults to one in-flight tick per thread, see WEB_THREADS)
+worker_class = QueueTimedThreadWorker
+threads = int(os.getenv("WEB_THREADS", "8"))
+preload_app = True
+timeout = int(os.getenv("WEB_TIMEOUT", "60"))
+keepalive = 5
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("WEB_ACCESS_LOG") or None
+
+
+def when_ready(server):
+    # Runs in the master after the preloaded app is imported, before workers fork
+    import app
+    app.warm_up()
+    server.log.info("Warm-up complete; forking %s workers", workers)
+
+
+def post_fork(server, worker):
+    import app
+    app.after_fork()
@@ -0,0 +1,371 @@
+import argparse
+import contextlib
+import datetime
+import gc
+import http.client
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from scripts.synthetic_timelines import generate_timeline
+
+# Scenario name -> function(app_module, args) -> result dict. Later scenarios
+# register themselves here with @scenario.
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+def latency_summary(latencies, elapsed):
+    """
+    req/s and p50/p95/p99 (milliseconds) for a list of per-request latencies in seconds.
+    """
+    ordered = sorted(latencies)
+    n = len(ordered)
+
+    def pct(p):
+        if not n:
+            return 0.0
+        return round(ordered[min(n - 1, int(p / 100.0 * n))] * 1000, 3)
+
+    return {
+        "requests": n,
+        "seconds": round(elapsed, 4),
+        "req_per_sec": round(n / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": round(ordered[-1] * 1000, 3) if n else 0.0
+    }
+
+
+def make_timelines(args):
+    return [
+        generate_timeline(
+            seed=i, duration=args.duration, rate_hz=args.rate, total_slides=args.slides,
+            words_per_second=args.words_per_second, number_density=args.number_density,
+            session_id=f"bench-{i}"
+        )
+        for i in range(args.sessions)
+    ]
+
+
+@scenario("pipeline")
+def bench_pipeline(app_module, args):
+    """
+    analyze_frame called directly: the pipeline cost without any HTTP layer.
+    """
+    from services.pipeline import analyze_frame
+    latencies = []
+    start = time.perf_counter()
+    for timeline in make_timelines(args):
+        for frame in timeline:
+            t0 = time.perf_counter()
+            analyze_frame(frame, app_module.dispatcher)
+            latencies.append(time.perf_counter() - t0)
+    return latency_summary(latencies, time.perf_counter() - start)
+
+
+@scenario("testclient")
+def bench_test_client(app_module, args):
+    """
+    /analyze through the Flask test client (routing, JSON parse/encode, no sockets).
+    """
+    client = app_module.app.test_client()
+    bodies = [[json.dumps(f) for f in timeline] for timeline in make_timelines(args)]
+    latencies = []
+    start = time.perf_counter()
+    for timeline in bodies:
+        for body in timeline:
+            t0 = time.perf_counter()
+            response = client.post('/analyze', data=body, content_type='application/json')
+            response.get_data()
+            latencies.append(time.perf_counter() - t0)
+    return latency_summary(latencies, time.perf_counter() - start)
+
+
+@scenario("server")
+def bench_server(app_module, args):
+    """
+    /analyze on a real local threaded server with `--concurrency` clients,
+    each replaying one session timeline.
+    """
+    from werkzeug.serving import WSGIRequestHandler, make_server
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_request(self, *args, **kwargs):
+            pass
+
+    server = make_server("127.0.0.1", 0, app_module.app, threaded=True, request_handler=QuietHandler)
+    port = server.server_port
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def run_session(timeline):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        latencies = []
+        errors = 0
+        for frame in timeline:
+            body = json.dumps(frame)
+            t0 = time.perf_counter()
+            try:
+                conn.request("POST", "/analyze", body=body, headers={"Content-Type": "application/json"})
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    errors += 1
+            except (OSError, http.client.HTTPException):
+                errors += 1
+                conn.close()
+            latencies.append(time.perf_counter() - t0)
+        conn.close()
+        return latencies, errors
+
+    timelines = make_timelines(args)
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(run_session, timelines))
+        # Before shutdown, which waits out serve_forever's poll interval
+        elapsed = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    summary = latency_summary([l for lat, _ in results for l in lat], elapsed)
+    summary["errors"] = sum(e for _, e in results)
+    summary["concurrency"] = args.concurrency
+    return summary
+
+
+@scenario("session_memory")
+def bench_session_memory(app_module, args):
+    """
+    Retained memory per streaming session after replaying its frames as deltas.
+    """
+    client = app_module.app.test_client()
+    timelines = make_timelines(args)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    created = []
+    latencies = []
+    start = time.perf_counter()
+    for timeline in timelines:
+        session_id = client.post('/sessions', json={"deck_content": timeline[0]["deck_content"]}).get_json()["session_id"]
+        created.append(session_id)
+        spoken = 0
+        for frame in timeline:
+            text = frame["audio_analysis"]["transcription"]
+            delta = {
+                "current_timestamp": frame["current_timestamp"],
+                "transcript_delta": text[spoken:].strip(),
+                "video_analysis": frame["video_analysis"],
+                "deck_content": frame["deck_content"]
+            }
+            spoken = len(text)
+            t0 = time.perf_counter()
+            client.post(f'/sessions/{session_id}/frames', json=delta)
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    for session_id in created:
+        client.delete(f'/sessions/{session_id}')
+
+    summary = latency_summary(latencies, elapsed)
+    summary["bytes_per_session"] = int((after - before) / max(1, len(created)))
+    return summary
+
+
+@scenario("serialize")
+def bench_serialize(app_module, args):
+    """
+    Response encoding only: Flask's jsonify versus the fast path used by /analyze.
+    """
+    from flask import jsonify
+
+    from services import models
+    from services.pipeline import analyze_frame
+
+    responses = [analyze_frame(frame) for timeline in make_timelines(args) for frame in timeline]
+    with app_module.app.app_context():
+        start = time.perf_counter()
+        for response in responses:
+            jsonify(response).get_data()
+        baseline = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for response in responses:
+        app_module._json_response(response).get_data()
+    fast = time.perf_counter() - start
+
+    n = len(responses)
+    return {
+        "requests": n,
+        "encoder": "orjson" if models.orjson is not None else "json",
+        "jsonify_us": round(baseline / n * 1e6, 2),
+        "fast_us": round(fast / n * 1e6, 2),
+        "speedup": round(baseline / fast, 2) if fast else 0.0
+    }
+
+
+@scenario("wire_format")
+def bench_wire_format(app_module, args):
+    """
+    Request parsing and response encoding per tick: Flask's get_json versus the
+    JSON and MessagePack paths of /analyze, plus payload sizes.
+    """
+    from services import wire
+    from services.pipeline import analyze_frame
+
+    if wire.msgpack is None:
+        return {"skipped": "msgpack is not installed"}
+    frames = [frame for timeline in make_timelines(args) for frame in timeline]
+    responses = [analyze_frame(frame) for frame in frames]
+    json_bodies = [json.dumps(frame).encode("utf-8") for frame in frames]
+    msgpack_bodies = [wire.encode_payload(frame, wire.MSGPACK) for frame in frames]
+
+    def per_request(fn, items):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        return round((time.perf_counter() - start) / len(items) * 1e6, 2)
+
+    def get_json(body):
+        with app_module.app.test_request_context(method="POST", data=body, content_type=wire.JSON):
+            app_module.request.get_json()
+
+    def payload(mimetype):
+        def parse(body):
+            with app_module.app.test_request_context(method="POST", data=body, content_type=mimetype):
+                app_module._payload()
+        return parse
+
+    n = len(frames)
+    return {
+        "requests": n,
+        "parse_get_json_us": per_request(get_json, json_bodies),
+        "parse_json_us": per_request(payload(wire.JSON), json_bodies),
+        "parse_msgpack_us": per_request(payload(wire.MSGPACK), msgpack_bodies),
+        "decode_json_us": per_request(lambda body: wire.decode_payload(body, wire.JSON), json_bodies),
+        "decode_msgpack_us": per_request(lambda body: wire.decode_payload(body, wire.MSGPACK), msgpack_bodies),
+        "encode_json_us": per_request(lambda response: wire.encode_payload(response, wire.JSON), responses),
+        "encode_msgpack_us": per_request(lambda response: wire.encode_payload(response, wire.MSGPACK), responses),
+        "request_bytes_json": round(sum(map(len, json_bodies)) / n, 1),
+        "request_bytes_msgpack": round(sum(map(len, msgpack_bodies)) / n, 1),
+        "response_bytes_json": round(sum(len(wire.encode_payload(r, wire.JSON)) for r in responses) / n, 1),
+        "response_bytes_msgpack": round(sum(len(wire.encode_payload(r, wire.MSGPACK)) for r in responses) / n, 1)
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(previous_path, current):
+    with open(previous_path, "r", encoding="utf-8") as fh:
+        previous = json.load(fh)
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('commit')}):")
+    for name, result in current["results"].items():
+        old = previous.get("results", {}).get(name)
+        if not old:
+            continue
+        for key in ("req_per_sec", "p50_ms", "p95_ms", "p99_ms", "bytes_per_session"):
+            if key in result and key in old and old[key]:
+                change = (result[key] - old[key]) / old[key] * 100
+                print(f"  {name:16s} {key:18s} {old[key]:>10} -> {result[key]:>10} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput/latency benchmarks for the /analyze pipeline.")
+    parser.add_argument("--scenarios", default="pipeline,testclient,server,session_memory",
+                        help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--sessions", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds of pitch per session.")
+    parser.add_argument("--rate", type=float, default=2.0, help="Frames per second.")
+    parser.add_argument("--slides", type=int, default=10)
+    parser.add_argument("--words-per-second", type=float, default=2.5)
+    parser.add_argument("--number-density", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients for the server scenario.")
+    parser.add_argument("--llm-latency", type=float, default=None,
+                        help="Enable the LLM path against a local stub with this latency (seconds).")
+    parser.add_argument("--llm-deadline", type=float, default=None, help="Override LLM_DEADLINE_SECONDS.")
+    parser.add_argument("--llm-backend", default=None, choices=["openai", "rules"],
+                        help="LLM_BACKEND; 'rules' runs the LLM path offline with the local rules model.")
+    parser.add_argument("--out", default=None, help="Result JSON path (default bench_results/<commit>-<time>.json).")
+    parser.add_argument("--compare", default=None, help="Previous result JSON to diff against.")
+    args = parser.parse_args()
+
+    stub = None
+    if args.llm_latency is not None:
+        stub = FakeOpenAIServer(delay=args.llm_latency).start()
+        os.environ["OPENAI_API_KEY"] = "bench"
+        os.environ["OPENAI_BASE_URL"] = stub.base_url
+        os.environ.setdefault("LLM_CACHE_SIZE", "0")
+    else:
+        os.environ.pop("OPENAI_API_KEY", None)
+    if args.llm_backend is not None:
+        os.environ["LLM_BACKEND"] = args.llm_backend
+    if args.llm_deadline is not None:
+        os.environ["LLM_DEADLINE_SECONDS"] = str(args.llm_deadline)
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        import app as app_module
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args)
+        },
+        "results": {}
+    }
+
+    try:
+        for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+            if name not in SCENARIOS:
+                print(f"Unknown scenario: {name}")
+                continue
+            # Pipeline logging would dominate the measurements
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                result = SCENARIOS[name](app_module, args)
+            report["results"][name] = result
+            print(f"{name:16s} " + "  ".join(f"{k}={v}" for k, v in result.items()))
+    finally:
+        if stub is not None:
+            stub.stop()
+
+    out = args.out or os.path.join("bench_results", f"{report['meta']['commit']}-{int(time.time())}.json")
+    os.makedirs(os.path.dirname(out) or ".", exist_ok=True)
+    with open(out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"\nResults written to {out}")
+
+    if args.compare:
+        compare(args.compare, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.batch import iter_jsonl
+from services.vectorized import calibrate_budget_shares, slide_dwell_columns
+
+
+def load_columns(paths):
+    """
+    Reads recorded sessions (one JSONL timeline per file) into per-deck-size
+    columns: total_slides -> (session_codes, timestamps, slides).
+    """
+    columns = {}
+    sessions_per_size = {}
+    for path in paths:
+        session = None
+        for frame in iter_jsonl(path):
+            deck = frame.get("deck_content", {})
+            if session is None:
+                total_slides = int(deck.get("total_slides", 0) or 0)
+                if total_slides <= 0:
+                    break
+                codes, timestamps, slides = columns.setdefault(total_slides, ([], [], []))
+                session = sessions_per_size.get(total_slides, 0)
+                sessions_per_size[total_slides] = session + 1
+            codes.append(session)
+            timestamps.append(float(frame.get("current_timestamp", 0)))
+            slides.append(int(deck.get("current_slide_number", 0) or 0))
+    return columns
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate per-slide pacing budgets from recorded pitches.")
+    parser.add_argument("inputs", nargs="+", help="Session JSONL files or glob patterns.")
+    parser.add_argument("--out", default="pacing_budgets.json",
+                        help="Budget file to write (load it with PACING_BUDGETS_PATH).")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.inputs for p in glob.glob(pattern)})
+    if not paths:
+        print("No input files matched.")
+        return 1
+
+    start = time.perf_counter()
+    columns = load_columns(paths)
+    loaded = time.perf_counter()
+
+    budgets = {}
+    for total_slides, (codes, timestamps, slides) in sorted(columns.items()):
+        dwell = slide_dwell_columns(codes, timestamps, slides, total_slides)
+        budgets[str(total_slides)] = [round(share, 4) for share in calibrate_budget_shares(dwell)]
+        print(f"{total_slides:3d} slides: {dwell.shape[0]} sessions -> shares {budgets[str(total_slides)]}")
+    finished = time.perf_counter()
+
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(budgets, fh, indent=2)
+    print(f"Read {len(paths)} sessions in {loaded - start:.2f}s, calibrated in {finished - loaded:.3f}s -> {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,9 @@
-from app import app
+import os
+
+# Persist LLM responses on disk so repeated demo runs never hit the API twice.
+os.environ.setdefault("LLM_CACHE_PATH", ".llm_cache.sqlite")
+
+from app import app, orchestrator
 import json
 
 def run_demo():
@@ -64,5 +69,8 @@ def run_demo():
             print("ALERTS: None")
         print("\n")
 
+    if orchestrator.cache is not None:
+        print(f"LLM cache: {orchestrator.cache.stats()}")
+
 if __name__ == "__main__":
     run_demo()
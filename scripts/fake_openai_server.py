@@ -0,0 +1,216 @@
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_CONTENT = {
+    "tiered_analysis": {
+        "coherence_score": 88,
+        "delivery_confidence": 82,
+        "slide_quality": 90
+    },
+    "real_time_feedback": [
+        {"timestamp": "01:00", "type": "KUDOS", "message": "Clear and confident delivery."}
+    ]
+}
+
+
+class FakeOpenAIServer:
+    """
+    Minimal local stand-in for the OpenAI chat completions API.
+
+    Point the orchestrator at `server.base_url` to exercise the LLM path without
+    network access. `delay` (seconds) is injected before every response so
+    deadline and fallback behaviour can be tested deterministically.
+
+    `error_statuses` is a list of HTTP statuses (e.g. [429, 429, 503]) returned,
+    in order, before the server starts answering normally; `retry_after` adds a
+    Retry-After header to those error responses.
+
+    Requests with `"stream": true` get Server-Sent Events chat.completion.chunk
+    deltas of `stream_chunk_chars` characters, `stream_delay` seconds apart, so
+    incremental parsing can be tested against a slow stream.
+
+    Batched requests (user message with "### Pitch <id>" sections, see
+    services/llm_batcher.py) are answered with `{"evaluations": {id: content}}`.
+    """
+
+    def __init__(self, delay=0.0, content=None, host="127.0.0.1", port=0, error_statuses=None, retry_after=None,
+                 stream_delay=0.0, stream_chunk_chars=16):
+        self.delay = delay
+        self.stream_delay = stream_delay
+        self.stream_chunk_chars = stream_chunk_chars
+        self.content = DEFAULT_CONTENT if content is None else content
+        self.error_statuses = list(error_statuses or [])
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _record(self, body):
+        with self._lock:
+            self.request_count += 1
+            self.requests.append(body)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.error_statuses.pop(0) if self.error_statuses else None
+
+    def _done(self):
+        with self._lock:
+            self.in_flight -= 1
+
+    def _content(self, body=None):
+        pitch_ids = _batch_ids(body)
+        if pitch_ids and not isinstance(self.content, str):
+            return json.dumps({"evaluations": {pitch_id: self.content for pitch_id in pitch_ids}})
+        return self.content if isinstance(self.content, str) else json.dumps(self.content)
+
+    def _chunks(self, body, include_usage):
+        """
+        chat.completion.chunk payloads for a streamed response.
+        """
+        content = self._content(body)
+        base = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()), "model": "gpt-4o"}
+        yield {**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}]}
+        for start in range(0, len(content), self.stream_chunk_chars):
+            piece = content[start:start + self.stream_chunk_chars]
+            yield {**base, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+        yield {**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+        if include_usage:
+            yield {**base, "choices": [], "usage": {"prompt_tokens": 600, "completion_tokens": 80, "total_tokens": 680}}
+
+    def _completion(self, body=None):
+        content = self._content(body)
+        return {
+            "id": "chatcmpl-fake",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {"prompt_tokens": 600, "completion_tokens": 80, "total_tokens": 680}
+        }
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                raw = self.rfile.read(length) if length else b""
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    body = {}
+                error_status = server._record(body)
+                try:
+                    if not self.path.endswith("/chat/completions"):
+                        self._send(404, {"error": {"message": "Not found"}})
+                        return
+
+                    if server.delay:
+                        time.sleep(server.delay)
+
+                    if error_status:
+                        headers = {"Retry-After": str(server.retry_after)} if server.retry_after is not None else {}
+                        self._send(error_status, {"error": {"message": f"Injected {error_status}", "type": "fake_error"}}, headers)
+                        return
+
+                    if body.get("stream"):
+                        include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+                        self._stream(server._chunks(body, include_usage))
+                    else:
+                        self._send(200, server._completion(body))
+                finally:
+                    server._done()
+
+            def _send(self, status, payload, headers=None):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Client gave up (e.g. deadline hit); nothing to do.
+                    pass
+
+            def _stream(self, chunks):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                try:
+                    for index, chunk in enumerate(chunks):
+                        if index and server.stream_delay:
+                            time.sleep(server.stream_delay)
+                        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                        self.wfile.flush()
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def _batch_ids(body):
+    messages = (body or {}).get("messages") or []
+    if not messages:
+        return []
+    return re.findall(r"^### Pitch (\S+)$", str(messages[-1].get("content", "")), re.MULTILINE)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI chat completions server.")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response.")
+    parser.add_argument("--stream-delay", type=float, default=0.0, help="Seconds between streamed chunks.")
+    args = parser.parse_args()
+
+    srv = FakeOpenAIServer(delay=args.delay, port=args.port, stream_delay=args.stream_delay).start()
+    print(f"Fake OpenAI server listening on {srv.base_url} (delay={args.delay}s)")
+    print(f"Run the app with OPENAI_BASE_URL={srv.base_url} OPENAI_API_KEY=test")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()
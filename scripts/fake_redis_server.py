@@ -0,0 +1,141 @@
+import socketserver
+import threading
+import time
+
+
+class FakeRedisServer:
+    """
+    Minimal in-process stand-in for Redis (RESP2 over TCP) covering the commands
+    the session store uses: PING, GET, SET [EX seconds], DEL, EXPIRE, TTL, SELECT,
+    FLUSHALL. Lets multi-worker session sharing be tested without a Redis install.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self.data = {}  # key -> (value bytes, expires_at | None)
+        self.command_count = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"redis://{host}:{port}/0"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _get(self, key):
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            del self.data[key]
+            return None
+        return value
+
+    def handle(self, args):
+        command = args[0].upper()
+        with self._lock:
+            self.command_count += 1
+            if command == b"PING":
+                return "+PONG"
+            if command in (b"SELECT", b"AUTH"):
+                return "+OK"
+            if command == b"FLUSHALL":
+                self.data.clear()
+                return "+OK"
+            if command == b"GET":
+                return self._get(args[1])
+            if command == b"SET":
+                expires_at = None
+                if len(args) >= 5 and args[3].upper() == b"EX":
+                    expires_at = time.monotonic() + int(args[4])
+                self.data[args[1]] = (args[2], expires_at)
+                return "+OK"
+            if command == b"DEL":
+                removed = 0
+                for key in args[1:]:
+                    if self._get(key) is not None:
+                        del self.data[key]
+                        removed += 1
+                return removed
+            if command == b"EXPIRE":
+                value = self._get(args[1])
+                if value is None:
+                    return 0
+                self.data[args[1]] = (value, time.monotonic() + int(args[2]))
+                return 1
+            if command == b"TTL":
+                entry = self.data.get(args[1]) if self._get(args[1]) is not None else None
+                if entry is None:
+                    return -2
+                return -1 if entry[1] is None else int(entry[1] - time.monotonic())
+        return f"-ERR unknown command '{command.decode()}'"
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while True:
+                    args = self._read_command()
+                    if args is None:
+                        return
+                    self.wfile.write(_encode(server.handle(args)))
+                    self.wfile.flush()
+
+            def _read_command(self):
+                line = self.rfile.readline()
+                if not line:
+                    return None
+                if not line.startswith(b"*"):
+                    return line.strip().split()  # inline command (e.g. from telnet)
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int(self.rfile.readline()[1:-2])
+                    args.append(self.rfile.read(length + 2)[:-2])
+                return args
+
+        return Handler
+
+
+def _encode(reply):
+    if reply is None:
+        return b"$-1\r\n"
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if isinstance(reply, bytes):
+        return b"$%d\r\n%s\r\n" % (len(reply), reply)
+    return reply.encode("utf-8") + b"\r\n"  # "+OK" / "-ERR ..."
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a fake Redis server for local multi-worker testing.")
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+
+    srv = FakeRedisServer(port=args.port).start()
+    print(f"Fake Redis listening on {srv.url}")
+    print(f"Run the app with SESSION_STORE_URL={srv.url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()
@@ -0,0 +1,42 @@
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.batch import replay_files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-score recorded pitch sessions (one JSONL timeline per file).")
+    parser.add_argument("inputs", nargs="+", help="Session JSONL files or glob patterns.")
+    parser.add_argument("--out", default="replay_output", help="Directory for <session>.scores.jsonl results.")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count).")
+    parser.add_argument("--report", action="store_true",
+                        help="Write one <session>.report.json end-of-pitch report per session instead of per-frame scores.")
+    args = parser.parse_args()
+
+    paths = sorted({p for pattern in args.inputs for p in glob.glob(pattern)})
+    if not paths:
+        print("No input files matched.")
+        return 1
+
+    start = time.perf_counter()
+    total_frames = 0
+    try:
+        for path, frames in replay_files(paths, args.out, workers=args.workers, reports=args.report):
+            total_frames += frames
+            print(f"{path}: {frames} frames")
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+
+    elapsed = time.perf_counter() - start
+    rate = total_frames / elapsed if elapsed else 0
+    print(f"Replayed {len(paths)} sessions / {total_frames} frames in {elapsed:.2f}s ({rate:.0f} frames/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from scripts.fake_openai_server import FakeOpenAIServer
+
+# Runs in a fresh interpreter: import time, first /analyze latency, peak RSS
+COLD_START_PROBE = r"""
+import json, resource, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+client = app.app.test_client()
+client.post('/analyze', json=app.WARMUP_FRAME).get_data()
+t2 = time.perf_counter()
+print(json.dumps({
+    "import_s": t1 - t0,
+    "first_request_s": t2 - t1,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "openai_loaded": "openai" in sys.modules
+}))
+"""
+
+# Preload + warm-up in a parent, then fork workers the way gunicorn does and
+# report each worker's private (unshared) memory after serving a few requests.
+FORK_PROBE = r"""
+import json, os, sys
+import app
+app.warm_up()
+
+def private_mb():
+    total = 0
+    with open("/proc/self/smaps_rollup") as fh:
+        for line in fh:
+            if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                total += int(line.split()[1])
+    return total / 1024
+
+workers = int(sys.argv[1])
+pipes = []
+for _ in range(workers):
+    read_fd, write_fd = os.pipe()
+    if os.fork() == 0:
+        os.close(read_fd)
+        app.after_fork()
+        client = app.app.test_client()
+        for _ in range(20):
+            client.post('/analyze', json=app.WARMUP_FRAME).get_data()
+        os.write(write_fd, json.dumps({"private_mb": private_mb()}).encode())
+        os._exit(0)
+    os.close(write_fd)
+    pipes.append(read_fd)
+
+results = []
+for fd in pipes:
+    with os.fdopen(fd) as fh:
+        results.append(json.loads(fh.read()))
+    os.wait()
+print(json.dumps({"workers": workers, "private_mb": [round(r["private_mb"], 1) for r in results]}))
+"""
+
+
+def run_probe(code, env, *argv):
+    output = subprocess.check_output(
+        [sys.executable, "-c", code, *argv], cwd=ROOT, env=env, stderr=subprocess.DEVNULL
+    )
+    return json.loads(output.decode().strip().splitlines()[-1])
+
+
+def probe_env(mode, base_url=None):
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)
+    env.pop("OPENAI_BASE_URL", None)
+    env["LLM_CACHE_SIZE"] = "0"
+    if mode == "llm":
+        env["OPENAI_API_KEY"] = "bench"
+        env["OPENAI_BASE_URL"] = base_url
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start and per-worker memory benchmark.")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts per mode (median is reported).")
+    parser.add_argument("--workers", type=int, default=4, help="Forked workers for the memory probe (0 skips it).")
+    parser.add_argument("--modes", default="heuristic,llm", help="heuristic (no API key) and/or llm (local stub).")
+    args = parser.parse_args()
+
+    with FakeOpenAIServer() as stub:
+        for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+            env = probe_env(mode, stub.base_url)
+            runs = [run_probe(COLD_START_PROBE, env) for _ in range(args.runs)]
+            print(
+                f"{mode:10s} import={statistics.median(r['import_s'] for r in runs) * 1000:.0f}ms "
+                f"first_request={statistics.median(r['first_request_s'] for r in runs) * 1000:.1f}ms "
+                f"max_rss={statistics.median(r['max_rss_mb'] for r in runs):.1f}MB "
+                f"openai_loaded={runs[0]['openai_loaded']}"
+            )
+            if args.workers and sys.platform.startswith("linux"):
+                result = run_probe(FORK_PROBE, env, str(args.workers))
+                print(f"{'':10s} forked {result['workers']} workers, private memory per worker (MB): {result['private_mb']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import json
+import random
+
+TOPICS = ["Intro", "Market Pain", "Solution", "Business Model", "Traction", "Market", "Competition", "Team", "Ask"]
+EMOTIONS = ["Neutral", "Happy", "Neutral", "Fear", "Sad", "Neutral"]
+WORDS = ("we our customers growth platform market revenue product team users pipeline "
+         "enterprise pilot scale churn retention launch data quarter investors").split()
+
+
+def generate_timeline(seed=0, duration=180.0, rate_hz=2.0, total_slides=10,
+                      words_per_second=2.5, number_density=0.05, session_id=None):
+    """
+    Builds a synthetic pitch as a list of cumulative `/analyze` frames.
+
+    Args:
+        seed (int): RNG seed (timelines are reproducible).
+        duration (float): Pitch length in seconds.
+        rate_hz (float): Frames per second.
+        total_slides (int): Slides in the deck; advanced evenly over the pitch.
+        words_per_second (float): Speaking rate; drives transcript growth.
+        number_density (float): Probability that a spoken word is a number.
+        session_id (str | None): Copied into every frame.
+    """
+    rng = random.Random(seed)
+    slide_ocr = {}
+    for slide in range(1, total_slides + 1):
+        nums = " ".join(f"{rng.randint(1, 500)}{rng.choice(['', 'k', 'M', '%'])}" for _ in range(rng.randint(0, 3)))
+        body = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 30)))
+        slide_ocr[slide] = f"{TOPICS[(slide - 1) % len(TOPICS)]}: {body} {nums}".strip()
+
+    frames = []
+    transcript = []
+    frame_count = int(duration * rate_hz)
+    words_per_frame = words_per_second / rate_hz
+    owed = 0.0
+    emotion = "Neutral"
+    for i in range(frame_count):
+        t = round(i / rate_hz, 3)
+        slide = min(total_slides, 1 + int(t / duration * total_slides))
+
+        owed += words_per_frame
+        while owed >= 1:
+            owed -= 1
+            if rng.random() < number_density:
+                transcript.append(str(rng.randint(1, 500)))
+            else:
+                transcript.append(rng.choice(WORDS))
+
+        if rng.random() < 0.05:
+            emotion = rng.choice(EMOTIONS)
+
+        frame = {
+            "current_timestamp": t,
+            "audio_analysis": {"transcription": " ".join(transcript), "wpm": int(words_per_second * 60)},
+            "video_analysis": {
+                "facial_confidence": rng.randint(40, 99),
+                "eye_contact_percent": rng.randint(30, 99),
+                "emotional_tone": emotion
+            },
+            "deck_content": {
+                "current_slide_number": slide,
+                "total_slides": total_slides,
+                "slide_topic": TOPICS[(slide - 1) % len(TOPICS)],
+                "ocr_text": slide_ocr[slide]
+            }
+        }
+        if session_id:
+            frame["session_id"] = session_id
+        frames.append(frame)
+    return frames
+
+
+def write_jsonl(frames, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        for frame in frames:
+            fh.write(json.dumps(frame, separators=(",", ":")))
+            fh.write("\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Write synthetic pitch timelines as JSONL session files.")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--out", default="synthetic_sessions")
+    parser.add_argument("--duration", type=float, default=180.0)
+    parser.add_argument("--rate", type=float, default=2.0)
+    args = parser.parse_args()
+
+    import os
+    os.makedirs(args.out, exist_ok=True)
+    for n in range(args.sessions):
+        path = os.path.join(args.out, f"session_{n:05d}.jsonl")
+        write_jsonl(generate_timeline(seed=n, duration=args.duration, rate_hz=args.rate), path)
+    print(f"Wrote {args.sessions} sessions to {args.out}/")
@@ -4,7 +4,7 @@ def verify_openai():
     print("Verifying Gravity Orchestrator (OpenAI GPT-4o Integration)...")
     orchestrator = GravityOrchestrator()
     
-    if not orchestrator.client:
+    if orchestrator.backend is None or orchestrator.backend.name != "openai":
         print("[!] SKIPPED: OPENAI_API_KEY not found in environment.")
         print("    The system is running in HEURISTIC FALLBACK mode.")
         return
@@ -0,0 +1,170 @@
+import itertools
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from services.metrics import REGISTRY
+
+# Service tiers, best first. Each step sheds the most expensive remaining work.
+FULL = "full"                    # LLM on every due tick
+LLM_SAMPLED = "llm_sampled"      # LLM on every Nth tick, heuristics in between
+HEURISTIC = "heuristic"          # analyze_coherence / calculate_scores only
+PACING_ONLY = "pacing_only"      # analyze_pacing (and progress) only
+REJECTED = "rejected"            # 503 with Retry-After
+
+SERVICE_TIERS = (FULL, LLM_SAMPLED, HEURISTIC, PACING_ONLY)
+
+# One request per worker thread (gunicorn.conf.py reads WEB_THREADS too)
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("WEB_THREADS", "8"))
+# Outstanding LLM calls (awaited or parked after their deadline) per admission slot
+# that count as full load
+LLM_CALLS_PER_SLOT = 4
+DEFAULT_TARGET_QUEUE_MS = 100
+DEFAULT_SAMPLE_EVERY = 3
+QUEUE_DELAY_ALPHA = 0.2
+RETRY_AFTER_SECONDS = 1
+
+# Load (0..1+) below which each tier is served; at 1.0 and above requests are rejected
+TIER_THRESHOLDS = ((0.5, FULL), (0.7, LLM_SAMPLED), (0.85, HEURISTIC), (1.0, PACING_ONLY))
+
+SERVICE_TIER_TOTAL = REGISTRY.counter(
+    "pitch_service_tier_total", "Requests by the service tier they were admitted at (or rejected).", ("tier",)
+)
+
+_stateless_ticks = itertools.count()
+# Set by the server thread that picks a request up (see note_request_queued)
+_queued = threading.local()
+
+
+def parse_request_start(header, now=None):
+    """
+    Seconds a request waited in front of the app, from an `X-Request-Start`
+    header set by the proxy ("t=1700000000.123", in s, ms or µs). None when the
+    header is absent or unreadable.
+    """
+    if not header:
+        return None
+    try:
+        started = float(header.strip().removeprefix("t="))
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6   # microseconds
+    elif started > 1e11:
+        started /= 1e3   # milliseconds
+    now = time.time() if now is None else now
+    return max(0.0, now - started)
+
+
+def note_request_queued(queued_at):
+    """
+    Records, on the thread about to handle a request, when the request was queued
+    for a worker thread (time.time()). gunicorn.conf.py's worker calls this so
+    queueing inside the process counts even without a proxy X-Request-Start.
+    """
+    _queued.at = queued_at
+
+
+def local_queue_delay(now=None):
+    """
+    Seconds the current thread's request waited for a worker thread, or None when
+    the server did not record it. Consumed on read.
+    """
+    queued_at = getattr(_queued, "at", None)
+    if queued_at is None:
+        return None
+    _queued.at = None
+    now = time.time() if now is None else now
+    return max(0.0, now - queued_at)
+
+
+def should_sample_llm(session_state=None, every=DEFAULT_SAMPLE_EVERY):
+    """
+    Whether an LLM_SAMPLED tick may call the LLM: every `every`th tick of the
+    session, or of the process for callers without session state.
+    """
+    tick = session_state.ticks if session_state is not None else next(_stateless_ticks)
+    return tick % every == 0
+
+
+class AdmissionController:
+    """
+    Admission control in front of the per-tick pipeline.
+
+    Load is the largest of in-flight requests over `max_in_flight` (by default
+    the worker's thread count), outstanding LLM calls from `llm_calls` over
+    LLM_CALLS_PER_SLOT per slot, and the smoothed queue delay (proxy header or
+    in-process wait) over `target_queue_seconds`. As load rises,
+    requests are admitted at progressively cheaper service tiers
+    (TIER_THRESHOLDS) before any are rejected, so quality degrades one step at
+    a time instead of every request timing out together.
+    """
+
+    def __init__(self, max_in_flight=DEFAULT_MAX_IN_FLIGHT, target_queue_seconds=DEFAULT_TARGET_QUEUE_MS / 1000,
+                 llm_calls=None):
+        self.max_in_flight = max_in_flight
+        self.target_queue_seconds = target_queue_seconds
+        self.llm_calls = llm_calls  # callable -> outstanding LLM calls (LLMDispatcher.running_count)
+        self.in_flight = 0
+        self.queue_delay = 0.0  # EWMA seconds
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, llm_calls=None):
+        """
+        ADMISSION_MAX_IN_FLIGHT (default WEB_THREADS; 0 disables admission control)
+        and ADMISSION_TARGET_QUEUE_MS.
+        """
+        return cls(
+            int(os.getenv("ADMISSION_MAX_IN_FLIGHT", DEFAULT_MAX_IN_FLIGHT)),
+            float(os.getenv("ADMISSION_TARGET_QUEUE_MS", DEFAULT_TARGET_QUEUE_MS)) / 1000,
+            llm_calls
+        )
+
+    def load(self):
+        with self._lock:
+            return self._load(self.in_flight)
+
+    def _load(self, others):
+        if self.max_in_flight <= 0:
+            return 0.0
+        load = others / self.max_in_flight
+        if self.llm_calls is not None:
+            load = max(load, self.llm_calls() / (self.max_in_flight * LLM_CALLS_PER_SLOT))
+        if self.target_queue_seconds > 0:
+            load = max(load, self.queue_delay / self.target_queue_seconds)
+        return load
+
+    @contextmanager
+    def admit(self, queue_delay=None):
+        """
+        Admits one request for the duration of the `with` block.
+
+        Args:
+            queue_delay (float | None): Seconds the request waited before reaching
+                the app (see parse_request_start).
+
+        Yields:
+            str: The service tier to run at, or REJECTED.
+        """
+        with self._lock:
+            if queue_delay is not None:
+                self.queue_delay += QUEUE_DELAY_ALPHA * (queue_delay - self.queue_delay)
+            tier = tier_for_load(self._load(self.in_flight))
+            if tier != REJECTED:
+                self.in_flight += 1
+        SERVICE_TIER_TOTAL.inc(tier)
+        try:
+            yield tier
+        finally:
+            if tier != REJECTED:
+                with self._lock:
+                    self.in_flight -= 1
+
+
+def tier_for_load(load):
+    for threshold, tier in TIER_THRESHOLDS:
+        if load < threshold:
+            return tier
+    return REJECTED
@@ -0,0 +1,233 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+DEFAULT_DEADLINE_SECONDS = 1.5
+# Parked calls are kept for the session's next tick for at most this long, and
+# for at most this many sessions (stateless callers may never come back)
+PENDING_TTL_SECONDS = 60.0
+MAX_PENDING_SESSIONS = 4096
+
+
+class LLMDispatcher:
+    """
+    Runs async LLM evaluations on a single background event loop.
+
+    Request threads submit an evaluation and wait at most `deadline` seconds for
+    it. If the deadline is missed the caller serves the heuristic result, and the
+    in-flight call is parked per session so its result can be delivered on the
+    session's next tick instead of being thrown away. Parked calls expire after
+    PENDING_TTL_SECONDS, and at most MAX_PENDING_SESSIONS are kept.
+
+    With a `scheduler` (LLMScheduler), session ticks where nothing significant
+    changed reuse the session's last LLM analysis instead of making a new call.
+    """
+
+    def __init__(self, orchestrator, deadline=DEFAULT_DEADLINE_SECONDS, scheduler=None):
+        self.orchestrator = orchestrator
+        self.deadline = deadline
+        self.scheduler = scheduler
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._pending = OrderedDict()  # session_id -> (parked_at, concurrent.futures.Future), oldest first
+        self._running = 0  # submitted calls not finished yet (awaited or parked)
+
+    @property
+    def enabled(self):
+        return self.orchestrator is not None and self.orchestrator.backend is not None
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="llm-dispatcher", daemon=True
+                )
+                self._thread.start()
+        return self._loop
+
+    def submit(self, coro):
+        """
+        Schedules a coroutine on the dispatcher loop and returns a concurrent.futures.Future.
+        """
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        with self._lock:
+            self._running += 1
+        future.add_done_callback(self._finished)
+        return future
+
+    def _finished(self, future):
+        with self._lock:
+            self._running = max(0, self._running - 1)
+
+    def running_count(self):
+        """
+        LLM calls in flight on the loop, including ones parked after their deadline.
+        """
+        with self._lock:
+            return self._running
+
+    def evaluate(self, session_id, audio_data, video_data, deck_data, current_timestamp, deadline=None):
+        """
+        Races an LLM evaluation against the deadline.
+
+        Args:
+            session_id (str | None): Pitch session key. Without one, late results are dropped.
+            deadline (float | None): Seconds to wait; defaults to the dispatcher deadline.
+
+        Returns:
+            tuple: (llm_result | None, source) where source is "llm" for a result
+            from this tick, "llm_late" for one that missed a previous deadline,
+            "llm_reused" for the last analysis on a tick the scheduler skipped, or
+            None when the caller should fall back to heuristics.
+        """
+        result, source, future = self.start(session_id, audio_data, video_data, deck_data, current_timestamp)
+        if future is None:
+            return result, source
+        return self.collect(session_id, future, source, self.deadline if deadline is None else deadline)
+
+    def start(self, session_id, audio_data, video_data, deck_data, current_timestamp, on_event=None):
+        """
+        First half of `evaluate`: returns without waiting so the caller can do other
+        work (the heuristic tiers) while the LLM call is in flight.
+
+        With `on_event`, a new call is made in streaming mode and on_event(kind, value)
+        runs on the dispatcher loop for each parsed piece, including after the
+        caller's deadline has passed (see GravityOrchestrator.evaluate_pitch_async).
+
+        Returns:
+            tuple: (llm_result | None, source, future | None). When a future is
+            returned, pass it to `collect` to wait for the rest of the budget;
+            otherwise (llm_result, source) is already final.
+        """
+        if not self.enabled:
+            return None, None, None
+
+        scheduler = self.scheduler if session_id else None
+        due = scheduler is None or scheduler.check(
+            session_id, audio_data, video_data, deck_data, current_timestamp
+        ) is not None
+
+        pending = self._unpark(session_id) if session_id else None
+
+        if pending is not None:
+            if pending.done():
+                late_result = _result_or_none(pending)
+                if late_result is not None:
+                    if due and scheduler is not None:
+                        # The late result predates this tick's change; evaluate it next tick
+                        scheduler.defer(session_id)
+                    return (*self._remember(session_id, late_result, "llm_late"), None)
+            elif due:
+                # Previous call is still in flight; don't stack another one on top of it,
+                # but keep the session due so the change is evaluated once it lands.
+                if scheduler is not None:
+                    scheduler.defer(session_id)
+                return None, "llm_late", pending
+            else:
+                self._park(session_id, pending)
+
+        if not due:
+            return (*self._reuse(session_id), None)
+
+        future = self.submit(self.orchestrator.evaluate_pitch_async(
+            audio_data, video_data, deck_data, current_timestamp, session_id=session_id, on_event=on_event
+        ))
+        return None, "llm", future
+
+    def collect(self, session_id, future, source, timeout):
+        """
+        Second half of `evaluate`: waits up to `timeout` seconds for a future from
+        `start`. A miss parks the call for the session's next tick.
+
+        Returns:
+            tuple: (llm_result | None, source | None)
+        """
+        return self._remember(session_id, *self._wait(session_id, future, max(0.0, timeout), source))
+
+    def _remember(self, session_id, result, source):
+        if self.scheduler is not None and session_id and result is not None:
+            self.scheduler.remember(session_id, result)
+        return result, source
+
+    def _reuse(self, session_id):
+        result = self.scheduler.reuse(session_id)
+        if result is None:
+            return None, None
+        return result, "llm_reused"
+
+    def _wait(self, session_id, future, deadline, source):
+        try:
+            result = future.result(timeout=deadline)
+        except FutureTimeoutError:
+            if session_id:
+                self._park(session_id, future)
+            else:
+                future.cancel()
+            return None, None
+        except Exception as e:
+            print(f"LLM Dispatch Error: {e}")
+            return None, None
+
+        if result is None:
+            return None, None
+        return result, source
+
+    def _park(self, session_id, future):
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            self._pending[session_id] = (now, future)
+            self._pending.move_to_end(session_id)
+            while self._pending:
+                oldest_id, (parked_at, oldest) = next(iter(self._pending.items()))
+                if len(self._pending) <= MAX_PENDING_SESSIONS and now - parked_at <= PENDING_TTL_SECONDS:
+                    break
+                del self._pending[oldest_id]
+                expired.append(oldest)
+        for oldest in expired:
+            oldest.cancel()
+
+    def _unpark(self, session_id):
+        with self._lock:
+            entry = self._pending.pop(session_id, None)
+        return entry[1] if entry is not None else None
+
+    def reset_after_fork(self):
+        """
+        Forgets the event loop thread and parked calls inherited from a parent
+        process (threads do not survive fork); a fresh loop starts on first use.
+        """
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._pending = OrderedDict()
+        self._running = 0
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+    def discard(self, session_id):
+        """
+        Drops (and cancels) any parked evaluation for a finished session.
+        """
+        future = self._unpark(session_id)
+        if future is not None:
+            future.cancel()
+        if self.scheduler is not None:
+            self.scheduler.forget(session_id)
+        if self.orchestrator is not None:
+            self.orchestrator.discard_session(session_id)
+
+
+def _result_or_none(future):
+    if future.cancelled():
+        return None
+    try:
+        return future.result(timeout=0)
+    except Exception:
+        return None
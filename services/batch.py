@@ -0,0 +1,117 @@
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from services.pipeline import analyze_frame
+from services.report import build_report
+from services.tier2_coherence import CoherenceTracker
+
+
+def replay_session(frames, session_id=None, decks=None):
+    """
+    Scores a recorded pitch timeline in a single pass.
+
+    Runs analyze_pacing, the incremental coherence engine, calculate_scores and
+    analyze_progress on every frame (heuristics only, no LLM) and yields one
+    dashboard response per frame, so results stream out without holding the
+    timeline in memory.
+
+    Args:
+        frames (iterable[dict]): `/analyze` payloads in timestamp order.
+        session_id (str | None): Tag copied into each result.
+        decks (DeckStore | None): Resolves frames that reference an uploaded deck.
+
+    Yields:
+        dict: {"session_id", "frame_index", "current_timestamp", **response}
+    """
+    coherence = CoherenceTracker()
+    for index, frame in enumerate(frames):
+        response = analyze_frame(frame, coherence_tracker=coherence, decks=decks)
+        yield {
+            "session_id": session_id or frame.get("session_id"),
+            "frame_index": index,
+            "current_timestamp": frame.get("current_timestamp", 0),
+            **response
+        }
+
+
+def iter_jsonl(path):
+    """
+    Yields one decoded frame per non-empty line of a JSONL file.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def replay_file(path, output_path):
+    """
+    Replays one session JSONL file into an output JSONL file.
+
+    Returns:
+        tuple: (path, frames_written)
+    """
+    session_id = os.path.splitext(os.path.basename(path))[0]
+    count = 0
+    with open(output_path, "w", encoding="utf-8") as out:
+        for result in replay_session(iter_jsonl(path), session_id=session_id):
+            out.write(json.dumps(result, separators=(",", ":")))
+            out.write("\n")
+            count += 1
+    return path, count
+
+
+def report_file(path, output_path):
+    """
+    Reduces one session JSONL file to its end-of-pitch report (services/report.py),
+    streaming the frames from disk.
+
+    Returns:
+        tuple: (path, frames_reported)
+    """
+    session_id = os.path.splitext(os.path.basename(path))[0]
+    report = build_report(iter_jsonl(path), session_id=session_id)
+    with open(output_path, "w", encoding="utf-8") as out:
+        json.dump(report, out, separators=(",", ":"))
+    return path, report["ticks"]
+
+
+def replay_files(paths, output_dir, workers=None, reports=False):
+    """
+    Replays many session files across a process pool (one session per task).
+
+    Args:
+        paths (list[str]): Session JSONL files.
+        output_dir (str): Directory for `<session>.scores.jsonl` outputs.
+        workers (int | None): Pool size; defaults to os.cpu_count().
+        reports (bool): Write one `<session>.report.json` per session instead of
+            per-frame scores.
+
+    Yields:
+        tuple: (path, frames) as each session finishes.
+
+    Raises:
+        ValueError: Two inputs share a basename (their outputs would overwrite
+            each other); nothing is replayed.
+    """
+    task, suffix = (report_file, ".report.json") if reports else (replay_file, ".scores.jsonl")
+    jobs = []
+    sources = {}  # output path -> input path
+    for path in paths:
+        output_path = os.path.join(output_dir, os.path.splitext(os.path.basename(path))[0] + suffix)
+        if output_path in sources:
+            raise ValueError(f"{path} and {sources[output_path]} would both write {output_path}")
+        sources[output_path] = path
+        jobs.append((path, output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    if workers == 1:
+        for path, output_path in jobs:
+            yield task(path, output_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(task, path, output_path) for path, output_path in jobs]
+        for future in futures:
+            yield future.result()
@@ -0,0 +1,141 @@
+import json
+
+from services.tier2_coherence import NUMBER_PATTERN
+
+DEFAULT_WINDOW_WORDS = 120
+DEFAULT_TOKEN_BUDGET = 700      # tokens for the user message (system prompt excluded)
+MAX_SUMMARY_SLIDES = 12
+MAX_FACTS_PER_SLIDE = 5
+MAX_OCR_CHARS = 600
+
+_COMPACT = (",", ":")
+
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for budgeting
+    return len(text) // 4
+
+
+def _window(transcript, words):
+    """
+    Last `words` words of the transcript. Only the tail is split, so the cost does
+    not grow with pitch length.
+    """
+    tail = transcript[-words * 16:]
+    parts = tail.split()
+    truncated = len(tail) < len(transcript)
+    if truncated and parts and not tail[0].isspace():
+        parts = parts[1:]  # first word was cut by the slice
+    if len(parts) > words:
+        parts = parts[-words:]
+        truncated = True
+    text = " ".join(parts)
+    return ("... " + text) if truncated else text
+
+
+def _numbers(text, limit=MAX_FACTS_PER_SLIDE):
+    seen = []
+    for num in NUMBER_PATTERN.findall(text or ""):
+        if num not in seen:
+            seen.append(num)
+            if len(seen) == limit:
+                break
+    return seen
+
+
+class ContextBuilder:
+    """
+    Builds the LLM prompt context for one session with a roughly constant size.
+
+    Instead of the full cumulative transcript and OCR, the prompt carries:
+      - the last `window_words` words of the transcript,
+      - a compact summary of earlier slides (topic, numbers shown, numbers said),
+        updated once per slide change,
+      - the current slide's OCR (truncated),
+    serialized without whitespace and trimmed to `token_budget`.
+    """
+
+    def __init__(self, window_words=DEFAULT_WINDOW_WORDS, token_budget=DEFAULT_TOKEN_BUDGET,
+                 max_summary_slides=MAX_SUMMARY_SLIDES):
+        self.window_words = window_words
+        self.token_budget = token_budget
+        self.max_summary_slides = max_summary_slides
+        self.earlier_slides = []       # compact summaries, oldest first
+        self.current_slide = None      # (number, topic, ocr_text)
+        self.slide_transcript_start = 0
+
+    def observe(self, context):
+        """
+        Updates the running summary from a full context (as built by
+        GravityOrchestrator.build_context). O(text spoken on a slide) once per slide change.
+        """
+        slide = context.get("slide_context", {})
+        transcript = context.get("audio_transcription", "") or ""
+        key = (slide.get("number"), slide.get("topic"), slide.get("ocr_text", ""))
+
+        if len(transcript) < self.slide_transcript_start:
+            # Transcript restarted; drop the history that no longer lines up.
+            self.earlier_slides = []
+            self.slide_transcript_start = 0
+
+        if self.current_slide is not None and key[:2] != self.current_slide[:2]:
+            number, topic, ocr_text = self.current_slide
+            said = transcript[self.slide_transcript_start:]
+            self.earlier_slides.append({
+                "n": number,
+                "topic": topic,
+                "shown": _numbers(ocr_text),
+                "said": _numbers(said)
+            })
+            if len(self.earlier_slides) > self.max_summary_slides:
+                self.earlier_slides = self.earlier_slides[-self.max_summary_slides:]
+            self.slide_transcript_start = len(transcript)
+        # Always keep the latest OCR (it may be refined while on the same slide)
+        self.current_slide = key
+
+    def build(self, context):
+        """
+        Returns the compact JSON string for the prompt.
+        """
+        self.observe(context)
+        return compact_context(
+            context,
+            window_words=self.window_words,
+            token_budget=self.token_budget,
+            earlier_slides=self.earlier_slides
+        )
+
+
+def compact_context(context, window_words=DEFAULT_WINDOW_WORDS, token_budget=DEFAULT_TOKEN_BUDGET, earlier_slides=None):
+    """
+    Stateless compaction used when there is no session: windowed transcript,
+    truncated OCR, compact separators, and the same token budget.
+    """
+    transcript = _window(context.get("audio_transcription", "") or "", window_words)
+    slide = dict(context.get("slide_context", {}))
+    slide["ocr_text"] = (slide.get("ocr_text") or "")[:MAX_OCR_CHARS]
+
+    compact = {
+        "current_timestamp": context.get("current_timestamp"),
+        "total_time_limit": context.get("total_time_limit"),
+        "recent_transcription": transcript,
+        "detected_wpm": context.get("detected_wpm"),
+        "visual_signals": context.get("visual_signals", {}),
+        "slide_context": slide,
+        "earlier_slides": list(earlier_slides or [])
+    }
+
+    text = json.dumps(compact, separators=_COMPACT)
+    # Enforce the budget: drop the oldest slide summaries first, then shrink the window.
+    while estimate_tokens(text) > token_budget:
+        if compact["earlier_slides"]:
+            compact["earlier_slides"].pop(0)
+        elif window_words > 10:
+            window_words //= 2
+            compact["recent_transcription"] = _window(context.get("audio_transcription", "") or "", window_words)
+        elif len(slide["ocr_text"]) > 80:
+            slide["ocr_text"] = slide["ocr_text"][:len(slide["ocr_text"]) // 2]
+        else:
+            break
+        text = json.dumps(compact, separators=_COMPACT)
+    return text
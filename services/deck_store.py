@@ -0,0 +1,251 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from services.models import dumps
+from services.numeric_facts import slide_fact_index
+from services.progress import get_stages, match_stage
+from services.session_store import RedisSessionStore
+from services.tier3_viability import score_slide_text
+
+DEFAULT_MAX_DECKS = 256
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DECK_KEY_PREFIX = "pitch:deck:"
+MAX_TOPIC_CHARS = 60
+
+
+class UnknownDeckError(KeyError):
+    """
+    A frame referenced a deck_id (or slide) that was never uploaded.
+    """
+
+
+@dataclass(slots=True, frozen=True)
+class SlideFeatures:
+    number: int
+    topic: str
+    ocr_text: str
+    text_length: int
+    slide_quality: int
+    stage: str | None
+    # FactIndex of the slide's numbers (shared with tier2 through slide_fact_index)
+    facts: object
+
+    def to_dict(self):
+        return {
+            "number": self.number,
+            "topic": self.topic,
+            "stage": self.stage,
+            "text_length": self.text_length,
+            "slide_quality": self.slide_quality,
+            "numbers": self.facts.labels()
+        }
+
+
+class Deck:
+    """
+    An uploaded deck: per-slide features computed once at upload, looked up by
+    slide number (1-based) on every tick.
+    """
+
+    __slots__ = ("deck_id", "pitch_format", "slides", "source")
+
+    def __init__(self, deck_id, pitch_format, slides, source):
+        self.deck_id = deck_id
+        self.pitch_format = pitch_format
+        self.slides = slides
+        self.source = source  # the uploaded slides, kept to rebuild from the shared store
+
+    def slide(self, number):
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            return None
+        if 1 <= number <= len(self.slides):
+            return self.slides[number - 1]
+        return None
+
+    def expand(self, deck_content):
+        """
+        Fills a `{"deck_id", "current_slide_number"}` deck_content with the slide's
+        OCR text, topic, total_slides and precomputed slide_quality. Fields sent
+        explicitly by the client win, except the slide text and quality.
+        """
+        slide = self.slide(deck_content.get("current_slide_number"))
+        if slide is None:
+            raise UnknownDeckError(
+                f"Slide {deck_content.get('current_slide_number')} is not in deck {self.deck_id}"
+            )
+        expanded = dict(deck_content)
+        expanded["ocr_text"] = slide.ocr_text
+        expanded["slide_quality"] = slide.slide_quality
+        expanded.setdefault("slide_topic", slide.topic)
+        expanded.setdefault("total_slides", len(self.slides))
+        return expanded
+
+    def to_dict(self):
+        return {
+            "deck_id": self.deck_id,
+            "pitch_format": self.pitch_format,
+            "total_slides": len(self.slides),
+            "slides": [slide.to_dict() for slide in self.slides]
+        }
+
+
+def _normalize_slides(slides):
+    """
+    Accepts slides as OCR strings or {"ocr_text", "slide_topic"} dicts.
+    """
+    normalized = []
+    for slide in slides:
+        if isinstance(slide, str):
+            slide = {"ocr_text": slide}
+        elif not isinstance(slide, dict):
+            raise ValueError("Each slide must be a string or an object with 'ocr_text'")
+        normalized.append({
+            "ocr_text": slide.get("ocr_text") or "",
+            "slide_topic": slide.get("slide_topic") or ""
+        })
+    return normalized
+
+
+def deck_id_for(slides, pitch_format=None):
+    """
+    Content hash of a deck; uploading the same deck twice yields the same id.
+    """
+    canonical = dumps({"format": pitch_format, "slides": _normalize_slides(slides)})
+    return hashlib.sha256(canonical).hexdigest()[:16]
+
+
+def _detect_topic(ocr_text, pitch_format):
+    """
+    Stage name when the slide title (first OCR line) matches one, else the title.
+    """
+    title = ocr_text.strip().split("\n", 1)[0].strip()[:MAX_TOPIC_CHARS]
+    index = match_stage(title, pitch_format) if title else -1
+    return get_stages(pitch_format)[index] if index != -1 else title
+
+
+def build_deck(slides, pitch_format=None):
+    """
+    Computes per-slide features for a deck.
+
+    Args:
+        slides (list[str | dict]): OCR text per slide, or {"ocr_text", "slide_topic"}.
+        pitch_format (str | None): Stage list used for the detected stage.
+
+    Returns:
+        Deck
+    """
+    source = _normalize_slides(slides)
+    stages = get_stages(pitch_format)
+    features = []
+    for number, slide in enumerate(source, start=1):
+        ocr_text = slide["ocr_text"]
+        topic = slide["slide_topic"] or _detect_topic(ocr_text, pitch_format)
+        index = match_stage(topic, pitch_format) if topic else -1
+        features.append(SlideFeatures(
+            number=number,
+            topic=topic,
+            ocr_text=ocr_text,
+            text_length=len(ocr_text),
+            slide_quality=score_slide_text(ocr_text),
+            stage=stages[index] if index != -1 else None,
+            facts=slide_fact_index(ocr_text)
+        ))
+    return Deck(deck_id_for(source, pitch_format), pitch_format, features, source)
+
+
+class DeckStore:
+    """
+    Process-local LRU of uploaded decks keyed by deck_id. With a shared backend
+    (RedisSessionStore-compatible get_value/put_value) the uploaded slides are also
+    written there, so a worker that did not receive the upload rebuilds the
+    features once on first use.
+    """
+
+    def __init__(self, max_decks=DEFAULT_MAX_DECKS, shared=None):
+        self.max_decks = max_decks
+        self.shared = shared
+        self._decks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, slides, pitch_format=None):
+        """
+        Returns:
+            tuple: (Deck, created) where created is False for a re-upload.
+        """
+        deck_id = deck_id_for(slides, pitch_format)
+        deck = self.get(deck_id)
+        if deck is not None:
+            return deck, False
+        deck = build_deck(slides, pitch_format)
+        self._remember(deck)
+        if self.shared is not None:
+            self.shared.put_value(deck.deck_id, {"pitch_format": pitch_format, "slides": deck.source})
+        return deck, True
+
+    def get(self, deck_id):
+        with self._lock:
+            deck = self._decks.get(deck_id)
+            if deck is not None:
+                self._decks.move_to_end(deck_id)
+                return deck
+        if self.shared is None:
+            return None
+        data = self.shared.get_value(deck_id)
+        if data is None:
+            return None
+        deck = build_deck(data["slides"], data.get("pitch_format"))
+        self._remember(deck)
+        return deck
+
+    def expand(self, deck_content):
+        """
+        Resolves a deck_id reference in a frame's deck_content (see Deck.expand);
+        deck_content without a deck_id is returned unchanged.
+
+        Raises:
+            UnknownDeckError: The deck or slide is unknown.
+        """
+        deck_id = deck_content.get("deck_id")
+        if not deck_id:
+            return deck_content
+        deck = self.get(deck_id)
+        if deck is None:
+            raise UnknownDeckError(f"Unknown deck {deck_id}")
+        return deck.expand(deck_content)
+
+    def _remember(self, deck):
+        with self._lock:
+            self._decks[deck.deck_id] = deck
+            self._decks.move_to_end(deck.deck_id)
+            while len(self._decks) > self.max_decks:
+                self._decks.popitem(last=False)
+
+    def reset(self):
+        """
+        Drops the shared backend's connection (call after fork).
+        """
+        if self.shared is not None:
+            self.shared.reset()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._decks)
+
+
+def deck_store_from_env():
+    """
+    DECK_STORE_MAX decks per process; with SESSION_STORE_URL the uploads are shared
+    through the same Redis (DECK_TTL_SECONDS).
+    """
+    max_decks = int(os.getenv("DECK_STORE_MAX", DEFAULT_MAX_DECKS))
+    url = os.getenv("SESSION_STORE_URL")
+    shared = None
+    if url:
+        ttl_seconds = float(os.getenv("DECK_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        shared = RedisSessionStore(url, ttl_seconds=ttl_seconds, prefix=DECK_KEY_PREFIX)
+    return DeckStore(max_decks, shared)
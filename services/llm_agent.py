@@ -1,50 +1,30 @@
 import os
-import json
-from openai import OpenAI
-from dotenv import load_dotenv
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import replace
 
-load_dotenv()
+from services.context_builder import ContextBuilder, compact_context
+from services.llm_backends import backend_from_env
+from services.llm_cache import LLMCache, context_cache_key
+from services.llm_stream import FEEDBACK, TIERED_ANALYSIS, EvaluationStreamParser
+from services.metrics import LLM_CALL_SECONDS, LLM_FIRST_EVENT_SECONDS
+from services.models import LLMOutputError, parse_llm_output
 
-class GravityOrchestrator:
-    def __init__(self):
-        self.api_key = os.getenv("OPENAI_API_KEY")
-        if self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
-        else:
-            print("WARNING: OPENAI_API_KEY not found. LLM features will be disabled.")
-            self.client = None
 
-    def evaluate_pitch(self, audio_data, video_data, deck_data, current_timestamp, total_time_limit=180):
-        """
-        Orchestrates the multi-modal analysis using OpenAI GPT-4o.
-        Returns a dictionary matching the specific JSON schema required by the specialized dashboard.
-        """
-        if not self.client:
-            return None
+def _load_dotenv():
+    # python-dotenv is only imported when there is a .env file to read
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.isfile(".env") or os.path.isfile(os.path.join(root, ".env")):
+        from dotenv import load_dotenv
+        load_dotenv()
 
-        # 1. Construct the Context
-        context = {
-            "current_timestamp": current_timestamp,
-            "total_time_limit": total_time_limit,
-            "audio_transcription": audio_data.get("transcription", ""),
-            "detected_wpm": audio_data.get("wpm", 0),
-            "visual_signals": {
-                "facial_confidence": video_data.get("facial_confidence", 0),
-                "eye_contact": video_data.get("eye_contact_percent", 0),
-                "emotion": video_data.get("emotional_tone", "Unknown")
-            },
-            "slide_context": {
-                "number": deck_data.get("current_slide_number", 0),
-                "total": deck_data.get("total_slides", 0),
-                "topic": deck_data.get("slide_topic", "Unknown"),
-                "ocr_text": deck_data.get("ocr_text", "")
-            }
-        }
-        
-        json_context = json.dumps(context, indent=2)
+_load_dotenv()
 
-        # 2. System Prompt
-        system_prompt = """
+# Per-session prompt builders kept by the orchestrator (LRU-bounded)
+MAX_CONTEXT_BUILDERS = 2048
+
+SYSTEM_PROMPT = """
         You are the Gravity Pitch Architect, an expert investor AI.
         Analyze the following real-time pitch data stream and output a STRICT JSON assessment.
         
@@ -68,18 +48,195 @@ class GravityOrchestrator:
         If there are no alerts, "real_time_feedback" should be an empty list.
         """
 
+class GravityOrchestrator:
+    def __init__(self, api_key=None, base_url=None, cache=None, llm=None, backend=None):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        # OPENAI_BASE_URL lets us point at a local fake server for tests/benchmarks.
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL")
+        # Model backend (services/llm_backends.py): OpenAI with a pooled client, or the
+        # local rules model; selected by LLM_BACKEND unless passed in.
+        self.backend = backend or backend_from_env(self.api_key, self.base_url, llm)
+        if self.backend is None:
+            print("WARNING: OPENAI_API_KEY not found. LLM features will be disabled.")
+        # Response cache for near-identical contexts (see services/llm_cache.py);
+        # local backends are cheaper to rerun than to cache.
+        if cache is None and self.backend is not None and self.backend.remote:
+            cache = LLMCache.from_env()
+        self.cache = cache
+        self._context_builders = OrderedDict()
+        self._builders_lock = threading.Lock()
+
+    def build_context(self, audio_data, video_data, deck_data, current_timestamp, total_time_limit=180):
+        """
+        Collects the pitch signals sent to the model for one evaluation.
+        """
+        return {
+            "current_timestamp": current_timestamp,
+            "total_time_limit": total_time_limit,
+            "audio_transcription": audio_data.get("transcription", ""),
+            "detected_wpm": audio_data.get("wpm", 0),
+            "visual_signals": {
+                "facial_confidence": video_data.get("facial_confidence", 0),
+                "eye_contact": video_data.get("eye_contact_percent", 0),
+                "emotion": video_data.get("emotional_tone", "Unknown")
+            },
+            "slide_context": {
+                "number": deck_data.get("current_slide_number", 0),
+                "total": deck_data.get("total_slides", 0),
+                "topic": deck_data.get("slide_topic", "Unknown"),
+                "ocr_text": deck_data.get("ocr_text", "")
+            }
+        }
+
+    def context_builder(self, session_id):
+        """
+        Returns the session's ContextBuilder (created on first use, LRU-bounded).
+        """
+        with self._builders_lock:
+            builder = self._context_builders.get(session_id)
+            if builder is None:
+                builder = self._context_builders[session_id] = ContextBuilder()
+                if len(self._context_builders) > MAX_CONTEXT_BUILDERS:
+                    self._context_builders.popitem(last=False)
+            else:
+                self._context_builders.move_to_end(session_id)
+            return builder
+
+    def discard_session(self, session_id):
+        with self._builders_lock:
+            self._context_builders.pop(session_id, None)
+
+    def build_messages(self, context, session_id=None):
+        """
+        Builds the chat messages (system prompt + compacted pitch context) for one evaluation.
+
+        The context is compacted to a bounded transcript window (plus, per session, a
+        summary of earlier slides) so prompt size stays flat across the pitch.
+        """
+        if session_id:
+            json_context = self.context_builder(session_id).build(context)
+        else:
+            json_context = compact_context(context)
+
+        return [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": f"Here is the pitch data context:\n{json_context}"}
+        ]
+
+    def evaluate_pitch(self, audio_data, video_data, deck_data, current_timestamp, total_time_limit=180, session_id=None):
+        """
+        Orchestrates the multi-modal analysis with the configured model backend.
+        Returns a validated LLMEvaluation, or None when the call fails or the output
+        does not match the dashboard schema (callers then use the heuristic tiers).
+        """
+        if self.backend is None:
+            return None
+
+        context = self.build_context(audio_data, video_data, deck_data, current_timestamp, total_time_limit)
+        cache_key = context_cache_key(context) if self.cache is not None else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return _restamp(parse_llm_output(cached), current_timestamp)
+
+        messages = self.build_messages(context, session_id)
+
+        start = time.perf_counter()
+        content = None
+        try:
+            content = self.backend.complete(messages, context)
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start, "ok")
+            result = parse_llm_output(content)
+            if cache_key:
+                self.cache.set(cache_key, content)
+            return result
+        except LLMOutputError as e:
+            print(f"LLM Output Error: {e}")
+            return None
+        except Exception as e:
+            if content is None:
+                LLM_CALL_SECONDS.observe(time.perf_counter() - start, "error")
+            print(f"LLM Error: {e}")
+            return None
+
+    async def evaluate_pitch_async(self, audio_data, video_data, deck_data, current_timestamp, total_time_limit=180,
+                                   session_id=None, on_event=None):
+        """
+        Async variant of `evaluate_pitch` (the backend's acomplete).
+        Meant to be scheduled on the LLMDispatcher event loop, never awaited from a request thread.
+
+        Args:
+            on_event (callable | None): Streaming mode. The completion is consumed as it
+                arrives and on_event(kind, value) is called with ("tiered_analysis",
+                TieredAnalysis) and ("feedback", FeedbackItem) as soon as each is
+                complete; the full validated result is still returned at the end.
+        """
+        if self.backend is None:
+            return None
+
+        context = self.build_context(audio_data, video_data, deck_data, current_timestamp, total_time_limit)
+        cache_key = context_cache_key(context) if self.cache is not None else None
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                result = _restamp(parse_llm_output(cached), current_timestamp)
+                if on_event is not None:
+                    _replay_events(result, on_event)
+                return result
+
+        messages = self.build_messages(context, session_id)
+
+        start = time.perf_counter()
+        content = None
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"Here is the pitch data context:\n{json_context}"}
-                ],
-                response_format={"type": "json_object"}
-            )
-            
-            content = response.choices[0].message.content
-            return json.loads(content)
+            if on_event is None:
+                content = await self.backend.acomplete(messages, context)
+            else:
+                content = await _stream_completion(self.backend, messages, context, on_event, start)
+            LLM_CALL_SECONDS.observe(time.perf_counter() - start, "ok")
+            result = parse_llm_output(content)
+            if cache_key:
+                self.cache.set(cache_key, content)
+            return result
+        except LLMOutputError as e:
+            print(f"LLM Output Error: {e}")
+            return None
         except Exception as e:
+            if content is None:
+                LLM_CALL_SECONDS.observe(time.perf_counter() - start, "error")
             print(f"LLM Error: {e}")
             return None
+
+async def _stream_completion(backend, messages, context, on_event, start):
+    """
+    Feeds the backend's streamed text through EvaluationStreamParser, reporting
+    each completed piece to `on_event`. Returns the full completion text.
+    """
+    parser = EvaluationStreamParser()
+    first = True
+    async for piece in backend.astream(messages, context):
+        for kind, value in parser.feed(piece):
+            if first:
+                LLM_FIRST_EVENT_SECONDS.observe(time.perf_counter() - start)
+                first = False
+            _notify(on_event, kind, value)
+    return parser.content()
+
+def _restamp(result, current_timestamp):
+    # A cached reply may come from another session or an earlier tick (the cache
+    # key quantizes time); its feedback is stamped with this tick's time instead
+    stamp = f"{int(current_timestamp // 60):02d}:{int(current_timestamp % 60):02d}"
+    feedback = tuple(replace(item, timestamp=stamp) for item in result.real_time_feedback)
+    return replace(result, real_time_feedback=feedback)
+
+def _replay_events(result, on_event):
+    # Cached completions are delivered through the same callback, all at once
+    _notify(on_event, TIERED_ANALYSIS, result.tiered_analysis)
+    for item in result.real_time_feedback:
+        _notify(on_event, FEEDBACK, item)
+
+def _notify(on_event, kind, value):
+    try:
+        on_event(kind, value)
+    except Exception as e:
+        print(f"LLM Stream Callback Error: {e}")
@@ -0,0 +1,164 @@
+import os
+
+from services.llm_batcher import BatchingBackend
+from services.metrics import LLM_TOKENS
+from services.models import dumps
+from services.tier2_coherence import analyze_coherence
+from services.tier3_viability import score_slide_text
+
+DEFAULT_MODEL = "gpt-4o"
+
+# The rules model reads the same recent transcript window the remote model is sent
+RULES_TRANSCRIPT_CHARS = 1000
+# Speaking rate (wpm) outside this band costs delivery confidence
+RULES_WPM_RANGE = (110, 170)
+
+
+class OpenAIBackend:
+    """
+    Chat completions against OpenAI (or anything speaking its API, see
+    OPENAI_BASE_URL) through the pooled ManagedLLMClient.
+    """
+
+    name = "openai"
+    remote = True
+
+    def __init__(self, llm, model=DEFAULT_MODEL):
+        self.llm = llm
+        self.model = model
+
+    @classmethod
+    def from_env(cls, api_key, base_url=None, llm=None):
+        # Imported here so the heuristic-only and local paths never load the openai SDK
+        from services.llm_client import get_shared_client
+        return cls(llm or get_shared_client(api_key, base_url), os.getenv("LLM_MODEL", DEFAULT_MODEL))
+
+    def complete(self, messages, context):
+        """
+        Returns:
+            str: The model's JSON output.
+        """
+        response = self.llm.create(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"}
+        )
+        _record_usage(response)
+        return response.choices[0].message.content
+
+    async def acomplete(self, messages, context):
+        response = await self.llm.acreate(
+            model=self.model,
+            messages=messages,
+            response_format={"type": "json_object"}
+        )
+        _record_usage(response)
+        return response.choices[0].message.content
+
+    async def astream(self, messages, context):
+        """
+        Yields the completion's text as it arrives.
+        """
+        async for chunk in self.llm.astream(
+            messages, model=self.model, response_format={"type": "json_object"}
+        ):
+            _record_usage(chunk)
+            for choice in chunk.choices or ():
+                if choice.delta is not None and choice.delta.content:
+                    yield choice.delta.content
+
+
+class RulesBackend:
+    """
+    Deterministic in-process stand-in for the remote model: scores the evaluation
+    context with fixed rules and returns the same JSON schema. No network, no
+    model weights; used in rooms without reliable internet and for offline runs
+    and benchmarks.
+    """
+
+    name = "rules"
+    remote = False
+
+    def complete(self, messages, context):
+        return dumps(rules_evaluation(context)).decode("utf-8")
+
+    async def acomplete(self, messages, context):
+        return self.complete(messages, context)
+
+    async def astream(self, messages, context):
+        # Computed in one go; there is nothing to stream
+        yield self.complete(messages, context)
+
+
+def rules_evaluation(context):
+    """
+    Evaluates a GravityOrchestrator.build_context dict with the rules model.
+
+    Returns:
+        dict: {"tiered_analysis": {...}, "real_time_feedback": [...]} as the remote
+        model is instructed to produce.
+    """
+    visual = context.get("visual_signals", {})
+    slide = context.get("slide_context", {})
+    current_time = context.get("current_timestamp", 0)
+    timestamp_str = f"{int(current_time // 60):02d}:{int(current_time % 60):02d}"
+
+    coherence = analyze_coherence(
+        context.get("audio_transcription", "")[-RULES_TRANSCRIPT_CHARS:],
+        slide.get("ocr_text", ""),
+        visual.get("emotion", "Neutral"),
+        slide.get("topic", "Unknown"),
+        timestamp_str
+    )
+    feedback = list(coherence["real_time_feedback"])
+
+    delivery_confidence = int((visual.get("facial_confidence", 0) + visual.get("eye_contact", 0)) / 2)
+    wpm = context.get("detected_wpm", 0) or 0
+    low, high = RULES_WPM_RANGE
+    if wpm > high:
+        delivery_confidence -= 10
+        feedback.append({"timestamp": timestamp_str, "type": "BEHAVIOR_ALERT",
+                         "message": f"You're speaking at {int(wpm)} wpm. Slow down so key numbers land."})
+    elif 0 < wpm < low:
+        delivery_confidence -= 5
+    delivery_confidence = max(0, min(100, delivery_confidence))
+
+    if not feedback and coherence["coherence_score"] == 100 and delivery_confidence >= 75:
+        feedback.append({"timestamp": timestamp_str, "type": "KUDOS",
+                         "message": "Clear delivery, and your numbers match the slide."})
+
+    return {
+        "tiered_analysis": {
+            "coherence_score": coherence["coherence_score"],
+            "delivery_confidence": delivery_confidence,
+            "slide_quality": score_slide_text(slide.get("ocr_text", ""))
+        },
+        "real_time_feedback": feedback
+    }
+
+
+def backend_from_env(api_key=None, base_url=None, llm=None):
+    """
+    LLM_BACKEND selects the model: "openai" (default; needs an API key), "rules"
+    (local, deterministic) or "none" (heuristic tiers only). With LLM_BATCH_MAX > 1
+    the OpenAI backend coalesces concurrent sessions' calls (BatchingBackend).
+
+    Returns:
+        OpenAIBackend | BatchingBackend | RulesBackend | None
+    """
+    name = os.getenv("LLM_BACKEND", "openai").strip().lower()
+    if name == "rules":
+        return RulesBackend()
+    if name == "openai":
+        return BatchingBackend.wrap_from_env(OpenAIBackend.from_env(api_key, base_url, llm)) if api_key else None
+    if name != "none":
+        print(f"WARNING: Unknown LLM_BACKEND '{name}'. LLM features will be disabled.")
+    return None
+
+
+def _record_usage(response):
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc("prompt", amount=usage.prompt_tokens or 0)
+    LLM_TOKENS.inc("completion", amount=usage.completion_tokens or 0)
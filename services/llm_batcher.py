@@ -0,0 +1,144 @@
+import asyncio
+import os
+
+from services.metrics import REGISTRY
+from services.models import LLMOutputError, dumps, loads
+
+DEFAULT_MAX_BATCH = 8
+DEFAULT_MAX_WAIT_SECONDS = 0.01
+
+# Appended to the (shared) system prompt when several pitches go out in one call
+BATCH_INSTRUCTIONS = """
+        BATCH MODE: The user message contains several independent pitches, each under
+        a "### Pitch <id>" header. Evaluate each pitch on its own, then output STRICT JSON ONLY:
+        { "evaluations": { "<id>": <OUTPUT SCHEMA object for that pitch>, ... } }
+        Include every id exactly once.
+        """
+PITCH_HEADER = "### Pitch "
+
+LLM_BATCH_SIZE = REGISTRY.histogram(
+    "pitch_llm_batch_size", "Evaluations coalesced into one LLM call.", buckets=(1, 2, 4, 8, 16, 32)
+)
+
+
+class BatchingBackend:
+    """
+    Coalesces concurrent `acomplete` calls from different sessions into one
+    request. Calls arriving within `max_wait` seconds of the first (or until
+    `max_batch` are queued) share a single system prompt; the combined reply is
+    split back per pitch and each waiting caller gets its own JSON object, so
+    parsing, validation and caching downstream are unchanged.
+
+    Runs on the LLMDispatcher event loop; sync `complete` and streaming calls
+    go straight to the wrapped backend, so app.py turns LLM_STREAM off when the
+    orchestrator's backend batches.
+    """
+
+    def __init__(self, backend, max_batch=DEFAULT_MAX_BATCH, max_wait=DEFAULT_MAX_WAIT_SECONDS):
+        self.backend = backend
+        self.name = backend.name
+        self.remote = backend.remote
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._pending = []  # (messages, asyncio.Future)
+        self._timer = None
+
+    @classmethod
+    def wrap_from_env(cls, backend):
+        """
+        LLM_BATCH_MAX (<= 1 disables batching) and LLM_BATCH_WAIT_MS, the most
+        latency a call may spend waiting for others to join its batch. A batched
+        reply that outlives the dispatcher deadline is parked and served on the
+        session's next tick, like any late call.
+        """
+        max_batch = int(os.getenv("LLM_BATCH_MAX", "1") or 1)
+        if max_batch <= 1:
+            return backend
+        max_wait = float(os.getenv("LLM_BATCH_WAIT_MS", DEFAULT_MAX_WAIT_SECONDS * 1000)) / 1000
+        return cls(backend, max_batch, max_wait)
+
+    def complete(self, messages, context):
+        return self.backend.complete(messages, context)
+
+    def astream(self, messages, context):
+        return self.backend.astream(messages, context)
+
+    async def acomplete(self, messages, context):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((messages, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        # Callers that gave up (deadline without a session) are not sent
+        batch = [(messages, future) for messages, future in batch if not future.done()]
+        if batch:
+            send = asyncio.ensure_future(self._send([messages for messages, _ in batch]))
+            futures = [future for _, future in batch]
+            send.add_done_callback(lambda done: _deliver(done, futures))
+
+    async def _send(self, message_lists):
+        LLM_BATCH_SIZE.observe(len(message_lists))
+        if len(message_lists) == 1:
+            return [await self.backend.acomplete(message_lists[0], None)]
+        reply = await self.backend.acomplete(batch_messages(message_lists), None)
+        return split_batch_reply(reply, len(message_lists))
+
+
+def _deliver(send, futures):
+    """
+    Hands each waiting caller its pitch's evaluation, or the batch call's error.
+    """
+    error = asyncio.CancelledError() if send.cancelled() else send.exception()
+    contents = send.result() if error is None else None
+    for index, future in enumerate(futures):
+        if future.done():
+            continue
+        if error is not None:
+            future.set_exception(error)
+        elif contents[index] is None:
+            future.set_exception(LLMOutputError(f"Batched LLM output has no evaluation for pitch p{index}"))
+        else:
+            future.set_result(contents[index])
+
+
+def batch_messages(message_lists):
+    """
+    One chat request for several single-pitch requests: the first system prompt
+    plus BATCH_INSTRUCTIONS, and every pitch's user message under its own header.
+    """
+    system = message_lists[0][0]["content"] + BATCH_INSTRUCTIONS
+    sections = [f"{PITCH_HEADER}p{index}\n{messages[-1]['content']}" for index, messages in enumerate(message_lists)]
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": "\n\n".join(sections)}
+    ]
+
+
+def split_batch_reply(reply, count):
+    """
+    Splits a batched reply into per-pitch JSON strings (None where a pitch is missing).
+
+    Raises:
+        LLMOutputError: The reply is not JSON or has no "evaluations" object.
+    """
+    try:
+        data = loads(reply)
+    except (ValueError, TypeError) as e:
+        raise LLMOutputError(f"Batched LLM output is not valid JSON: {e}") from None
+    evaluations = data.get("evaluations") if isinstance(data, dict) else None
+    if not isinstance(evaluations, dict):
+        raise LLMOutputError("Batched LLM output has no 'evaluations' object")
+    contents = []
+    for index in range(count):
+        evaluation = evaluations.get(f"p{index}")
+        contents.append(dumps(evaluation).decode("utf-8") if evaluation is not None else None)
+    return contents
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_TTL_SECONDS = 300
+
+# Quantization used to build cache keys. Ticks whose context only differs below
+# these resolutions (a presenter pausing on a slide) share one LLM response.
+TRANSCRIPT_WINDOW_CHARS = 1000
+SIGNAL_STEP = 10       # facial_confidence / eye_contact / wpm
+TIMESTAMP_STEP = 15    # seconds
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize_text(text):
+    return _WHITESPACE.sub(" ", text or "").strip().lower()
+
+
+def _quantize(value, step):
+    try:
+        return int(round(float(value) / step)) * step
+    except (TypeError, ValueError):
+        return 0
+
+
+def context_cache_key(context):
+    """
+    Content address for an evaluation context (as built by GravityOrchestrator.build_context).
+
+    Text is whitespace/case-normalized (transcript limited to its most recent window),
+    numeric visual signals and the timestamp are quantized, then the canonical JSON is hashed.
+    """
+    visual = context.get("visual_signals", {})
+    slide = context.get("slide_context", {})
+    transcript = _normalize_text(context.get("audio_transcription", ""))
+
+    normalized = {
+        "t": _quantize(context.get("current_timestamp", 0), TIMESTAMP_STEP),
+        "limit": context.get("total_time_limit"),
+        "transcript": transcript[-TRANSCRIPT_WINDOW_CHARS:],
+        "wpm": _quantize(context.get("detected_wpm", 0), SIGNAL_STEP),
+        "conf": _quantize(visual.get("facial_confidence", 0), SIGNAL_STEP),
+        "eye": _quantize(visual.get("eye_contact", 0), SIGNAL_STEP),
+        "emotion": visual.get("emotion"),
+        "slide": [slide.get("number"), slide.get("total"), slide.get("topic")],
+        "ocr": _normalize_text(slide.get("ocr_text", "")),
+    }
+    canonical = json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SQLiteCacheBackend:
+    """
+    On-disk second tier so replays and demo runs never pay for the same call twice.
+    Entries never expire unless `ttl_seconds` is set.
+    """
+
+    def __init__(self, path, ttl_seconds=None):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.reopen()
+
+    def reopen(self):
+        """
+        Opens a fresh connection; SQLite connections must not be shared across fork().
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl_seconds is not None and time.time() - created_at > self.ttl_seconds:
+            return None
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)",
+                (key, value, time.time())
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class LLMCache:
+    """
+    Bounded LRU + TTL cache of raw LLM completions (JSON strings), keyed by
+    `context_cache_key`. An optional backend (e.g. SQLiteCacheBackend) is consulted
+    on memory misses and written through on every store.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, ttl_seconds=DEFAULT_TTL_SECONDS, backend=None, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.backend = backend
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        LLM_CACHE_SIZE (0 disables caching), LLM_CACHE_TTL_SECONDS, LLM_CACHE_PATH (SQLite file).
+        """
+        max_entries = int(os.getenv("LLM_CACHE_SIZE", DEFAULT_MAX_ENTRIES))
+        if max_entries <= 0:
+            return None
+        ttl_seconds = float(os.getenv("LLM_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        path = os.getenv("LLM_CACHE_PATH")
+        backend = SQLiteCacheBackend(path) if path else None
+        return cls(max_entries=max_entries, ttl_seconds=ttl_seconds, backend=backend)
+
+    def get(self, key):
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        value = self.backend.get(key) if self.backend is not None else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value, now)
+        return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._store(key, value, self._clock())
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def _store(self, key, value, now):
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,353 @@
+import asyncio
+import os
+import random
+import threading
+import time
+
+import openai
+from openai import AsyncOpenAI, OpenAI
+
+try:
+    import httpx
+except ImportError:  # newer SDK releases are built on httpx2
+    import httpx2 as httpx
+
+from services.context_builder import estimate_tokens
+from services.metrics import REGISTRY
+
+DEFAULT_TIMEOUT_SECONDS = 10.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE = 20
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_CAP_SECONDS = 8.0
+# A Retry-After longer than this is not waited out: the call fails instead
+MAX_RETRY_AFTER_SECONDS = 30.0
+
+# Rough completion size reserved against the tokens-per-minute budget until the
+# real usage is known.
+DEFAULT_COMPLETION_TOKENS = 250
+
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+LLM_RETRIES = REGISTRY.counter("pitch_llm_retries_total", "LLM call retries by reason.", ("reason",))
+LLM_THROTTLE_SECONDS = REGISTRY.histogram(
+    "pitch_llm_throttle_seconds", "Time LLM calls waited on the client-side rate limiter."
+)
+
+
+class RateLimiter:
+    """
+    Client-side admission for LLM calls: token buckets for requests-per-minute and
+    tokens-per-minute plus a cap on concurrent in-flight calls.
+
+    Buckets may go into debt, so callers are served roughly in arrival order and a
+    burst waits out the refill instead of hammering the API into 429s.
+    """
+
+    def __init__(self, requests_per_minute=None, tokens_per_minute=None, max_concurrency=None, clock=time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._request_tokens = float(requests_per_minute or 0)
+        self._llm_tokens = float(tokens_per_minute or 0)
+        self._updated = clock()
+        self._sync_slots = threading.BoundedSemaphore(max_concurrency) if max_concurrency else None
+        self._async_slots = {}  # event loop -> asyncio.Semaphore
+
+    @classmethod
+    def from_env(cls):
+        """
+        LLM_RPM, LLM_TPM and LLM_MAX_CONCURRENCY (unset/0 disables each limit).
+        """
+        def read(name):
+            value = int(os.getenv(name, "0") or 0)
+            return value or None
+        return cls(read("LLM_RPM"), read("LLM_TPM"), read("LLM_MAX_CONCURRENCY"))
+
+    def reserve(self, tokens=0):
+        """
+        Takes one request and `tokens` from the buckets.
+
+        Returns:
+            float: Seconds the caller must wait before sending.
+        """
+        with self._lock:
+            now = self._clock()
+            elapsed = now - self._updated
+            self._updated = now
+            wait = 0.0
+            if self.requests_per_minute:
+                rate = self.requests_per_minute / 60.0
+                self._request_tokens = min(self.requests_per_minute, self._request_tokens + elapsed * rate)
+                self._request_tokens -= 1
+                if self._request_tokens < 0:
+                    wait = max(wait, -self._request_tokens / rate)
+            if self.tokens_per_minute and tokens:
+                rate = self.tokens_per_minute / 60.0
+                self._llm_tokens = min(self.tokens_per_minute, self._llm_tokens + elapsed * rate)
+                self._llm_tokens -= tokens
+                if self._llm_tokens < 0:
+                    wait = max(wait, -self._llm_tokens / rate)
+            return wait
+
+    def adjust_tokens(self, delta):
+        """
+        Corrects the token bucket once actual usage is known (delta = actual - reserved).
+        """
+        if self.tokens_per_minute and delta:
+            with self._lock:
+                self._llm_tokens -= delta
+
+    def acquire(self, tokens=0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            LLM_THROTTLE_SECONDS.observe(wait)
+            time.sleep(wait)
+        if self._sync_slots is not None:
+            self._sync_slots.acquire()
+
+    def release(self):
+        if self._sync_slots is not None:
+            self._sync_slots.release()
+
+    async def acquire_async(self, tokens=0):
+        wait = self.reserve(tokens)
+        if wait > 0:
+            LLM_THROTTLE_SECONDS.observe(wait)
+            await asyncio.sleep(wait)
+        slots = self._loop_slots()
+        if slots is not None:
+            await slots.acquire()
+
+    def release_async(self):
+        slots = self._loop_slots()
+        if slots is not None:
+            slots.release()
+
+    def _loop_slots(self):
+        # asyncio primitives are bound to one loop; keep one semaphore per loop.
+        if not self.max_concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            slots = self._async_slots.get(loop)
+            if slots is None:
+                slots = self._async_slots[loop] = asyncio.Semaphore(self.max_concurrency)
+            return slots
+
+
+def is_retryable(error):
+    if isinstance(error, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code in RETRYABLE_STATUS_CODES
+    return False
+
+
+def retry_after_seconds(error):
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt, base=BACKOFF_BASE_SECONDS, cap=BACKOFF_CAP_SECONDS, retry_after=None):
+    """
+    "Full jitter" exponential backoff: uniform(0, min(cap, base * 2**attempt)),
+    never shorter than a server-provided Retry-After (the cap only bounds the
+    jittered part).
+    """
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def estimate_request_tokens(messages, completion_tokens=DEFAULT_COMPLETION_TOKENS):
+    # Prompt (same estimate the context builder budgets with) plus the reserved completion
+    return sum(estimate_tokens(m.get("content") or "") for m in messages) + completion_tokens
+
+
+def _retry_reason(error):
+    if isinstance(error, openai.APIStatusError):
+        return str(error.status_code)
+    if isinstance(error, openai.APITimeoutError):
+        return "timeout"
+    return "connection"
+
+
+class ManagedLLMClient:
+    """
+    Shared OpenAI client pair (sync + async) with an explicit connection pool,
+    per-call timeouts, jittered exponential backoff on 429/5xx/connection errors
+    and a RateLimiter in front of every call.
+
+    The SDK's own retries are disabled so all retry and pacing decisions happen here.
+    The async client must only be used from one event loop (the LLMDispatcher's).
+    """
+
+    def __init__(self, api_key, base_url=None, timeout=DEFAULT_TIMEOUT_SECONDS, max_retries=DEFAULT_MAX_RETRIES,
+                 max_connections=DEFAULT_MAX_CONNECTIONS, max_keepalive=DEFAULT_MAX_KEEPALIVE, limiter=None,
+                 backoff_base=BACKOFF_BASE_SECONDS, backoff_cap=BACKOFF_CAP_SECONDS):
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiter = limiter or RateLimiter()
+
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self.client = OpenAI(
+            api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0,
+            http_client=openai.DefaultHttpxClient(limits=limits, timeout=timeout)
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=api_key, base_url=base_url, timeout=timeout, max_retries=0,
+            http_client=openai.DefaultAsyncHttpxClient(limits=limits, timeout=timeout)
+        )
+
+    @classmethod
+    def from_env(cls, api_key, base_url=None):
+        """
+        LLM_TIMEOUT_SECONDS, LLM_MAX_RETRIES, LLM_MAX_CONNECTIONS plus the RateLimiter variables.
+        """
+        return cls(
+            api_key, base_url,
+            timeout=float(os.getenv("LLM_TIMEOUT_SECONDS", DEFAULT_TIMEOUT_SECONDS)),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS)),
+            limiter=RateLimiter.from_env()
+        )
+
+    def create(self, messages, **kwargs):
+        """
+        chat.completions.create with limiting and retries. Raises the last error
+        when retries are exhausted or the error is not retryable.
+        """
+        reserved = estimate_request_tokens(messages)
+        attempt = 0
+        while True:
+            self.limiter.acquire(reserved)
+            try:
+                response = self.client.chat.completions.create(messages=messages, **kwargs)
+                error = None
+            except openai.APIError as e:
+                error = e
+            except BaseException:
+                self.limiter.adjust_tokens(-reserved)
+                raise
+            finally:
+                self.limiter.release()
+
+            if error is None:
+                self._reconcile(response, reserved)
+                return response
+            # Back off without holding a concurrency slot
+            time.sleep(self._retry_delay(error, attempt, reserved))
+            attempt += 1
+
+    async def acreate(self, messages, **kwargs):
+        """
+        Async `create`; must run on the event loop that owns the async client.
+        """
+        reserved = estimate_request_tokens(messages)
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async(reserved)
+            try:
+                response = await self.async_client.chat.completions.create(messages=messages, **kwargs)
+                error = None
+            except openai.APIError as e:
+                error = e
+            except BaseException:
+                self.limiter.adjust_tokens(-reserved)
+                raise
+            finally:
+                self.limiter.release_async()
+
+            if error is None:
+                self._reconcile(response, reserved)
+                return response
+            await asyncio.sleep(self._retry_delay(error, attempt, reserved))
+            attempt += 1
+
+    async def astream(self, messages, **kwargs):
+        """
+        Streaming `acreate`: an async iterator over the completion chunks (the last
+        one carries usage). Retries only happen before the first chunk; once
+        content has been delivered an error is raised to the caller.
+        """
+        reserved = estimate_request_tokens(messages)
+        attempt = 0
+        while True:
+            await self.limiter.acquire_async(reserved)
+            try:
+                stream = await self.async_client.chat.completions.create(
+                    messages=messages, stream=True, stream_options={"include_usage": True}, **kwargs
+                )
+                break
+            except openai.APIError as error:
+                self.limiter.release_async()
+                delay = self._retry_delay(error, attempt, reserved)
+            except BaseException:
+                self.limiter.release_async()
+                self.limiter.adjust_tokens(-reserved)
+                raise
+            await asyncio.sleep(delay)
+            attempt += 1
+
+        # The concurrency slot is held until the stream is drained
+        try:
+            async for chunk in stream:
+                self._reconcile(chunk, reserved)
+                yield chunk
+        finally:
+            self.limiter.release_async()
+
+    def _retry_delay(self, error, attempt, reserved):
+        """
+        Returns the wait before retrying a failed attempt, after handing its token
+        reservation back (the next attempt reserves again). Raises `error` when it
+        is not retryable, retries are exhausted, or Retry-After exceeds
+        MAX_RETRY_AFTER_SECONDS.
+        """
+        self.limiter.adjust_tokens(-reserved)
+        retry_after = retry_after_seconds(error)
+        if (attempt >= self.max_retries or not is_retryable(error)
+                or (retry_after is not None and retry_after > MAX_RETRY_AFTER_SECONDS)):
+            raise error
+        LLM_RETRIES.inc(_retry_reason(error))
+        return backoff_delay(attempt, self.backoff_base, self.backoff_cap, retry_after)
+
+    def _reconcile(self, response, reserved):
+        usage = getattr(response, "usage", None)
+        if usage is not None and usage.total_tokens:
+            self.limiter.adjust_tokens(usage.total_tokens - reserved)
+
+    def close(self):
+        self.client.close()
+
+
+_shared_clients = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_client(api_key, base_url=None):
+    """
+    One ManagedLLMClient (and therefore one connection pool and one limiter) per
+    (api_key, base_url) per process.
+    """
+    key = (api_key, base_url)
+    with _shared_lock:
+        client = _shared_clients.get(key)
+        if client is None:
+            client = _shared_clients[key] = ManagedLLMClient.from_env(api_key, base_url)
+        return client
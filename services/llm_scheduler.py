@@ -0,0 +1,187 @@
+import os
+import threading
+from collections import OrderedDict
+
+from services.metrics import REGISTRY
+from services.models import LLMEvaluation
+from services.tier2_coherence import NUMBER_PATTERN
+
+DEFAULT_MIN_NEW_WORDS = 40
+DEFAULT_MAX_STALENESS_SECONDS = 30.0
+MAX_TRACKED_SESSIONS = 2048
+
+LLM_SCHEDULER_DECISIONS = REGISTRY.counter(
+    "pitch_llm_scheduler_decisions_total",
+    "LLM scheduling decisions (dispatch reasons, or skipped).",
+    ("decision",)
+)
+
+
+class _SessionState:
+    __slots__ = ("deferred", "dispatched_at", "emotion", "last_analysis", "new_words", "numbers", "skipped",
+                 "slide", "transcript_len")
+
+    def __init__(self):
+        self.slide = None
+        self.emotion = None
+        self.transcript_len = 0
+        self.new_words = 0
+        self.numbers = set()
+        self.dispatched_at = None
+        self.last_analysis = None
+        self.skipped = 0
+        self.deferred = False
+
+
+class LLMScheduler:
+    """
+    Decides, per session tick, whether anything changed enough to be worth an
+    LLM evaluation.
+
+    A call is dispatched on the first tick, a slide change, `min_new_words` new
+    transcript words, a number not heard before, an emotion shift, or when the last
+    evaluation is older than `max_staleness` seconds of pitch time. Otherwise the
+    caller reuses the last LLM tiered_analysis (pacing is still recomputed every tick).
+
+    Only the transcript text added since the previous tick is scanned.
+    """
+
+    def __init__(self, min_new_words=DEFAULT_MIN_NEW_WORDS, max_staleness=DEFAULT_MAX_STALENESS_SECONDS,
+                 max_sessions=MAX_TRACKED_SESSIONS):
+        self.min_new_words = min_new_words
+        self.max_staleness = max_staleness
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()  # session_id -> _SessionState
+        self._lock = threading.Lock()
+        self.dispatched = 0
+        self.skipped = 0
+
+    @classmethod
+    def from_env(cls):
+        """
+        LLM_MIN_NEW_WORDS and LLM_MAX_STALENESS_SECONDS. LLM_SCHEDULER=0 disables
+        scheduling (returns None, so every tick is dispatched).
+        """
+        if os.getenv("LLM_SCHEDULER", "1") == "0":
+            return None
+        return cls(
+            min_new_words=int(os.getenv("LLM_MIN_NEW_WORDS", DEFAULT_MIN_NEW_WORDS)),
+            max_staleness=float(os.getenv("LLM_MAX_STALENESS_SECONDS", DEFAULT_MAX_STALENESS_SECONDS))
+        )
+
+    def _state(self, session_id):
+        state = self._sessions.get(session_id)
+        if state is None:
+            state = self._sessions[session_id] = _SessionState()
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        else:
+            self._sessions.move_to_end(session_id)
+        return state
+
+    def check(self, session_id, audio_data, video_data, deck_data, current_timestamp):
+        """
+        Records the tick and returns the reason to dispatch, or None to skip.
+
+        Args:
+            session_id (str): Session key.
+            audio_data / video_data / deck_data (dict): Frame sections as sent to `/analyze`.
+            current_timestamp (float): Seconds into the pitch.
+
+        Returns:
+            str | None: "first", "slide", "words", "numbers", "emotion", "deferred"
+            or "stale"; None when the last evaluation can be reused.
+        """
+        transcript = audio_data.get('transcription', "") or ""
+        slide = (deck_data.get('current_slide_number'), deck_data.get('slide_topic'))
+        emotion = video_data.get('emotional_tone', "Neutral")
+
+        with self._lock:
+            state = self._state(session_id)
+
+            if len(transcript) < state.transcript_len:
+                state.transcript_len = 0  # transcript restarted
+            new_text = transcript[state.transcript_len:]
+            state.transcript_len = len(transcript)
+            state.new_words += len(new_text.split())
+            new_numbers = set(NUMBER_PATTERN.findall(new_text)) - state.numbers
+
+            if state.dispatched_at is None:
+                reason = "first"
+            elif slide != state.slide:
+                reason = "slide"
+            elif new_numbers:
+                reason = "numbers"
+            elif emotion != state.emotion:
+                reason = "emotion"
+            elif state.new_words >= self.min_new_words:
+                reason = "words"
+            elif state.deferred:
+                reason = "deferred"
+            elif current_timestamp - state.dispatched_at >= self.max_staleness:
+                reason = "stale"
+            else:
+                reason = None
+
+            state.numbers |= new_numbers
+            if reason is None:
+                state.skipped += 1
+                self.skipped += 1
+            else:
+                state.slide = slide
+                state.emotion = emotion
+                state.new_words = 0
+                state.deferred = False
+                state.dispatched_at = current_timestamp
+                self.dispatched += 1
+
+        LLM_SCHEDULER_DECISIONS.inc(reason or "skipped")
+        return reason
+
+    def defer(self, session_id):
+        """
+        Keeps the session due: a tick that was due but could not be dispatched
+        (the previous call is still running) makes the next tick dispatch instead,
+        so the change that made it due still gets its own evaluation.
+        """
+        with self._lock:
+            self._state(session_id).deferred = True
+
+    def remember(self, session_id, llm_result):
+        """
+        Stores the latest LLMEvaluation's tiered_analysis for reuse on skipped ticks.
+        """
+        if llm_result is not None:
+            with self._lock:
+                self._state(session_id).last_analysis = llm_result.tiered_analysis
+
+    def reuse(self, session_id):
+        """
+        Result to serve on a skipped tick: the last tiered_analysis with no new
+        feedback items (they were already delivered), or None if there is none yet.
+        """
+        with self._lock:
+            state = self._sessions.get(session_id)
+            analysis = state.last_analysis if state is not None else None
+        if analysis is None:
+            return None
+        return LLMEvaluation(analysis)
+
+    def skipped_count(self, session_id):
+        with self._lock:
+            state = self._sessions.get(session_id)
+            return state.skipped if state is not None else 0
+
+    def forget(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self):
+        with self._lock:
+            total = self.dispatched + self.skipped
+            return {
+                "dispatched": self.dispatched,
+                "skipped": self.skipped,
+                "skip_ratio": (self.skipped / total) if total else 0.0,
+                "sessions": len(self._sessions)
+            }
@@ -0,0 +1,114 @@
+from services.models import (
+    LLMOutputError,
+    loads,
+    parse_feedback_item,
+    parse_tiered_analysis,
+)
+
+TIERED_ANALYSIS = "tiered_analysis"
+FEEDBACK = "feedback"
+
+
+class EvaluationStreamParser:
+    """
+    Incremental scanner for the evaluation JSON as it streams in. Reports the
+    `tiered_analysis` object and each `real_time_feedback` item the moment its
+    closing brace arrives, long before the whole completion is done.
+
+    Only nesting, strings and keys are tracked; the completed objects themselves
+    are decoded and validated with the same rules as parse_llm_output. Each
+    character is scanned once, so the total cost is O(len(completion)).
+    """
+
+    def __init__(self):
+        self.text = []          # chunks received so far
+        self._buffer = ""       # text of the object currently being collected
+        self._stack = []        # [container, key in parent] per open {/[
+        self._key = None        # last key read in the innermost object
+        self._expect_key = False
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._capture_start = None
+        self._feedback_index = 0
+
+    def feed(self, chunk):
+        """
+        Consumes the next piece of the completion.
+
+        Returns:
+            list[tuple]: (TIERED_ANALYSIS, TieredAnalysis) / (FEEDBACK, FeedbackItem)
+            events completed by this chunk, in order.
+
+        Raises:
+            LLMOutputError: A completed object does not match the schema.
+        """
+        self.text.append(chunk)
+        events = []
+        base = len(self._buffer)
+        self._buffer += chunk
+        for offset, ch in enumerate(chunk):
+            position = base + offset
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._expect_key:
+                        self._key = loads(self._buffer[self._string_start:position + 1])
+                        self._expect_key = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                self._string_start = position
+            elif ch == "{" or ch == "[":
+                parent_key = self._key if self._stack and self._stack[-1][0] == "{" else None
+                self._stack.append((ch, parent_key))
+                if self._capture_start is None and self._is_target(ch):
+                    self._capture_start = position
+                self._key = None
+                self._expect_key = ch == "{"
+            elif ch == "}" or ch == "]":
+                if not self._stack:
+                    raise LLMOutputError("LLM output has unbalanced brackets")
+                if self._capture_start is not None and len(self._stack) == self._capture_depth():
+                    events.append(self._emit(self._buffer[self._capture_start:position + 1]))
+                    self._capture_start = None
+                self._key = self._stack.pop()[1]
+                self._expect_key = False
+            elif ch == "," and self._stack and self._stack[-1][0] == "{":
+                self._expect_key = True
+
+        if self._capture_start is None and not self._in_string:
+            # Nothing to keep: drop the scanned text so the buffer stays small
+            self._buffer = ""
+        return events
+
+    def content(self):
+        return "".join(self.text)
+
+    def _is_target(self, ch):
+        # Called after the new container was pushed: root.tiered_analysis or root.real_time_feedback[i]
+        if ch != "{":
+            return False
+        depth = len(self._stack)
+        if depth == 2:
+            return self._stack[1][1] == "tiered_analysis"
+        return depth == 3 and self._stack[1] == ("[", "real_time_feedback")
+
+    def _capture_depth(self):
+        return 2 if self._stack[1][1] == "tiered_analysis" else 3
+
+    def _emit(self, raw):
+        try:
+            value = loads(raw)
+        except ValueError as e:
+            raise LLMOutputError(f"LLM output is not valid JSON: {e}") from None
+        if len(self._stack) == 2:
+            return TIERED_ANALYSIS, parse_tiered_analysis(value)
+        item = parse_feedback_item(value, self._feedback_index)
+        self._feedback_index += 1
+        return FEEDBACK, item
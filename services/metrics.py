@@ -0,0 +1,214 @@
+import bisect
+import threading
+import time
+
+# Seconds; covers sub-millisecond heuristic tiers up to slow LLM round trips.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    def __init__(self, name, help_text, label_names=()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values):
+        with self._lock:
+            return self._values.get(label_values, 0)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for label_values, value in items:
+            lines.append(f"{self.name}{_labels(self.label_names, label_values)} {_num(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram. `observe` is a bisect plus a few additions under a lock
+    (about a microsecond), so instrumenting every tier stays far below 1% of a request.
+    """
+
+    def __init__(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label_values -> [bucket_counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def observe_many(self, observations):
+        """
+        Records several (label_value, value) pairs under one lock acquisition; used
+        by the pipeline to flush all per-stage timings of a request at once.
+        """
+        buckets = self.buckets
+        indexed = [(label, value, bisect.bisect_left(buckets, value)) for label, value in observations]
+        with self._lock:
+            for label, value, index in indexed:
+                key = (label,)
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * len(buckets), 0.0, 0]
+                if index < len(buckets):
+                    series[0][index] += 1
+                series[1] += value
+                series[2] += 1
+
+    def time(self, *label_values):
+        """
+        Context manager observing the elapsed wall time of its block.
+        """
+        return _Timer(self, label_values)
+
+    def count(self, *label_values):
+        with self._lock:
+            series = self._series.get(label_values)
+            return series[2] if series else 0
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((k, (list(v[0]), v[1], v[2])) for k, v in self._series.items())
+        for label_values, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                labels = _labels(self.label_names + ("le",), label_values + (_num(bound),))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.label_names + ("le",), label_values + ("+Inf",))
+            lines.append(f"{self.name}_bucket{labels} {count}")
+            base = _labels(self.label_names, label_values)
+            lines.append(f"{self.name}_sum{base} {_num(total)}")
+            lines.append(f"{self.name}_count{base} {count}")
+        return lines
+
+
+class _Timer:
+    # Plain class rather than @contextmanager: roughly 3x cheaper per block.
+    __slots__ = ("histogram", "label_values", "start")
+
+    def __init__(self, histogram, label_values):
+        self.histogram = histogram
+        self.label_values = label_values
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start, *self.label_values)
+        return False
+
+
+class Gauge:
+    """
+    Gauge whose value is read from a callback at scrape time (e.g. cache hit ratio).
+    """
+
+    def __init__(self, name, help_text, fn):
+        self.name = name
+        self.help_text = help_text
+        self.fn = fn
+
+    def render(self):
+        try:
+            value = self.fn()
+        except Exception:
+            return []
+        if value is None:
+            return []
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge", f"{self.name} {_num(value)}"]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and not isinstance(metric, Gauge):
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, help_text, label_names=()):
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(self, name, help_text, label_names=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def gauge(self, name, help_text, fn):
+        return self._register(Gauge(name, help_text, fn))
+
+    def render(self):
+        """
+        Prometheus text exposition format (version 0.0.4).
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    pairs = ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values))
+    return "{" + pairs + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _num(value):
+    if isinstance(value, float):
+        return repr(value) if value != int(value) else f"{value:.1f}"
+    return str(value)
+
+
+# Process-wide registry and the pipeline's standard metrics
+REGISTRY = MetricsRegistry()
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    "pitch_request_seconds", "End-to-end request latency.", ("endpoint",)
+)
+STAGE_SECONDS = REGISTRY.histogram(
+    "pitch_stage_seconds", "Latency of each pipeline stage (tier1, llm, tier2, tier3, progress, serialize).", ("stage",)
+)
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "pitch_llm_call_seconds", "Latency of LLM API calls by outcome.", ("outcome",)
+)
+LLM_FIRST_EVENT_SECONDS = REGISTRY.histogram(
+    "pitch_llm_first_event_seconds", "Time from a streamed LLM call to its first parsed scores or feedback item."
+)
+LLM_TOKENS = REGISTRY.counter(
+    "pitch_llm_tokens_total", "LLM tokens used.", ("kind",)
+)
+ANALYSIS_SOURCE = REGISTRY.counter(
+    "pitch_analysis_source_total", "Responses by analysis source (llm, llm_late, heuristic).", ("source",)
+)
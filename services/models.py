@@ -0,0 +1,161 @@
+import json
+from dataclasses import dataclass
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib encoder is used without it
+    orjson = None
+
+FEEDBACK_TYPES = frozenset({"CRITICAL_MISMATCH", "BEHAVIOR_ALERT", "KUDOS"})
+SCORE_FIELDS = ("coherence_score", "delivery_confidence", "slide_quality")
+
+
+class LLMOutputError(ValueError):
+    """
+    LLM output that does not match the response schema. Callers treat it like
+    any other LLM failure and fall back to the heuristic tiers.
+    """
+
+
+@dataclass(slots=True, frozen=True)
+class TieredAnalysis:
+    coherence_score: int
+    delivery_confidence: int
+    slide_quality: int
+
+    def to_dict(self):
+        return {
+            "coherence_score": self.coherence_score,
+            "delivery_confidence": self.delivery_confidence,
+            "slide_quality": self.slide_quality
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class FeedbackItem:
+    timestamp: str
+    type: str
+    message: str
+
+    def to_dict(self):
+        return {"timestamp": self.timestamp, "type": self.type, "message": self.message}
+
+
+@dataclass(slots=True, frozen=True)
+class DashboardStatus:
+    overall_score: int
+    pacing_signal: str
+    time_remaining_projection: str
+    analysis_source: str
+    # Admission tier the tick was served at (services/admission.py)
+    service_tier: str = "full"
+
+    def to_dict(self):
+        return {
+            "overall_score": self.overall_score,
+            "pacing_signal": self.pacing_signal,
+            "time_remaining_projection": self.time_remaining_projection,
+            "analysis_source": self.analysis_source,
+            "service_tier": self.service_tier
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class LLMEvaluation:
+    tiered_analysis: TieredAnalysis
+    real_time_feedback: tuple = ()
+
+    def to_dict(self):
+        return {
+            "tiered_analysis": self.tiered_analysis.to_dict(),
+            "real_time_feedback": [item.to_dict() for item in self.real_time_feedback]
+        }
+
+
+def _score(analysis, field):
+    value = analysis.get(field)
+    # bool is an int subclass; "true" is not a score
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise LLMOutputError(f"tiered_analysis.{field} must be a number, got {value!r}")
+    if not 0 <= value <= 100:
+        raise LLMOutputError(f"tiered_analysis.{field} out of range: {value!r}")
+    return int(round(value))
+
+
+def parse_tiered_analysis(analysis):
+    """
+    Validates a decoded `tiered_analysis` object.
+
+    Raises:
+        LLMOutputError: Missing, non-numeric or out-of-range scores.
+    """
+    if not isinstance(analysis, dict):
+        raise LLMOutputError("tiered_analysis is missing")
+    return TieredAnalysis(*(_score(analysis, field) for field in SCORE_FIELDS))
+
+
+def parse_feedback_item(item, index=0):
+    """
+    Validates one decoded `real_time_feedback` entry.
+
+    Raises:
+        LLMOutputError: Not an object, unknown type, or missing message/timestamp.
+    """
+    if not isinstance(item, dict):
+        raise LLMOutputError(f"real_time_feedback[{index}] must be an object")
+    timestamp, kind, message = item.get("timestamp"), item.get("type"), item.get("message")
+    if kind not in FEEDBACK_TYPES:
+        raise LLMOutputError(f"real_time_feedback[{index}].type is not one of {sorted(FEEDBACK_TYPES)}: {kind!r}")
+    if not isinstance(message, str) or not message:
+        raise LLMOutputError(f"real_time_feedback[{index}].message must be a non-empty string")
+    if not isinstance(timestamp, str):
+        raise LLMOutputError(f"real_time_feedback[{index}].timestamp must be a string")
+    return FeedbackItem(timestamp, kind, message)
+
+
+def parse_llm_output(content):
+    """
+    Decodes and validates the LLM's JSON response in one pass.
+
+    Args:
+        content (str | bytes | dict): Raw message content (or an already decoded object).
+
+    Returns:
+        LLMEvaluation: Validated scores and feedback items.
+
+    Raises:
+        LLMOutputError: Not JSON, missing/non-numeric/out-of-range scores, or malformed feedback.
+    """
+    if isinstance(content, dict):
+        data = content
+    else:
+        try:
+            data = loads(content)
+        except (ValueError, TypeError) as e:
+            raise LLMOutputError(f"LLM output is not valid JSON: {e}") from None
+        if not isinstance(data, dict):
+            raise LLMOutputError("LLM output must be a JSON object")
+
+    tiered = parse_tiered_analysis(data.get("tiered_analysis"))
+
+    feedback = data.get("real_time_feedback", [])
+    if feedback is None:
+        feedback = []
+    if not isinstance(feedback, list):
+        raise LLMOutputError("real_time_feedback must be a list")
+    return LLMEvaluation(tiered, tuple(parse_feedback_item(item, i) for i, item in enumerate(feedback)))
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj):
+    """
+    Compact JSON as bytes, using orjson when it is installed.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,303 @@
+import bisect
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+# Relative tolerance when matching a spoken value against the slide ("about 2.3
+# million" vs "$2,312,000"). Spoken figures are usually rounded.
+DEFAULT_TOLERANCE = 0.05
+SLIDE_INDEX_CACHE_SIZE = 1024
+
+# Kinds: "percent" and "currency" only match their own kind; a bare "number"
+# ("we have 2 million") matches any kind.
+NUMBER, PERCENT, CURRENCY = "number", "percent", "currency"
+
+SCALES = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "mm": 1e6, "mn": 1e6, "million": 1e6, "millions": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9, "billions": 1e9,
+    "t": 1e12, "tn": 1e12, "trillion": 1e12,
+}
+# Bare one-letter suffixes need to be glued to the digits ("2M", "$5k"); words may follow a space
+_SCALE_GLUED = "k|mm|mn|m|bn|b|tn|t"
+_SCALE_WORDS = "thousand|millions?|billions?|trillion|bn|mn"
+CURRENCY_SYMBOLS = "$€£¥"
+CURRENCY_WORDS = {"dollar", "dollars", "usd", "euro", "euros", "eur", "pound", "pounds", "gbp"}
+
+_NUMERIC = re.compile(
+    # The lookahead lets the scanner skip ordinary text quickly
+    r"(?=[" + CURRENCY_SYMBOLS + r"\d])"
+    r"(?P<cur>[" + CURRENCY_SYMBOLS + r"])?\s?"
+    r"(?P<num>\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)"
+    r"(?:(?P<glued>" + _SCALE_GLUED + r")\b|\s?(?P<word>" + _SCALE_WORDS + r")\b)?"
+    r"(?:\s?(?P<pct>%|percent\b|per cent\b))?"
+    r"(?:\s(?P<curword>dollars?|usd|euros?|eur|pounds?|gbp)\b)?",
+    re.IGNORECASE
+)
+
+_UNITS = {
+    "zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+    "eight": 8, "nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13,
+    "fourteen": 14, "fifteen": 15, "sixteen": 16, "seventeen": 17, "eighteen": 18, "nineteen": 19,
+}
+_TENS = {
+    "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+    "sixty": 60, "seventy": 70, "eighty": 80, "ninety": 90,
+}
+_WORD_SCALES = {"hundred": 100, "thousand": 1e3, "million": 1e6, "billion": 1e9, "trillion": 1e12}
+NUMBER_WORDS = frozenset(_UNITS) | frozenset(_TENS) | frozenset(_WORD_SCALES) | {"a", "and"}
+_NUMBER_STARTS = frozenset(_UNITS) | frozenset(_TENS)
+# Words before a number that make it a reference, not a figure ("slide 3", "page 12")
+REFERENCE_WORDS = frozenset({"slide", "slides", "page", "pages", "step", "steps", "figure", "fig",
+                             "chapter", "section", "question", "#"})
+_REFERENCE_BEFORE = re.compile(r"\b(?:" + "|".join(sorted(REFERENCE_WORDS - {"#"})) + r")\.?\s*#?\s*$|#\s*$",
+                               re.IGNORECASE)
+# Four-digit integers in this range are years when the words around them say so
+# ("launched in 2019", "FY 2024", "Q3 2024", "2019-2021"); "2000 customers" is a count
+YEAR_RANGE = (1900, 2100)
+YEAR_WORDS = frozenset({"in", "since", "by", "from", "until", "till", "through", "during", "year",
+                        "fy", "q1", "q2", "q3", "q4", "h1", "h2"})
+_YEAR_BEFORE = re.compile(r"(?:\b(?:" + "|".join(sorted(YEAR_WORDS)) + r")|\b\d{4}\s*(?:[-–—]|to))\s*$",
+                          re.IGNORECASE)
+_YEAR_AFTER = re.compile(r"\s*(?:[-–—]|to)\s*\d{4}\b", re.IGNORECASE)
+# Words that only read as a year range once the next number arrives ("2019 to", "2019 -")
+_RANGE_WORDS = frozenset({"to", "-", "–", "—"})
+# Numbers written as a single small word are ordinary speech ("one of", "two things")
+MIN_WORD_NUMBER_VALUE = 10
+MULTIPLIER_SUFFIXES = "xX×"
+# Tokens are split on whitespace after punctuation is blanked out; digit tokens are
+# kept so they break up word sequences ("a $1.5 billion" is not "a billion")
+_PUNCTUATION_TO_SPACE = str.maketrans({ch: " " for ch in ".,;:!?()\"'$€£¥"})
+
+
+@dataclass(slots=True, frozen=True)
+class NumericFact:
+    value: float
+    kind: str
+    text: str
+    # Rounding implied by how it was written: "2 million" means 1.5M-2.5M, "2.3M" 2.25M-2.35M
+    margin: float = 0.0
+
+    def key(self):
+        """
+        Identity for dedup: the same value/kind spoken twice is one fact.
+        """
+        return (round(self.value, 6), self.kind)
+
+
+def _parse_decimal(text):
+    return float(text.replace(",", ""))
+
+
+@lru_cache(maxsize=4096)
+def _parse_numeric(token):
+    """
+    NumericFact for one `_NUMERIC` match; pitches repeat the same few figures, so
+    each distinct spelling is parsed once.
+    """
+    m = _NUMERIC.match(token)
+    number = m.group("num")
+    value = _parse_decimal(number)
+    margin = 0.0
+    scale = m.group("glued") or m.group("word")
+    if scale:
+        value *= SCALES[scale.lower()]
+        decimals = len(number.split(".")[1]) if "." in number else 0
+        margin = SCALES[scale.lower()] * 10 ** -decimals / 2
+    if m.group("pct"):
+        kind = PERCENT
+    elif m.group("cur") or m.group("curword"):
+        kind = CURRENCY
+    else:
+        kind = NUMBER
+    return NumericFact(value, kind, token.strip(), margin)
+
+
+def _is_figure(text, m, fact):
+    """
+    False for digits that are not a claim to check against the slide: years in
+    year context, "slide/page N" references, quarters and other codes glued to
+    letters ("Q3", "FY24", "H1") and "10x" multipliers.
+    """
+    start, end = m.start(), m.end()
+    if not m.group("cur") and start and text[start - 1].isalpha():
+        return False  # Q3, FY2024, H1, B2B
+    if end < len(text) and text[end] in MULTIPLIER_SUFFIXES and (end + 1 == len(text) or not text[end + 1].isalpha()):
+        return False  # 10x
+    if fact.kind != NUMBER or fact.margin or "." in fact.text:
+        return True
+    if _REFERENCE_BEFORE.search(text, max(0, start - 12), start):
+        return False
+    return not _is_year(text, start, end, fact)
+
+
+def _is_year(text, start, end, fact):
+    if len(fact.text) != 4 or not YEAR_RANGE[0] <= fact.value <= YEAR_RANGE[1]:
+        return False
+    return bool(_YEAR_BEFORE.search(text, max(0, start - 12), start) or _YEAR_AFTER.match(text, end))
+
+
+def _digit_facts(text):
+    facts = []
+    for m in _NUMERIC.finditer(text):
+        fact = _parse_numeric(m.group(0))
+        if _is_figure(text, m, fact):
+            facts.append((m.start(), fact))
+    return facts
+
+
+def _word_facts(text):
+    """
+    Written numbers ("two million", "forty five percent", "a hundred"). Single
+    small words ("one of", "two things") are ignored unless a scale or percent
+    follows, so ordinary speech does not produce facts.
+    """
+    lowered = text.lower()
+    words = lowered.translate(_PUNCTUATION_TO_SPACE).split()
+    if _NUMBER_STARTS.isdisjoint(words) and _WORD_SCALES.keys().isdisjoint(words):
+        return []  # the common case: nothing written out in words
+
+    facts = []
+    cursor = 0
+    i, count = 0, len(words)
+    while i < count:
+        word = words[i]
+        if word not in _NUMBER_STARTS and not (word == "a" and i + 1 < count and words[i + 1] in _WORD_SCALES):
+            i += 1
+            continue
+
+        total, current, last_scale, j = 0.0, 0.0, 0, i
+        while j < count:
+            word = words[j]
+            if word in _UNITS:
+                current += _UNITS[word]
+            elif word in _TENS:
+                current += _TENS[word]
+            elif word == "a" and j == i:
+                current = 1
+            elif word == "hundred":
+                current = (current or 1) * 100
+                last_scale = 100
+            elif word in _WORD_SCALES:
+                total += (current or 1) * _WORD_SCALES[word]
+                current = 0.0
+                last_scale = _WORD_SCALES[word]
+            elif word == "and" and j > i and j + 1 < count and words[j + 1] in NUMBER_WORDS:
+                pass
+            else:
+                break
+            j += 1
+        value = total + current
+
+        kind = NUMBER
+        if j < count and words[j] in ("percent", "%"):
+            kind = PERCENT
+            j += 1
+        elif j < count and words[j] in CURRENCY_WORDS:
+            kind = CURRENCY
+            j += 1
+
+        if i and words[i - 1] in REFERENCE_WORDS and not last_scale and kind == NUMBER:
+            pass  # "page twenty"
+        elif last_scale or kind != NUMBER or value >= MIN_WORD_NUMBER_VALUE:
+            # "two million" is rounded to the million; "two million five hundred" is not
+            margin = last_scale / 2 if last_scale and not current else 0.0
+            offset = lowered.find(words[i], cursor)
+            cursor = max(offset, cursor)
+            facts.append((cursor, NumericFact(value, kind, " ".join(words[i:j]), margin)))
+        i = j
+    return facts
+
+
+def extract_facts(text):
+    """
+    Numeric facts in `text` with units normalized: "$2M", "2,000,000 dollars" and
+    "two million dollars" all become NumericFact(2000000.0, "currency", ...).
+    Years, slide/page references, quarters and multipliers are not facts (see
+    _is_figure).
+
+    Returns:
+        list[NumericFact]: In order of appearance.
+    """
+    if not text:
+        return []
+    facts = _digit_facts(text)
+    word_facts = _word_facts(text)
+    if word_facts:
+        facts.extend(word_facts)
+        facts.sort(key=lambda item: item[0])
+    return [fact for _, fact in facts]
+
+
+def _kinds_compatible(a, b):
+    return a == b or a == NUMBER or b == NUMBER
+
+
+class FactIndex:
+    """
+    The numeric facts of one slide, sorted by value so a spoken fact is matched
+    with a binary search (plus a look at its neighbours for the tolerance band)
+    instead of a scan over every slide number.
+    """
+
+    __slots__ = ("_values", "facts", "tolerance")
+
+    def __init__(self, facts, tolerance=DEFAULT_TOLERANCE):
+        self.facts = sorted({fact.key(): fact for fact in facts}.values(), key=lambda f: f.value)
+        self._values = [fact.value for fact in self.facts]
+        self.tolerance = tolerance
+
+    def __len__(self):
+        return len(self.facts)
+
+    def __bool__(self):
+        return bool(self.facts)
+
+    def matches(self, fact):
+        """
+        True when the slide shows a value within `tolerance` (or the spoken fact's
+        rounding margin) of `fact` with a compatible kind.
+        """
+        margin = max(abs(fact.value) * self.tolerance, fact.margin)
+        lo = bisect.bisect_left(self._values, fact.value - margin)
+        hi = bisect.bisect_right(self._values, fact.value + margin)
+        for candidate in self.facts[lo:hi]:
+            if _kinds_compatible(candidate.kind, fact.kind) and \
+                    abs(candidate.value - fact.value) <= max(margin, self.tolerance * abs(candidate.value)):
+                return True
+        return False
+
+    def labels(self):
+        """
+        The slide's figures as written, for feedback messages.
+        """
+        return [fact.text for fact in self.facts]
+
+
+@lru_cache(maxsize=SLIDE_INDEX_CACHE_SIZE)
+def slide_fact_index(slide_ocr):
+    """
+    FactIndex for a slide's OCR text, built once per distinct slide text and reused
+    by every later frame (and session) showing the same slide.
+    """
+    return FactIndex(extract_facts(slide_ocr))
+
+
+def is_context_word(token):
+    """
+    True for words that change how a following number reads: references ("slide",
+    "page") and year context ("in", "since", "FY", "2019 to").
+    """
+    token = token.strip(".,;:!?").lower()
+    return token in REFERENCE_WORDS or token in YEAR_WORDS or token in _RANGE_WORDS
+
+
+def is_numeric_token(token):
+    """
+    True for tokens that may be part of a number still being spoken ("2", "$2.5",
+    "two", "hundred"); used to hold back the end of a transcript chunk.
+    """
+    token = token.strip(".,;:!?").lower()
+    if not token:
+        return False
+    return any(ch.isdigit() for ch in token) or token in NUMBER_WORDS or token in CURRENCY_SYMBOLS
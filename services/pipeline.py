@@ -0,0 +1,224 @@
+import re
+from time import perf_counter
+
+from services.admission import FULL, LLM_SAMPLED, PACING_ONLY, should_sample_llm
+from services.metrics import ANALYSIS_SOURCE, STAGE_SECONDS
+from services.models import DashboardStatus
+from services.progress import analyze_progress, match_stage
+from services.tier1_pacing import analyze_pacing
+from services.tier2_coherence import analyze_coherence
+from services.tier3_viability import PACING_MAP, calculate_scores
+
+# Heuristic alerts are deterministic checks (number on slide vs. spoken, emotion vs.
+# topic); they are kept next to the LLM's feedback unless it already raised the same one.
+HEURISTIC_ALERT_TYPES = ("CRITICAL_MISMATCH", "BEHAVIOR_ALERT")
+# Heuristic messages quote what they are about: the spoken figure or the emotion
+_ALERT_SUBJECT = re.compile(r"'([^']+)'")
+
+def analyze_frame(data, dispatcher=None, coherence_tracker=None, timings=None, session_state=None, decks=None,
+                  on_llm_event=None, service_tier=FULL):
+    """
+    Runs the full per-tick analysis for one frame payload.
+
+    Args:
+        data (dict): `/analyze` payload (audio_analysis, video_analysis, deck_content,
+            current_timestamp and optional session_id / pitch_format / latency_budget_ms,
+            which overrides the dispatcher deadline for this request).
+        dispatcher (LLMDispatcher | None): LLM path; heuristics only when None/disabled.
+            The heuristic tiers always run while the LLM call is in flight; LLM scores
+            win when the call lands within the budget, merged with heuristic alerts.
+        coherence_tracker (CoherenceTracker | None): Session's incremental Tier 2 engine. When
+            given, only new transcript text is scanned and alerts are emitted once.
+        timings (list | None): When given, (stage, seconds) pairs are appended here for
+            the caller to flush (e.g. together with serialization time); otherwise
+            they are recorded in STAGE_SECONDS directly.
+        session_state (SessionState | None): State carried between ticks of one session.
+            When given it is updated in place, progress reports the stages actually
+            visited, pacing uses the session's dwell history (PacingTracker) and
+            feedback already delivered is not repeated.
+        decks (DeckStore | None): Resolves `deck_content.deck_id` references to the
+            uploaded slide's precomputed features (see /decks).
+        on_llm_event (callable | None): Streams the LLM completion; called with each
+            parsed score/feedback piece as it arrives (LLMDispatcher.start).
+        service_tier (str): Admission tier (services/admission.py). LLM_SAMPLED only
+            calls the LLM every Nth tick, HEURISTIC never does and PACING_ONLY also
+            skips tiers 2 and 3; the tier is reported in dashboard_status.
+
+    Returns:
+        dict: Dashboard response (dashboard_status, tiered_analysis,
+        progress_tracker, real_time_feedback).
+    """
+    # latency_budget_ms counts from here, including everything before the LLM call starts
+    received = perf_counter()
+
+    # Extract Inputs
+    audio_analysis = data.get('audio_analysis', {})
+    video_analysis = data.get('video_analysis', {})
+    deck_content = data.get('deck_content', {})
+    if decks is not None:
+        # Raises UnknownDeckError for decks that were never uploaded
+        deck_content = decks.expand(deck_content)
+    session_id = data.get('session_id')
+
+    # --- Tier 1: Pacing (Heuristic - keep as truth for time) ---
+    current_time = data.get('current_timestamp', 0)
+    current_slide = deck_content.get('current_slide_number', 0)
+    total_slides = deck_content.get('total_slides', 10)
+
+    # Stage timings are collected as raw perf_counter deltas and flushed once at the end
+    flush_timings = timings is None
+    if flush_timings:
+        timings = []
+    started = perf_counter()
+    if session_state is not None:
+        # Stateful model: per-slide dwell history and EWMA pace
+        tier1_res = session_state.pacing.update(current_time, current_slide, total_slides, data.get('total_time_limit'))
+    else:
+        tier1_res = analyze_pacing(current_time, current_slide, total_slides)
+    mark = perf_counter()
+    timings.append(("tier1", mark - started))
+
+    # --- Tier 2 & 3: Coherence & Viability ---
+    # The LLM call is started first and the heuristic tiers run while it is in
+    # flight, so a slow or failing LLM costs at most the latency budget in total.
+    llm_result = None
+    llm_future = None
+    analysis_source = "heuristic"
+    use_llm = dispatcher is not None and dispatcher.enabled and (
+        service_tier == FULL or (service_tier == LLM_SAMPLED and should_sample_llm(session_state))
+    )
+    if use_llm:
+        llm_result, source, llm_future = dispatcher.start(
+            session_id, audio_analysis, video_analysis, deck_content, current_time, on_event=on_llm_event
+        )
+        budget_ms = data.get('latency_budget_ms')
+        llm_deadline = received + (budget_ms / 1000 if budget_ms is not None else dispatcher.deadline)
+
+    audio_text = audio_analysis.get('transcription', "")
+    slide_ocr = deck_content.get('ocr_text', "")
+    emotion = video_analysis.get('emotional_tone', "Neutral")
+    topic = deck_content.get('slide_topic', "Unknown")
+    timestamp_str = f"{int(current_time//60):02d}:{int(current_time%60):02d}"
+
+    if service_tier == PACING_ONLY:
+        # Overload: pacing is all the dashboard gets
+        pacing_score = PACING_MAP.get(tier1_res["pacing_signal"], 50)
+        tier2_res = {"coherence_score": None, "real_time_feedback": []}
+        tier3_res = {"overall_score": pacing_score, "tiered_analysis": {}}
+    else:
+        if coherence_tracker is not None:
+            tier2_res = coherence_tracker.update(audio_text, slide_ocr, emotion, topic, timestamp_str, current_slide)
+        else:
+            tier2_res = analyze_coherence(audio_text, slide_ocr, emotion, topic, timestamp_str)
+        now = perf_counter()
+        timings.append(("tier2", now - mark))
+        mark = now
+
+        input_data = {
+            "video_analysis": {
+                "facial_confidence": video_analysis.get('facial_confidence', 0),
+                "eye_contact_percent": video_analysis.get('eye_contact_percent', 0)
+            },
+            "deck_content": {
+                "ocr_text": slide_ocr,
+                "slide_quality": deck_content.get('slide_quality')
+            }
+        }
+        tier3_res = calculate_scores(tier1_res, tier2_res, input_data)
+        now = perf_counter()
+        timings.append(("tier3", now - mark))
+        mark = now
+
+    if llm_future is not None:
+        # Whatever is left of the budget after the heuristics
+        llm_result, source = dispatcher.collect(session_id, llm_future, source, llm_deadline - mark)
+        now = perf_counter()
+        timings.append(("llm", now - mark))
+        mark = now
+    if llm_result is not None and source:
+        analysis_source = source
+
+    if llm_result:
+        # LLM output was schema-checked in parse_llm_output; we trust its content
+        # scores, but we trust Heuristic Pacing.
+        tiered = llm_result.tiered_analysis
+
+        # Map Pacing Signal to Score
+        pacing_score = PACING_MAP.get(tier1_res["pacing_signal"], 50)
+
+        # Weighted Overall Score
+        overall_raw = (tiered.coherence_score * 0.4) + (tiered.delivery_confidence * 0.3) + (pacing_score * 0.2) + (tiered.slide_quality * 0.1)
+        overall_score = int(overall_raw)
+
+        tiered_analysis_final = tiered.to_dict()
+        real_time_feedback = merge_feedback(
+            [item.to_dict() for item in llm_result.real_time_feedback],
+            tier2_res["real_time_feedback"]
+        )
+
+    else:
+        # Heuristic result (no LLM, API key, missed budget, or a degraded tier)
+        if dispatcher is not None and service_tier == FULL:
+            # Batch/offline callers run heuristics on purpose; only log for live requests
+            print("Using Heuristic Fallback (No LLM, API Key or missed deadline)")
+        overall_score = tier3_res["overall_score"]
+        tiered_analysis_final = tier3_res["tiered_analysis"]
+        real_time_feedback = tier2_res["real_time_feedback"]
+
+    # --- Progress Tracking ---
+    topic = deck_content.get('slide_topic', "Unknown")
+    pitch_format = data.get('pitch_format')
+    if session_state is not None:
+        stage_index = match_stage(topic.strip(), pitch_format) if topic else -1
+        session_state.record_tick(current_time, stage_index, tier1_res["pacing_signal"], pitch_format)
+        real_time_feedback = session_state.new_feedback(real_time_feedback)
+        progress_res = analyze_progress(topic, pitch_format, session_state.stages_visited)
+    else:
+        progress_res = analyze_progress(topic, pitch_format)
+    timings.append(("progress", perf_counter() - mark))
+
+    if flush_timings:
+        STAGE_SECONDS.observe_many(timings)
+    ANALYSIS_SOURCE.inc(analysis_source)
+
+    # --- Assembling Response ---
+    return {
+        "dashboard_status": DashboardStatus(
+            overall_score,
+            tier1_res["pacing_signal"],
+            tier1_res["time_remaining_projection"],
+            analysis_source,
+            service_tier
+        ).to_dict(),
+        "tiered_analysis": tiered_analysis_final,
+        "progress_tracker": progress_res,
+        "real_time_feedback": real_time_feedback
+    }
+
+def merge_feedback(llm_feedback, heuristic_feedback):
+    """
+    LLM feedback plus heuristic alerts the LLM did not raise itself this tick.
+
+    A heuristic alert is a duplicate only when an LLM item of the same type has
+    the same message or names the same subject (the quoted figure or emotion).
+    The coherence tracker emits each alert once, so one dropped here would never
+    be delivered.
+    """
+    merged = list(llm_feedback)
+    for item in heuristic_feedback:
+        if item.get("type") in HEURISTIC_ALERT_TYPES and not _reported_by(llm_feedback, item):
+            merged.append(item)
+    return merged
+
+def _reported_by(llm_feedback, item):
+    kind, message = item.get("type"), item.get("message") or ""
+    subject = _ALERT_SUBJECT.search(message)
+    # Whole-token match: "50" is not named by "150 users"
+    named = re.compile(r"(?<![\w.])" + re.escape(subject.group(1)) + r"(?![\w])") if subject else None
+    for reported in llm_feedback:
+        if reported.get("type") != kind:
+            continue
+        text = reported.get("message") or ""
+        if text == message or (named is not None and named.search(text)):
+            return True
+    return False
@@ -0,0 +1,136 @@
+from services.topic_matcher import TopicMatcher
+
+STANDARD_STAGES = ["Intro", "Problem", "Solution", "Business Model", "Market", "Team", "Ask"]
+
+DEFAULT_PITCH_FORMAT = "seed_deck"
+
+# Stage lists per pitch format. Aliases map common slide titles onto a stage and
+# only match as whole words; canonical stage names keep the original substring rule
+# in both directions ("Problem Statement" -> Problem, "Model" -> Business Model).
+PITCH_FORMATS = {
+    "seed_deck": {
+        "stages": STANDARD_STAGES,
+        "aliases": {
+            "Intro": ["Introduction", "Overview", "Welcome", "Vision", "Mission"],
+            "Problem": ["Pain", "Pain Points", "Challenge"],
+            "Solution": ["Product", "Demo", "How It Works", "Value Proposition"],
+            "Business Model": ["Revenue", "Pricing", "Monetization", "Unit Economics",
+                               "Traction", "Metrics", "Financials", "Projections"],
+            "Market": ["TAM", "SAM", "Market Size", "GTM", "Go-To-Market", "Go To Market",
+                       "Competition", "Competitors", "Landscape"],
+            "Team": ["Founders", "Leadership", "Advisors", "Who We Are"],
+            "Ask": ["Funding", "Raise", "Raising", "Investment", "Use of Funds", "The Round"]
+        }
+    },
+    "demo_day": {
+        "stages": ["Intro", "Problem", "Solution", "Traction", "Market", "Team", "Ask"],
+        "aliases": {
+            "Intro": ["Introduction", "Hook", "One-Liner", "One Liner"],
+            "Problem": ["Pain", "Pain Points"],
+            "Solution": ["Product", "Demo"],
+            "Traction": ["Growth", "Metrics", "Revenue", "Users", "Financials", "KPIs"],
+            "Market": ["TAM", "Market Size", "GTM", "Go-To-Market", "Competition"],
+            "Team": ["Founders"],
+            "Ask": ["Funding", "Raise", "Raising", "The Round"]
+        }
+    },
+    "sales_pitch": {
+        "stages": ["Intro", "Pain", "Solution", "Demo", "Proof", "Pricing", "Next Steps"],
+        "aliases": {
+            "Intro": ["Introduction", "Agenda", "About Us"],
+            "Pain": ["Problem", "Challenge", "Current State"],
+            "Solution": ["Product", "Platform", "How It Works"],
+            "Demo": ["Walkthrough", "Live Demo"],
+            "Proof": ["Case Study", "Case Studies", "Customers", "Testimonials", "ROI", "Results"],
+            "Pricing": ["Plans", "Packages", "Investment", "Financials"],
+            "Next Steps": ["Close", "Timeline", "Call to Action", "CTA"]
+        }
+    }
+}
+
+
+def build_stage_matcher(stages, aliases=None):
+    """
+    Compiles a TopicMatcher whose value is the stage index.
+
+    Rules are grouped per stage (canonical name, then its aliases) so the lowest
+    matching priority is always the earliest stage, like the original linear scan.
+    """
+    aliases = aliases or {}
+    rules = []
+    alias_patterns = set()
+    for index, stage in enumerate(stages):
+        rules.append((stage, index))
+        for alias in aliases.get(stage, []):
+            rules.append((alias, index))
+            alias_patterns.add(alias)
+    return TopicMatcher(rules, whole_word=alias_patterns, reverse=set(stages))
+
+
+# Built once at import; per-request matching is O(len(topic)).
+_STAGE_MATCHERS = {
+    name: build_stage_matcher(cfg["stages"], cfg.get("aliases"))
+    for name, cfg in PITCH_FORMATS.items()
+}
+
+
+def register_pitch_format(name, stages, aliases=None):
+    """
+    Adds (or replaces) a pitch format and precompiles its matcher.
+    """
+    PITCH_FORMATS[name] = {"stages": list(stages), "aliases": dict(aliases or {})}
+    _STAGE_MATCHERS[name] = build_stage_matcher(PITCH_FORMATS[name]["stages"], aliases)
+
+
+def get_stages(pitch_format=None):
+    return PITCH_FORMATS.get(pitch_format or DEFAULT_PITCH_FORMAT, PITCH_FORMATS[DEFAULT_PITCH_FORMAT])["stages"]
+
+
+def match_stage(current_topic, pitch_format=None):
+    """
+    Returns the stage index matched by `current_topic`, or -1.
+    """
+    fmt = pitch_format if pitch_format in _STAGE_MATCHERS else DEFAULT_PITCH_FORMAT
+    return _STAGE_MATCHERS[fmt].match(current_topic.strip(), default=-1)
+
+
+def analyze_progress(current_topic, pitch_format=None, visited=None):
+    """
+    Determine progress based on standard pitch stages.
+
+    Args:
+        current_topic (str): Slide topic/title.
+        pitch_format (str | None): Key of PITCH_FORMATS (default "seed_deck").
+        visited (int | None): Bitmask of stage indexes the presenter has actually
+            been on (bit i = stages[i], see SessionState). When given, completed and
+            missing stages come from it instead of the current stage's position.
+    """
+    stages = get_stages(pitch_format)
+    if not current_topic:
+        matched_index = -1
+        current_stage = "Unknown"
+    else:
+        # Fuzzy match or exact match
+        clean_topic = current_topic.strip()
+        matched_index = match_stage(clean_topic, pitch_format)
+        current_stage = stages[matched_index] if matched_index != -1 else clean_topic
+
+    if visited is not None:
+        return {
+            "current_stage": current_stage,
+            "stages_completed": [s for i, s in enumerate(stages) if visited >> i & 1 and i != matched_index],
+            "stages_missing": [s for i, s in enumerate(stages) if not visited >> i & 1 and i != matched_index]
+        }
+
+    if matched_index != -1:
+        return {
+            "current_stage": current_stage,
+            "stages_completed": stages[:matched_index],
+            "stages_missing": stages[matched_index+1:]
+        }
+    else:
+        return {
+            "current_stage": current_stage,
+            "stages_completed": [],
+            "stages_missing": stages
+        }
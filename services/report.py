@@ -0,0 +1,222 @@
+from services.pipeline import analyze_frame
+from services.progress import get_stages
+from services.session_store import SessionState
+from services.tier2_coherence import CoherenceTracker
+
+# The score trajectory is downsampled to at most this many points, however long the pitch
+DEFAULT_TRAJECTORY_POINTS = 120
+# Width of one trajectory point until the pitch outgrows DEFAULT_TRAJECTORY_POINTS
+INITIAL_BUCKET_SECONDS = 5
+# Distinct feedback messages kept per report; later ones are only counted
+MAX_REPORT_FEEDBACK = 200
+
+
+class SessionReport:
+    """
+    End-of-pitch report folded one tick at a time, so a timeline is never held
+    in memory. Every field is bounded regardless of pitch length:
+
+      - score trajectory: fixed-width time buckets (min/mean/max); when there are
+        more than `max_points`, neighbouring buckets are merged and the width
+        doubles, so an hour-long pitch still reports at most `max_points` points
+      - feedback: deduplicated by type and message with first/last timestamp and
+        count, capped at `max_feedback` distinct items
+
+    Dwell per slide, pacing signal counts and stage coverage come from the
+    session's SessionState when the report is rendered (see to_dict).
+    """
+
+    __slots__ = ("bucket_seconds", "buckets", "feedback", "feedback_counts", "feedback_dropped",
+                 "final_score", "first_timestamp", "last_timestamp", "max_feedback", "max_points",
+                 "pitch_format", "score_max", "score_min", "score_sum", "service_tiers", "session_id",
+                 "sources", "ticks")
+
+    def __init__(self, session_id=None, max_points=DEFAULT_TRAJECTORY_POINTS, max_feedback=MAX_REPORT_FEEDBACK):
+        self.session_id = session_id
+        self.max_points = max_points
+        self.max_feedback = max_feedback
+        self.pitch_format = None
+        self.ticks = 0
+        self.first_timestamp = None
+        self.last_timestamp = 0
+        self.score_min = None
+        self.score_max = None
+        self.score_sum = 0
+        self.final_score = None
+        self.bucket_seconds = INITIAL_BUCKET_SECONDS
+        self.buckets = []          # [index, count, sum, min, max], index ascending
+        self.feedback = {}         # "type|message" -> [type, message, first_ts, last_ts, count]
+        self.feedback_dropped = 0
+        self.feedback_counts = {}  # type -> items shown
+        self.sources = {}          # analysis_source -> ticks
+        self.service_tiers = {}    # service_tier -> ticks
+
+    def add(self, frame, response):
+        """
+        Folds one analyzed tick into the report. O(1) amortized.
+
+        Args:
+            frame (dict): The `/analyze` payload that was scored.
+            response (dict): analyze_frame's response for it.
+        """
+        timestamp = frame.get("current_timestamp", 0)
+        status = response["dashboard_status"]
+        score = status["overall_score"]
+
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+            self.score_min = self.score_max = score
+        self.pitch_format = frame.get("pitch_format", self.pitch_format)
+        self.ticks += 1
+        self.last_timestamp = timestamp
+        self.score_min = min(self.score_min, score)
+        self.score_max = max(self.score_max, score)
+        self.score_sum += score
+        self.final_score = score
+        self._add_point(timestamp, score)
+
+        source = status.get("analysis_source")
+        self.sources[source] = self.sources.get(source, 0) + 1
+        tier = status.get("service_tier", "full")
+        self.service_tiers[tier] = self.service_tiers.get(tier, 0) + 1
+
+        for item in response.get("real_time_feedback", ()):
+            kind, message = item.get("type"), item.get("message")
+            self.feedback_counts[kind] = self.feedback_counts.get(kind, 0) + 1
+            entry = self.feedback.get(f"{kind}|{message}")
+            if entry is not None:
+                entry[3] = item.get("timestamp")
+                entry[4] += 1
+            elif len(self.feedback) < self.max_feedback:
+                self.feedback[f"{kind}|{message}"] = [kind, message, item.get("timestamp"), item.get("timestamp"), 1]
+            else:
+                self.feedback_dropped += 1
+
+    def _add_point(self, timestamp, score):
+        index = max(0, int((timestamp - self.first_timestamp) // self.bucket_seconds))
+        last = self.buckets[-1] if self.buckets else None
+        if last is not None and index <= last[0]:
+            # Same bucket (or a timestamp that went backwards): fold into the latest
+            last[1] += 1
+            last[2] += score
+            last[3] = min(last[3], score)
+            last[4] = max(last[4], score)
+            return
+        self.buckets.append([index, 1, score, score, score])
+        if len(self.buckets) > self.max_points:
+            self._compact()
+
+    def _compact(self):
+        # Halve the resolution: merge bucket pairs that share index // 2
+        merged = []
+        for index, count, total, low, high in self.buckets:
+            index //= 2
+            if merged and merged[-1][0] == index:
+                bucket = merged[-1]
+                bucket[1] += count
+                bucket[2] += total
+                bucket[3] = min(bucket[3], low)
+                bucket[4] = max(bucket[4], high)
+            else:
+                merged.append([index, count, total, low, high])
+        self.buckets = merged
+        self.bucket_seconds *= 2
+
+    def to_dict(self, state=None):
+        """
+        Renders the report.
+
+        Args:
+            state (SessionState | None): The session's state, for per-slide dwell,
+                pacing signal counts and stage coverage.
+
+        Returns:
+            dict: {"session_id", "ticks", "duration_seconds", "score", "trajectory",
+            "slide_dwell_seconds", "pacing_signals", "stage_coverage", "feedback",
+            "feedback_counts", "feedback_dropped", "analysis_sources", "service_tiers"}
+        """
+        start = self.first_timestamp or 0
+        trajectory = [
+            {
+                "start": round(start + index * self.bucket_seconds, 1),
+                "end": round(start + (index + 1) * self.bucket_seconds, 1),
+                "mean": round(total / count, 1),
+                "min": low,
+                "max": high
+            }
+            for index, count, total, low, high in self.buckets
+        ]
+        return {
+            "session_id": self.session_id,
+            "ticks": self.ticks,
+            "duration_seconds": round(self.last_timestamp - start, 1),
+            "score": {
+                "final": self.final_score,
+                "mean": round(self.score_sum / self.ticks, 1) if self.ticks else None,
+                "min": self.score_min,
+                "max": self.score_max
+            },
+            "trajectory": trajectory,
+            "slide_dwell_seconds": slide_dwell(state) if state is not None else {},
+            "pacing_signals": dict(state.pacing_counts) if state is not None else {},
+            "stage_coverage": stage_coverage(state, self.pitch_format) if state is not None else None,
+            "feedback": [
+                {"type": kind, "message": message, "first_timestamp": first, "last_timestamp": last, "count": count}
+                for kind, message, first, last, count in self.feedback.values()
+            ],
+            "feedback_counts": dict(self.feedback_counts),
+            "feedback_dropped": self.feedback_dropped,
+            "analysis_sources": dict(self.sources),
+            "service_tiers": dict(self.service_tiers)
+        }
+
+
+def slide_dwell(state):
+    """
+    Seconds spent per slide, from the PacingTracker's completed visits plus the
+    slide the presenter is still on.
+    """
+    pacing = state.pacing
+    dwell = dict(pacing.dwell)
+    if pacing.slide is not None and state.last_timestamp >= pacing.slide_started_at:
+        dwell[pacing.slide] = dwell.get(pacing.slide, 0.0) + state.last_timestamp - pacing.slide_started_at
+    return {str(slide): round(seconds, 1) for slide, seconds in sorted(dwell.items())}
+
+
+def stage_coverage(state, pitch_format=None):
+    """
+    Stages of the pitch format (STANDARD_STAGES by default) the presenter was
+    on at some point, and the ones never reached.
+    """
+    stages = get_stages(pitch_format)
+    covered = [stage for i, stage in enumerate(stages) if state.stages_visited >> i & 1]
+    return {
+        "stages_covered": covered,
+        "stages_missing": [stage for i, stage in enumerate(stages) if not state.stages_visited >> i & 1],
+        "coverage": round(len(covered) / len(stages), 2) if stages else 0.0
+    }
+
+
+def build_report(frames, session_id=None, decks=None):
+    """
+    Scores a recorded timeline and reduces it to an end-of-pitch report in a
+    single streaming pass (heuristics only, no LLM). Memory is constant per
+    session: frames are consumed one at a time and only the bounded coherence,
+    session and report state is kept.
+
+    Args:
+        frames (iterable[dict]): `/analyze` payloads in timestamp order.
+        session_id (str | None): Tag for the report.
+        decks (DeckStore | None): Resolves frames that reference an uploaded deck.
+
+    Returns:
+        dict: SessionReport.to_dict
+    """
+    coherence = CoherenceTracker()
+    state = SessionState()
+    report = SessionReport(session_id)
+    for frame in frames:
+        if report.session_id is None:
+            report.session_id = frame.get("session_id")
+        report.add(frame, analyze_frame(frame, coherence_tracker=coherence, session_state=state, decks=decks))
+    return report.to_dict(state)
@@ -0,0 +1,231 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from services.llm_stream import TIERED_ANALYSIS
+from services.report import SessionReport
+from services.session_store import SessionState
+from services.tier2_coherence import CoherenceTracker
+
+FRAME_SECTIONS = ("audio_analysis", "video_analysis", "deck_content")
+
+DEFAULT_MAX_LIVE_SESSIONS = 2000
+DEFAULT_IDLE_SECONDS = 900
+
+
+class SessionExistsError(KeyError):
+    """
+    A session was created with the id of a live session.
+    """
+
+
+class PitchSession:
+    """
+    Server-side state for one live pitch.
+
+    Clients send small deltas (new transcript words, a changed slide number, a new
+    emotion sample) instead of re-posting the whole frame; the session keeps the
+    merged frame and the last response so only changed dashboard fields go back.
+    """
+
+    def __init__(self, session_id, initial_frame=None):
+        self.session_id = session_id
+        self.frame = {
+            "session_id": session_id,
+            "current_timestamp": 0,
+            "audio_analysis": {"transcription": ""},
+            "video_analysis": {},
+            "deck_content": {}
+        }
+        self.last_response = {}
+        self.version = 0
+        self.coherence = CoherenceTracker()
+        self.state = SessionState()
+        self.report = SessionReport(session_id)
+        self.lock = threading.Lock()
+        # Separate from `lock`: streamed LLM pieces are published from the dispatcher
+        # loop while the request thread holds `lock` for the tick
+        self._subscribers_lock = threading.Lock()
+        self._subscribers = []
+        if initial_frame:
+            self.apply_delta(initial_frame)
+
+    def apply_delta(self, delta):
+        """
+        Merges an incremental update into the session frame.
+
+        Args:
+            delta (dict): Any of `current_timestamp`, `transcript_delta` (text appended
+                to the transcription) and partial `audio_analysis` / `video_analysis` /
+                `deck_content` dicts whose keys overwrite the stored values.
+        """
+        if "current_timestamp" in delta:
+            self.frame["current_timestamp"] = delta["current_timestamp"]
+
+        for section in FRAME_SECTIONS:
+            update = delta.get(section)
+            if update:
+                self.frame[section].update(update)
+
+        words = delta.get("transcript_delta")
+        if words:
+            audio = self.frame["audio_analysis"]
+            current = audio.get("transcription", "")
+            audio["transcription"] = f"{current} {words}" if current else words
+
+    def diff(self, response):
+        """
+        Returns only the fields of `response` that changed since the last call,
+        and remembers `response` as the new baseline.
+        """
+        changes = diff_response(self.last_response, response)
+        self.last_response = response
+        if changes:
+            self.version += 1
+        return changes
+
+    def subscribe(self):
+        q = queue.Queue(maxsize=256)
+        with self._subscribers_lock:
+            self._subscribers.append(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._subscribers_lock:
+            if q in self._subscribers:
+                self._subscribers.remove(q)
+
+    def has_subscribers(self):
+        with self._subscribers_lock:
+            return bool(self._subscribers)
+
+    def publish(self, event):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(event)
+            except queue.Full:
+                # Slow consumer; drop the update rather than block the tick.
+                pass
+
+    def publish_partial(self, kind, value):
+        """
+        Pushes one streamed LLM piece (the scores or a feedback item) to subscribers
+        as `{"version", "partial": {...}}`, ahead of the tick's full changes.
+        """
+        if kind == TIERED_ANALYSIS:
+            partial = {"tiered_analysis": value.to_dict()}
+        else:
+            partial = {"real_time_feedback": [value.to_dict()]}
+        self.publish({"version": self.version, "partial": partial})
+
+
+def diff_response(previous, current):
+    """
+    Shallow-per-section diff of two dashboard responses.
+
+    Dict sections (dashboard_status, tiered_analysis, progress_tracker) are compared
+    key by key; anything else (e.g. the real_time_feedback list) is sent whole when it
+    differs.
+    """
+    changes = {}
+    for key, value in current.items():
+        old = previous.get(key)
+        if isinstance(value, dict) and isinstance(old, dict):
+            section = {k: v for k, v in value.items() if old.get(k) != v}
+            if section:
+                changes[key] = section
+        elif old != value:
+            changes[key] = value
+    return changes
+
+
+class SessionRegistry:
+    """
+    Thread-safe in-process map of session_id -> PitchSession.
+
+    Sessions a client abandons without DELETE expire after `idle_seconds` without
+    a request, and at most `max_sessions` are kept (least recently used first).
+    Expired sessions have their event streams closed and `on_expire(session_id)`
+    called so per-session state elsewhere (parked LLM calls, stores) is dropped.
+    """
+
+    def __init__(self, max_sessions=DEFAULT_MAX_LIVE_SESSIONS, idle_seconds=DEFAULT_IDLE_SECONDS,
+                 on_expire=None, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.on_expire = on_expire
+        self._clock = clock
+        self._sessions = OrderedDict()  # session_id -> (touched_at, PitchSession), least recent first
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, on_expire=None):
+        """
+        LIVE_SESSIONS_MAX and LIVE_SESSION_IDLE_SECONDS.
+        """
+        return cls(
+            int(os.getenv("LIVE_SESSIONS_MAX", DEFAULT_MAX_LIVE_SESSIONS)),
+            float(os.getenv("LIVE_SESSION_IDLE_SECONDS", DEFAULT_IDLE_SECONDS)),
+            on_expire
+        )
+
+    def create(self, initial_frame=None, session_id=None):
+        """
+        Raises:
+            SessionExistsError: `session_id` belongs to a live session.
+        """
+        session_id = session_id or uuid.uuid4().hex
+        session = PitchSession(session_id, initial_frame)
+        with self._lock:
+            if session_id in self._sessions:
+                raise SessionExistsError(f"Session '{session_id}' already exists")
+            self._sessions[session_id] = (self._clock(), session)
+            expired = self._sweep()
+        self._expire(expired)
+        return session
+
+    def get(self, session_id):
+        """
+        Returns the live session (marking it active), or None.
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self._sessions[session_id] = (now, entry[1])
+                self._sessions.move_to_end(session_id)
+            expired = self._sweep()
+        self._expire(expired)
+        return entry[1] if entry is not None else None
+
+    def remove(self, session_id):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        return entry[1] if entry is not None else None
+
+    def _sweep(self):
+        # Called with the lock held; idle sessions sit at the front
+        now = self._clock()
+        expired = []
+        while self._sessions:
+            session_id, (touched_at, session) = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and now - touched_at <= self.idle_seconds:
+                break
+            del self._sessions[session_id]
+            expired.append(session)
+        return expired
+
+    def _expire(self, expired):
+        for session in expired:
+            session.publish(None)
+            if self.on_expire is not None:
+                self.on_expire(session.session_id)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
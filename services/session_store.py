@@ -0,0 +1,284 @@
+import os
+import socket
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+from services.metrics import REGISTRY
+from services.models import dumps, loads
+from services.tier1_pacing import PacingTracker
+
+DEFAULT_MAX_SESSIONS = 10000
+DEFAULT_TTL_SECONDS = 3600
+MAX_FEEDBACK_KEYS = 32
+KEY_PREFIX = "pitch:session:"
+
+SESSION_STORE_ERRORS = REGISTRY.counter(
+    "pitch_session_store_errors_total", "Session store calls that failed (served without session state).", ("op",)
+)
+
+
+class SessionState:
+    """
+    Per-session state carried between `/analyze` ticks. Fixed size regardless of
+    pitch length, and every field updates in O(1) per tick:
+
+      - stages_visited: bitmask of stage indexes seen so far (bit i = stages[i])
+      - pacing: PacingTracker with per-slide dwell times and the EWMA pace
+      - pacing_counts: ticks spent in each pacing signal
+      - feedback_keys: the most recent feedback messages, so stateless clients
+        are not shown the same alert on every tick
+    """
+
+    __slots__ = ("feedback_keys", "last_timestamp", "pacing", "pacing_counts", "pitch_format",
+                 "stages_visited", "ticks")
+
+    def __init__(self, pitch_format=None):
+        self.pitch_format = pitch_format
+        self.stages_visited = 0
+        self.pacing = PacingTracker()
+        self.pacing_counts = {}
+        self.feedback_keys = []
+        self.ticks = 0
+        self.last_timestamp = 0
+
+    def record_tick(self, current_timestamp, stage_index, pacing_signal, pitch_format=None):
+        """
+        Folds one tick into the state (pacing itself is updated through `pacing`).
+
+        Args:
+            stage_index (int): Index from progress.match_stage (-1 when unmatched).
+        """
+        if pitch_format != self.pitch_format:
+            # Stage indexes refer to a different stage list now
+            self.pitch_format = pitch_format
+            self.stages_visited = 0
+        if stage_index >= 0:
+            self.stages_visited |= 1 << stage_index
+        self.pacing_counts[pacing_signal] = self.pacing_counts.get(pacing_signal, 0) + 1
+        self.ticks += 1
+        self.last_timestamp = current_timestamp
+
+    def new_feedback(self, items):
+        """
+        Returns the feedback items not already delivered recently and remembers them.
+        """
+        fresh = []
+        for item in items:
+            key = f"{item.get('type')}|{item.get('message')}"
+            if key in self.feedback_keys:
+                continue
+            self.feedback_keys.append(key)
+            if len(self.feedback_keys) > MAX_FEEDBACK_KEYS:
+                del self.feedback_keys[0]
+            fresh.append(item)
+        return fresh
+
+    def to_dict(self):
+        return {
+            "pitch_format": self.pitch_format,
+            "stages_visited": self.stages_visited,
+            "pacing": self.pacing.to_dict(),
+            "pacing_counts": self.pacing_counts,
+            "feedback_keys": self.feedback_keys,
+            "ticks": self.ticks,
+            "last_timestamp": self.last_timestamp
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(data.get("pitch_format"))
+        state.stages_visited = data.get("stages_visited", 0)
+        if "pacing" in data:
+            state.pacing = PacingTracker.from_dict(data["pacing"])
+        state.pacing_counts = dict(data.get("pacing_counts", {}))
+        state.feedback_keys = list(data.get("feedback_keys", []))[-MAX_FEEDBACK_KEYS:]
+        state.ticks = data.get("ticks", 0)
+        state.last_timestamp = data.get("last_timestamp", 0)
+        return state
+
+
+class InMemorySessionStore:
+    """
+    Process-local LRU of SessionState objects with an idle TTL. Fine for a single
+    worker; use RedisSessionStore when several workers serve the same sessions.
+    """
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, ttl_seconds=DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._states = OrderedDict()  # session_id -> (touched_at, SessionState)
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        now = self._clock()
+        with self._lock:
+            entry = self._states.get(session_id)
+            if entry is None:
+                return None
+            touched_at, state = entry
+            if now - touched_at > self.ttl_seconds:
+                del self._states[session_id]
+                return None
+            return state
+
+    def put(self, session_id, state):
+        with self._lock:
+            self._states[session_id] = (self._clock(), state)
+            self._states.move_to_end(session_id)
+            while len(self._states) > self.max_sessions:
+                self._states.popitem(last=False)
+
+    def delete(self, session_id):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._states)
+
+
+class RedisError(Exception):
+    pass
+
+
+# What a store call raises when the server is down or misbehaving
+STORE_ERRORS = (RedisError, OSError)
+
+
+class RespConnection:
+    """
+    Minimal blocking Redis client speaking RESP2 over one socket. Covers the few
+    commands the session store needs, so no Redis client library is required.
+    """
+
+    def __init__(self, host, port, db=0, password=None, timeout=2.0):
+        self._sock = socket.create_connection((host, port), timeout=timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._reader = self._sock.makefile("rb")
+        if password:
+            self.execute("AUTH", password)
+        if db:
+            self.execute("SELECT", db)
+
+    def execute(self, *args):
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(parts))
+        return self._read()
+
+    def _read(self):
+        line = self._reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode("utf-8")
+        if kind == b"-":
+            raise RedisError(rest.decode("utf-8"))
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length == -1:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            count = int(rest)
+            return None if count == -1 else [self._read() for _ in range(count)]
+        raise RedisError(f"Unexpected reply: {line!r}")
+
+    def close(self):
+        try:
+            self._reader.close()
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class RedisSessionStore:
+    """
+    SessionState in Redis (or anything speaking its protocol), shared by all
+    worker processes. One JSON value per session with a sliding TTL.
+
+    Ticks of one session are expected to arrive in order; concurrent writers to the
+    same session resolve last-writer-wins.
+    """
+
+    def __init__(self, url="redis://127.0.0.1:6379/0", ttl_seconds=DEFAULT_TTL_SECONDS, prefix=KEY_PREFIX):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int((parsed.path or "/0").lstrip("/") or 0)
+        self.password = parsed.password
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+        self._local = threading.local()  # one connection per thread
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = RespConnection(self.host, self.port, self.db, self.password)
+        return conn
+
+    def _execute(self, *args):
+        try:
+            return self._conn().execute(*args)
+        except (OSError, ConnectionError):
+            # Stale connection (server restart); reconnect this thread once
+            self._drop_conn()
+            return self._conn().execute(*args)
+
+    def _drop_conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def get(self, session_id):
+        data = self.get_value(session_id)
+        return SessionState.from_dict(data) if data is not None else None
+
+    def put(self, session_id, state):
+        self.put_value(session_id, state.to_dict())
+
+    def get_value(self, key):
+        """
+        Decoded JSON value stored under `prefix + key`, or None.
+        """
+        raw = self._execute("GET", self.prefix + key)
+        return loads(raw) if raw is not None else None
+
+    def put_value(self, key, value):
+        self._execute("SET", self.prefix + key, dumps(value), "EX", int(self.ttl_seconds))
+
+    def delete(self, session_id):
+        self._execute("DEL", self.prefix + session_id)
+
+    def ping(self):
+        return self._execute("PING") == "PONG"
+
+    def reset(self):
+        """
+        Closes this thread's connection and forgets every other thread's. Call
+        after fork only: the child must not share the parent's sockets.
+        """
+        self._drop_conn()
+        self._local = threading.local()
+
+
+def session_store_from_env():
+    """
+    SESSION_STORE_URL=redis://host:port/db selects the shared store; otherwise an
+    in-process LRU (SESSION_STORE_MAX, SESSION_STORE_TTL_SECONDS).
+    """
+    ttl_seconds = float(os.getenv("SESSION_STORE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    url = os.getenv("SESSION_STORE_URL")
+    if url:
+        return RedisSessionStore(url, ttl_seconds=ttl_seconds)
+    return InMemorySessionStore(int(os.getenv("SESSION_STORE_MAX", DEFAULT_MAX_SESSIONS)), ttl_seconds)
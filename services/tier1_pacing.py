@@ -1,3 +1,8 @@
+import json
+
+TOTAL_TIME_LIMIT = 180.0 # 3 minutes
+PACING_BUFFER = 20.0 # seconds tolerance
+INTRO_DWELL_LIMIT = 45 # seconds allowed on slide 1
 
 def analyze_pacing(current_timestamp, current_slide, total_slides):
     """
@@ -14,8 +19,6 @@ def analyze_pacing(current_timestamp, current_slide, total_slides):
             "time_remaining_projection": str
         }
     """
-    TOTAL_TIME_LIMIT = 180.0 # 3 minutes
-    
     if current_slide <= 0 or total_slides <= 0:
         return {
             "pacing_signal": "Unknown",
@@ -37,7 +40,7 @@ def analyze_pacing(current_timestamp, current_slide, total_slides):
     avg_time_per_slide = current_timestamp / current_slide
     projected_total_time = avg_time_per_slide * total_slides
     
-    buffer = 20.0 # seconds tolerance
+    buffer = PACING_BUFFER
     
     signal = "Perfect"
     projection_msg = "You are on track to finish exactly on time."
@@ -53,7 +56,7 @@ def analyze_pacing(current_timestamp, current_slide, total_slides):
         projection_msg = "You are well-paced to finish comfortably."
         
     # Heuristic for dwelling on early slides (e.g. Slide 1 > 45s)
-    if current_slide == 1 and current_timestamp > 45:
+    if current_slide == 1 and current_timestamp > INTRO_DWELL_LIMIT:
         signal = "Behind Pace"
         projection_msg = "You spent too long on the intro slide."
 
@@ -61,3 +64,200 @@ def analyze_pacing(current_timestamp, current_slide, total_slides):
         "pacing_signal": signal,
         "time_remaining_projection": projection_msg
     }
+
+
+# --- Stateful pacing (per session) ---
+
+PACING_ALPHA = 0.35      # EWMA weight of the most recent slide
+MAX_TRACKED_SLIDES = 200
+
+# total_slides -> per-slide share of the time limit (sums to 1.0). Decks without
+# an entry get an even split. Filled from calibration (scripts/calibrate_pacing.py).
+_BUDGET_SHARES = {}
+
+
+def register_budget_shares(total_slides, shares):
+    """
+    Sets the per-slide time shares used for decks of `total_slides` slides.
+    """
+    if len(shares) != total_slides:
+        raise ValueError(f"Expected {total_slides} shares, got {len(shares)}")
+    if any(share <= 0 for share in shares):
+        # A zero budget flags the slide as "too long" the moment it is shown
+        raise ValueError("Budget shares must all be positive")
+    total = float(sum(shares))
+    if total <= 0:
+        raise ValueError("Budget shares must sum to a positive value")
+    _BUDGET_SHARES[int(total_slides)] = tuple(share / total for share in shares)
+
+
+def load_budget_shares(path):
+    """
+    Loads a calibration file: {"<total_slides>": [share, ...], ...}.
+    """
+    with open(path, "r", encoding="utf-8") as fh:
+        for total_slides, shares in json.load(fh).items():
+            register_budget_shares(int(total_slides), shares)
+
+
+def slide_budgets(total_slides, total_time_limit=TOTAL_TIME_LIMIT):
+    """
+    Returns (budgets, remaining_after) lists, both indexed by slide - 1: the time
+    budget for each slide and the summed budget of all slides after it.
+    """
+    shares = _BUDGET_SHARES.get(total_slides) or (1.0 / total_slides,) * total_slides
+    budgets = [share * total_time_limit for share in shares]
+    remaining_after = [0.0] * total_slides
+    for i in range(total_slides - 2, -1, -1):
+        remaining_after[i] = remaining_after[i + 1] + budgets[i + 1]
+    return budgets, remaining_after
+
+
+class PacingTracker:
+    """
+    Tier 1 with memory: records how long the presenter dwells on each slide and
+    projects the finish time from an exponentially weighted pace.
+
+    The pace is the EWMA of (dwell / budget) over completed slides, so a deck with
+    calibrated, uneven budgets is judged against them. Projected finish =
+    now + the rest of the current slide's budget + the budgets of the remaining
+    slides, each scaled by the pace. Until a slide is completed the projection falls
+    back to the cumulative average, which reproduces `analyze_pacing`.
+
+    Every `update` is O(1) except when the deck size or time limit changes (budgets
+    are recomputed once).
+    """
+
+    __slots__ = ("_plan", "_plan_key", "alpha", "buffer", "dwell", "pace", "slide", "slide_started_at",
+                 "slides_completed", "total_time_limit")
+
+    def __init__(self, total_time_limit=TOTAL_TIME_LIMIT, alpha=PACING_ALPHA, buffer=PACING_BUFFER):
+        self.total_time_limit = total_time_limit
+        self.alpha = alpha
+        self.buffer = buffer
+        self.slide = None
+        self.slide_started_at = 0.0
+        self.pace = None          # EWMA of dwell / budget
+        self.slides_completed = 0
+        self.dwell = {}           # slide number -> seconds spent (summed over visits)
+        self._plan_key = None
+        self._plan = None
+
+    def _budgets(self, total_slides):
+        key = (total_slides, self.total_time_limit, _BUDGET_SHARES.get(total_slides))
+        if key != self._plan_key:
+            self._plan_key = key
+            self._plan = slide_budgets(total_slides, self.total_time_limit)
+        return self._plan
+
+    def _leave_slide(self, now, budgets):
+        dwell = now - self.slide_started_at
+        if dwell < 0:
+            return
+        if self.slide in self.dwell or len(self.dwell) < MAX_TRACKED_SLIDES:
+            self.dwell[self.slide] = self.dwell.get(self.slide, 0.0) + dwell
+        if 1 <= self.slide <= len(budgets) and budgets[self.slide - 1] > 0:
+            ratio = dwell / budgets[self.slide - 1]
+            self.pace = ratio if self.pace is None else self.alpha * ratio + (1 - self.alpha) * self.pace
+            self.slides_completed += 1
+
+    def update(self, current_timestamp, current_slide, total_slides, total_time_limit=None):
+        """
+        Folds in one tick and returns the pacing assessment.
+
+        Args:
+            current_timestamp (float): Current time in seconds.
+            current_slide (int): Current slide number (1-indexed).
+            total_slides (int): Total number of slides.
+            total_time_limit (float | None): Overrides the tracker's limit from now on.
+
+        Returns:
+            dict: Same keys as `analyze_pacing` plus "projected_total_seconds" and
+            "slide_dwell_seconds".
+        """
+        if total_time_limit:
+            self.total_time_limit = float(total_time_limit)
+        if current_slide <= 0 or total_slides <= 0:
+            return {
+                "pacing_signal": "Unknown",
+                "time_remaining_projection": "Insufficient data."
+            }
+
+        budgets, remaining_after = self._budgets(total_slides)
+        if current_slide != self.slide:
+            if self.slide is not None:
+                self._leave_slide(current_timestamp, budgets)
+            self.slide = current_slide
+            self.slide_started_at = current_timestamp
+        slide_dwell = current_timestamp - self.slide_started_at
+
+        if current_timestamp > self.total_time_limit:
+            return {
+                "pacing_signal": "Behind Pace",
+                "time_remaining_projection": "You have exceeded the time limit.",
+                "projected_total_seconds": round(current_timestamp, 1),
+                "slide_dwell_seconds": round(slide_dwell, 1)
+            }
+
+        index = min(current_slide, total_slides) - 1
+        if self.pace is None:
+            # No completed slide yet: cumulative average, as in analyze_pacing
+            budget_so_far = self.total_time_limit - remaining_after[index]
+            pace = current_timestamp / budget_so_far if budget_so_far > 0 else 1.0
+            projected_total_time = pace * self.total_time_limit
+        else:
+            projected_total_time = (
+                current_timestamp
+                + max(0.0, self.pace * budgets[index] - slide_dwell)
+                + self.pace * remaining_after[index]
+            )
+
+        if projected_total_time > (self.total_time_limit + self.buffer):
+            signal = "Behind Pace"
+            projection_msg = "At this rate, you will run out of time before the Ask."
+        elif projected_total_time < (self.total_time_limit - self.buffer):
+            signal = "Too Fast"
+            projection_msg = "You are speaking too quickly; you might end under time."
+        else:
+            signal = "Perfect"
+            projection_msg = "You are well-paced to finish comfortably."
+
+        # Dwell rules: calibrated decks use each slide's budget, otherwise the intro limit
+        if total_slides in _BUDGET_SHARES:
+            if slide_dwell > budgets[index] + self.buffer:
+                signal = "Behind Pace"
+                projection_msg = (
+                    "You spent too long on the intro slide." if current_slide == 1
+                    else f"You have spent too long on slide {current_slide}."
+                )
+        elif current_slide == 1 and current_timestamp > INTRO_DWELL_LIMIT:
+            signal = "Behind Pace"
+            projection_msg = "You spent too long on the intro slide."
+
+        return {
+            "pacing_signal": signal,
+            "time_remaining_projection": projection_msg,
+            "projected_total_seconds": round(projected_total_time, 1),
+            "slide_dwell_seconds": round(slide_dwell, 1)
+        }
+
+    def to_dict(self):
+        return {
+            "total_time_limit": self.total_time_limit,
+            "slide": self.slide,
+            "slide_started_at": self.slide_started_at,
+            "pace": self.pace,
+            "slides_completed": self.slides_completed,
+            # JSON object keys are strings
+            "dwell": {str(slide): seconds for slide, seconds in self.dwell.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        tracker = cls(data.get("total_time_limit", TOTAL_TIME_LIMIT))
+        tracker.slide = data.get("slide")
+        tracker.slide_started_at = data.get("slide_started_at", 0.0)
+        tracker.pace = data.get("pace")
+        tracker.slides_completed = data.get("slides_completed", 0)
+        tracker.dwell = {int(slide): seconds for slide, seconds in data.get("dwell", {}).items()}
+        return tracker
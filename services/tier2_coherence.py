@@ -1,5 +1,56 @@
 import re
 
+from services.numeric_facts import (
+    extract_facts,
+    is_context_word,
+    is_numeric_token,
+    slide_fact_index,
+)
+from services.topic_matcher import TopicMatcher
+
+# Regex to find numbers like $1M, 10, 50%, etc. (digits only; units are stripped)
+NUMBER_PATTERN = re.compile(r'\d+(?:\.\d+)?')
+
+# Chars before the scan position compared on each update to catch same-length rewrites
+REWRITE_CHECK_CHARS = 64
+
+# Define mismatched pairs (Topic -> Invalid Emotions)
+EMOTION_MISMATCH_MAP = {
+    "Market Pain": ["Happy", "Joy"],
+    "Competition": ["Fear", "Uncertainty"],
+    "Ask": ["Fear", "Sad"],
+    "Team": ["Sad"]
+}
+
+# Compiled once; topic lookup is O(len(topic)) however many topics are configured
+_EMOTION_TOPIC_MATCHER = TopicMatcher([(key, key) for key in EMOTION_MISMATCH_MAP])
+
+def extract_numbers(text):
+    if not text: return set()
+    # Find all numbers, stripping $ % k M B
+    # This is a basic heuristics.
+    return set(NUMBER_PATTERN.findall(text))
+
+def match_emotion_topic(slide_topic):
+    """
+    Returns the EMOTION_MISMATCH_MAP key contained in the slide topic, or None.
+    """
+    return _EMOTION_TOPIC_MATCHER.match(slide_topic)
+
+def _mismatch_alert(timestamp_str, fact, slide_facts):
+    return {
+        "timestamp": timestamp_str,
+        "type": "CRITICAL_MISMATCH",
+        "message": f"You mentioned '{fact.text}' but the slide displays values {slide_facts.labels()}. Verify your data."
+    }
+
+def _emotion_alert(timestamp_str, facial_emotion, topic_key):
+    return {
+        "timestamp": timestamp_str,
+        "type": "BEHAVIOR_ALERT",
+        "message": f"Avoid showing '{facial_emotion}' during the '{topic_key}' section. It sends mixed signals."
+    }
+
 def analyze_coherence(audio_text, slide_ocr, facial_emotion, slide_topic, timestamp_str="00:00"):
     """
     Tier 2: Coherence & Sync Analysis
@@ -31,54 +82,32 @@ def analyze_coherence(audio_text, slide_ocr, facial_emotion, slide_topic, timest
     # Prompt: "User says 'We have 50k users' but slide says '10k users'"
     # This implies we look for numbers that appear in roughly similar contexts, or just simple set comparison.
     
-    def extract_numbers(text):
-        if not text: return set()
-        # Find all numbers, stripping $ % k M B
-        # This is a basic heuristics.
-        raw_nums = re.findall(r'\d+(?:\.\d+)?', text)
-        return set(raw_nums)
-
-    audio_nums = extract_numbers(audio_text)
-    slide_nums = extract_numbers(slide_ocr)
-    
+    # Numbers are compared as normalized facts ("$2M" == "2,000,000 dollars") with
+    # tolerance; the slide's facts are indexed once per distinct OCR text.
+    slide_facts = slide_fact_index(slide_ocr or "")
+
     # If there are numbers in both, but NO overlap, we might have a mismatch.
-    # Or strict check: if audio has a number X, and slide has number Y, and X != Y, flag.
     # Let's say: if audio triggers a number, check if it's in slide.
-    for anum in audio_nums:
-        if slide_nums and anum not in slide_nums:
-            # Only flag if there are OTHER numbers in the slide (conflict).
-            # If slide has no numbers, it's just new info.
-            feedback.append({
-                "timestamp": timestamp_str,
-                "type": "CRITICAL_MISMATCH",
-                "message": f"You mentioned '{anum}' but the slide displays values {list(slide_nums)}. Verify your data."
-            })
-            score_deductions += 20
+    if slide_facts:
+        seen = set()
+        for fact in extract_facts(audio_text):
+            if fact.key() in seen:
+                continue
+            seen.add(fact.key())
+            if not slide_facts.matches(fact):
+                # Only flag if there are OTHER numbers in the slide (conflict).
+                # If slide has no numbers, it's just new info.
+                feedback.append(_mismatch_alert(timestamp_str, fact, slide_facts))
+                score_deductions += 20
             
     # --- 2. Emotion-Content Sync ---
-    # Define mismatched pairs (Topic -> Invalid Emotions)
-    mismatch_map = {
-        "Market Pain": ["Happy", "Joy"],
-        "Competition": ["Fear", "Uncertainty"],
-        "Ask": ["Fear", "Sad"],
-        "Team": ["Sad"]
-    }
-    
     # Normalize inputs
-    topic_key = None
-    for key in mismatch_map:
-        if key.lower() in slide_topic.lower():
-            topic_key = key
-            break
+    topic_key = match_emotion_topic(slide_topic)
             
     if topic_key:
-        forbidden_emotions = mismatch_map[topic_key]
+        forbidden_emotions = EMOTION_MISMATCH_MAP[topic_key]
         if facial_emotion in forbidden_emotions:
-            feedback.append({
-                "timestamp": timestamp_str,
-                "type": "BEHAVIOR_ALERT",
-                "message": f"Avoid showing '{facial_emotion}' during the '{topic_key}' section. It sends mixed signals."
-            })
+            feedback.append(_emotion_alert(timestamp_str, facial_emotion, topic_key))
             score_deductions += 15
 
     # Calculate Score
@@ -88,3 +117,150 @@ def analyze_coherence(audio_text, slide_ocr, facial_emotion, slide_topic, timest
         "coherence_score": coherence_score,
         "real_time_feedback": feedback
     }
+
+class CoherenceTracker:
+    """
+    Incremental Tier 2 engine for a single pitch session.
+
+    `analyze_coherence` rescans the whole cumulative transcript every call and
+    re-reports the same mismatch on every tick. The tracker instead:
+      - consumes only the transcript text appended since the previous update,
+      - keeps the numbers heard per slide and the slide's own number set,
+      - emits each CRITICAL_MISMATCH (and each BEHAVIOR_ALERT) only once.
+
+    Per-update cost is O(new transcript text), plus a one-off parse of each slide's OCR.
+    The coherence score still reflects every open mismatch on the current slide.
+    """
+
+    def __init__(self):
+        self.consumed = 0            # chars of the cumulative transcript already scanned
+        self.carry = ""              # trailing digits that may continue in the next chunk
+        self.tail = ""               # last REWRITE_CHECK_CHARS scanned, to detect rewrites
+        self.slide_start = 0         # transcript offset where the current slide began
+        self.slide_key = None
+        self.slide_ocr = None
+        self.slide_facts = slide_fact_index("")
+        self.spoken_facts = {}       # fact key -> NumericFact heard while on the current slide
+        self.mismatched = set()      # keys of open mismatches on the current slide
+        self.reported = set()        # dedup keys of alerts already emitted
+
+    def update(self, audio_text, slide_ocr, facial_emotion, slide_topic, timestamp_str="00:00", slide_number=None):
+        """
+        Args:
+            audio_text (str): Cumulative transcription (only the unseen suffix is scanned).
+            slide_ocr (str): Text content of current slide.
+            facial_emotion (str): Detected emotion.
+            slide_topic (str): Context/Topic of slide.
+            timestamp_str (str): Formatted timestamp for feedback.
+            slide_number (int | None): Current slide; falls back to the OCR text as slide key.
+
+        Returns:
+            dict: Same shape as `analyze_coherence`, with only newly raised feedback.
+        """
+        feedback = []
+        slide_ocr = slide_ocr or ""
+        slide_key = slide_number if slide_number else slide_ocr
+
+        # --- Slide change / OCR update: parse the slide once ---
+        if slide_key != self.slide_key:
+            if self.carry:
+                # A number held back at the end of the last chunk was said on the old slide
+                for fact in extract_facts(self.carry):
+                    self._hear(fact, timestamp_str, feedback)
+                self.carry = ""
+            self.slide_start = self.consumed
+            self.slide_key = slide_key
+            self.slide_ocr = slide_ocr
+            self.slide_facts = slide_fact_index(slide_ocr)
+            self.spoken_facts = {}
+            self.mismatched = set()
+        elif slide_ocr != self.slide_ocr:
+            # Same slide, OCR refined: re-check what was already said on it
+            self.slide_ocr = slide_ocr
+            self.slide_facts = slide_fact_index(slide_ocr)
+            self.mismatched = set()
+            for fact in self.spoken_facts.values():
+                self._check_fact(fact, timestamp_str, feedback)
+
+        # --- New transcript text only ---
+        for fact in self._consume(audio_text or ""):
+            self._hear(fact, timestamp_str, feedback)
+
+        score_deductions = 20 * len(self.mismatched)
+
+        # --- Emotion-Content Sync ---
+        topic_key = match_emotion_topic(slide_topic)
+        if topic_key and facial_emotion in EMOTION_MISMATCH_MAP[topic_key]:
+            score_deductions += 15
+            alert_key = ("BEHAVIOR_ALERT", self.slide_key, topic_key, facial_emotion)
+            if alert_key not in self.reported:
+                self.reported.add(alert_key)
+                feedback.append(_emotion_alert(timestamp_str, facial_emotion, topic_key))
+
+        return {
+            "coherence_score": max(0, 100 - score_deductions),
+            "real_time_feedback": feedback
+        }
+
+    def _hear(self, fact, timestamp_str, feedback):
+        if fact.key() not in self.spoken_facts:
+            self.spoken_facts[fact.key()] = fact
+            self._check_fact(fact, timestamp_str, feedback)
+
+    def _check_fact(self, fact, timestamp_str, feedback):
+        if not self.slide_facts or self.slide_facts.matches(fact):
+            return
+        self.mismatched.add(fact.key())
+        alert_key = ("CRITICAL_MISMATCH", self.slide_key, fact.key())
+        if alert_key not in self.reported:
+            self.reported.add(alert_key)
+            feedback.append(_mismatch_alert(timestamp_str, fact, self.slide_facts))
+
+    def _consume(self, audio_text):
+        """
+        Returns the numeric facts in the transcript text appended since the last call.
+        """
+        diverged = self._divergence(audio_text)
+        if diverged is not None:
+            # Transcript was rewritten by the client (ASR revision, or a reset).
+            # Rescan from the start of the changed word, but never before the
+            # current slide began: earlier text was checked against other slides.
+            # A transcript shorter than that is a new one; scan all of it.
+            start = self.slide_start if self.slide_start <= len(audio_text) else 0
+            word_start = max(audio_text.rfind(" ", 0, diverged), audio_text.rfind("\n", 0, diverged)) + 1
+            self.consumed = min(max(start, word_start), self.consumed - len(self.carry))
+            self.carry = ""
+
+        chunk = self.carry + audio_text[self.consumed:]
+        self.consumed = len(audio_text)
+        self.tail = audio_text[-REWRITE_CHECK_CHARS:]
+        self.carry = ""
+
+        # The trailing number may still be growing ("10" -> "100", "2" -> "2 million",
+        # "forty" -> "forty five percent"); hold back trailing numeric tokens, and
+        # a trailing "slide"/"page"/"in"/"to" so the number after it keeps its context.
+        cut = len(chunk)
+        while cut:
+            head = chunk[:cut].rstrip()
+            start = max(head.rfind(" "), head.rfind("\n"), head.rfind("\t")) + 1
+            token = head[start:]
+            if start == len(head) or not (is_numeric_token(token) or is_context_word(token)):
+                break
+            cut = start
+        self.carry = chunk[cut:]
+        chunk = chunk[:cut]
+        return extract_facts(chunk)
+
+    def _divergence(self, audio_text):
+        """
+        Offset of the first character of the already scanned text (within the last
+        REWRITE_CHECK_CHARS) that differs in `audio_text`, or None if it is unchanged.
+        """
+        start = self.consumed - len(self.tail)
+        current = audio_text[start:self.consumed]
+        if current == self.tail:
+            return None
+        for offset, (old, new) in enumerate(zip(self.tail, current)):
+            if old != new:
+                return start + offset
+        return start + len(current)
@@ -1,4 +1,31 @@
 
+# Pacing signal -> score
+PACING_MAP = {
+    "Perfect": 100,
+    "Too Fast": 80,
+    "Behind Pace": 60,
+    "Unknown": 50
+}
+
+def score_slide_text(slide_text):
+    """
+    Slide quality from the amount of OCR text on the slide.
+    """
+    # If text is very short, maybe it's just an image (good?) or empty (bad?)
+    # Let's say: 
+    # - Empty text: 50
+    # - Short text (< 20 chars): 70
+    # - Moderate text (20-200 chars): 90
+    # - Too much text (> 200 chars): 60 (Busy slide!)
+    text_len = len(slide_text)
+    if text_len == 0:
+        return 50
+    elif text_len < 20:
+        return 70
+    elif text_len > 200:
+        return 60
+    return 90
+
 def calculate_scores(tier1_results, tier2_results, input_data):
     """
     Tier 3: Viability Scoring
@@ -35,31 +62,13 @@ def calculate_scores(tier1_results, tier2_results, input_data):
     # Simple average of confidence and eye contact
     delivery_confidence = int((facial_conf + eye_contact) / 2)
     
-    # Slide Quality (Heuristic)
-    # If text is very short, maybe it's just an image (good?) or empty (bad?)
-    # Let's say: 
-    # - Empty text: 50
-    # - Short text (< 20 chars): 70
-    # - Moderate text (20-200 chars): 90
-    # - Too much text (> 200 chars): 60 (Busy slide!)
-    text_len = len(slide_text)
-    if text_len == 0:
-        slide_quality = 50
-    elif text_len < 20:
-        slide_quality = 70
-    elif text_len > 200:
-        slide_quality = 60
-    else:
-        slide_quality = 90
+    # Slide Quality (Heuristic); decks uploaded via /decks carry it precomputed
+    slide_quality = deck_content.get("slide_quality")
+    if slide_quality is None:
+        slide_quality = score_slide_text(slide_text)
         
     # Pacing Score (Internal usage)
-    pacing_map = {
-        "Perfect": 100,
-        "Too Fast": 80,
-        "Behind Pace": 60,
-        "Unknown": 50
-    }
-    pacing_score = pacing_map.get(pacing_signal, 50)
+    pacing_score = PACING_MAP.get(pacing_signal, 50)
     
     # 3. Overall Score
     # Weights: Coherence 40%, Confidence 30%, Pacing 20%, Slide Quality 10%
@@ -0,0 +1,109 @@
+from collections import deque
+
+
+class TopicMatcher:
+    """
+    Precompiled case-insensitive matcher for "which rule does this topic hit?".
+
+    Rules are (pattern, value) pairs in priority order (first wins). Patterns are
+    compiled once into an Aho-Corasick automaton, so `match` is O(len(text))
+    regardless of how many rules or aliases are configured.
+
+    Args:
+        rules (list[tuple[str, object]]): (pattern, value) in priority order.
+        whole_word (bool | set[str]): Require word boundaries around matches, for
+            every pattern (True) or only for the given patterns. Short aliases such
+            as "GTM" or "TAM" should be whole-word to avoid hits inside other words.
+        reverse (set[str] | None): Patterns that also match when the *topic* is a
+            substring of them (e.g. "Model" -> "Business Model"), resolved with a
+            precomputed substring table.
+    """
+
+    def __init__(self, rules, whole_word=False, reverse=None):
+        self.values = []
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]  # node -> [(pattern_len, priority, whole_word)]
+        self._reverse = {}
+
+        for priority, (pattern, value) in enumerate(rules):
+            self.values.append(value)
+            key = pattern.lower()
+            if not key:
+                continue
+            is_whole = whole_word if isinstance(whole_word, bool) else pattern in whole_word
+            self._add(key, priority, is_whole)
+            if reverse and pattern in reverse:
+                self._add_reverse(key, priority)
+
+        self._build()
+
+    def _add(self, key, priority, whole_word):
+        node = 0
+        for ch in key:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append((len(key), priority, whole_word))
+
+    def _add_reverse(self, key, priority):
+        for start in range(len(key)):
+            for end in range(start, len(key) + 1):
+                sub = key[start:end]
+                if sub not in self._reverse or self._reverse[sub] > priority:
+                    self._reverse[sub] = priority
+
+    def _build(self):
+        queue = deque()
+        for child in self._goto[0].values():
+            queue.append(child)
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                # Inherit outputs of the suffix link so scanning needs no chain walks
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def match_priority(self, text):
+        """
+        Returns the best (lowest) rule priority matching `text`, or None.
+        """
+        text = (text or "").lower()
+        best = self._reverse.get(text)
+
+        node = 0
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, priority, whole_word in out[node]:
+                if best is not None and priority >= best:
+                    continue
+                if whole_word and not _at_word_boundary(text, i + 1 - length, i + 1):
+                    continue
+                best = priority
+        return best
+
+    def match(self, text, default=None):
+        """
+        Returns the value of the best matching rule, or `default`.
+        """
+        priority = self.match_priority(text)
+        return default if priority is None else self.values[priority]
+
+
+def _at_word_boundary(text, start, end):
+    return (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum())
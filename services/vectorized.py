@@ -0,0 +1,203 @@
+"""
+Columnar (NumPy) versions of the Tier 1 and Tier 3 heuristics for offline
+re-scoring. Each function takes equal-length arrays (one element per frame) and
+returns arrays with exactly the semantics of the scalar `analyze_pacing` /
+`calculate_scores`; tests/test_vectorized.py checks them against each other.
+"""
+import numpy as np
+
+from services.tier1_pacing import INTRO_DWELL_LIMIT, PACING_BUFFER, TOTAL_TIME_LIMIT
+from services.tier3_viability import PACING_MAP
+
+# Pacing signals are returned as small integer codes; index into these to decode.
+PACING_SIGNALS = ("Perfect", "Too Fast", "Behind Pace", "Unknown")
+PERFECT, TOO_FAST, BEHIND_PACE, UNKNOWN = range(4)
+
+PROJECTION_MESSAGES = (
+    "You are well-paced to finish comfortably.",
+    "You are speaking too quickly; you might end under time.",
+    "At this rate, you will run out of time before the Ask.",
+    "Insufficient data.",
+    "You have exceeded the time limit.",
+    "You spent too long on the intro slide.",
+)
+MSG_WELL_PACED, MSG_TOO_FAST, MSG_RUN_OUT, MSG_INSUFFICIENT, MSG_EXCEEDED, MSG_INTRO = range(6)
+
+PACING_SCORES = np.array([PACING_MAP[signal] for signal in PACING_SIGNALS], dtype=np.int64)
+# Calibrated shares never drop below this fraction of an even split (1 / total_slides)
+MIN_SHARE_OF_EVEN_SPLIT = 0.5
+
+
+def analyze_pacing_columns(timestamps, slides, total_slides):
+    """
+    Vectorized `analyze_pacing`.
+
+    Args:
+        timestamps (array-like[float]): Current time in seconds per frame.
+        slides (array-like[int]): Current slide number (1-indexed) per frame.
+        total_slides (array-like[int] | int): Total slides per frame (or one for all).
+
+    Returns:
+        dict: {
+            "pacing_code": int8 array (index into PACING_SIGNALS),
+            "message_code": int8 array (index into PROJECTION_MESSAGES)
+        }
+    """
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    slides = np.asarray(slides)
+    total_slides = np.broadcast_to(np.asarray(total_slides), slides.shape)
+
+    unknown = (slides <= 0) | (total_slides <= 0)
+    exceeded = ~unknown & (timestamps > TOTAL_TIME_LIMIT)
+    projecting = ~unknown & ~exceeded
+
+    # Projected finish = (current_timestamp / current_slide) * total_slides
+    safe_slides = np.where(projecting, slides, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        projected = (timestamps / safe_slides) * total_slides
+
+    behind = projecting & (projected > (TOTAL_TIME_LIMIT + PACING_BUFFER))
+    too_fast = projecting & ~behind & (projected < (TOTAL_TIME_LIMIT - PACING_BUFFER))
+    intro = projecting & (slides == 1) & (timestamps > INTRO_DWELL_LIMIT)
+
+    pacing = np.full(slides.shape, PERFECT, dtype=np.int8)
+    message = np.full(slides.shape, MSG_WELL_PACED, dtype=np.int8)
+
+    pacing[too_fast] = TOO_FAST
+    message[too_fast] = MSG_TOO_FAST
+    pacing[behind] = BEHIND_PACE
+    message[behind] = MSG_RUN_OUT
+    # Intro dwell overrides the projection (but not the early returns)
+    pacing[intro] = BEHIND_PACE
+    message[intro] = MSG_INTRO
+    pacing[exceeded] = BEHIND_PACE
+    message[exceeded] = MSG_EXCEEDED
+    pacing[unknown] = UNKNOWN
+    message[unknown] = MSG_INSUFFICIENT
+
+    return {"pacing_code": pacing, "message_code": message}
+
+
+def calculate_scores_columns(pacing_codes, coherence_scores, facial_confidence, eye_contact, slide_text_lengths):
+    """
+    Vectorized `calculate_scores`.
+
+    Args:
+        pacing_codes (array-like[int]): Codes from `analyze_pacing_columns`.
+        coherence_scores (array-like[int]): Tier 2 coherence per frame.
+        facial_confidence (array-like[float]): 0-100 per frame.
+        eye_contact (array-like[float]): 0-100 per frame.
+        slide_text_lengths (array-like[int]): len(ocr_text) per frame.
+
+    Returns:
+        dict: {"overall_score", "coherence_score", "delivery_confidence", "slide_quality"} int64 arrays.
+    """
+    coherence = np.asarray(coherence_scores)
+    facial_confidence = np.asarray(facial_confidence)
+    eye_contact = np.asarray(eye_contact)
+    text_len = np.asarray(slide_text_lengths)
+
+    # Simple average of confidence and eye contact, truncated like int()
+    delivery_confidence = np.trunc((facial_confidence + eye_contact) / 2).astype(np.int64)
+
+    slide_quality = np.select(
+        [text_len == 0, text_len < 20, text_len > 200],
+        [50, 70, 60],
+        default=90
+    ).astype(np.int64)
+
+    pacing_score = PACING_SCORES[np.asarray(pacing_codes, dtype=np.int64)]
+
+    # Same operation order as the scalar path so float results are bit-identical
+    overall_raw = (
+        (coherence * 0.4) +
+        (delivery_confidence * 0.3) +
+        (pacing_score * 0.2) +
+        (slide_quality * 0.1)
+    )
+    overall_score = np.trunc(overall_raw).astype(np.int64)
+
+    return {
+        "overall_score": overall_score,
+        "coherence_score": coherence.astype(np.int64),
+        "delivery_confidence": delivery_confidence,
+        "slide_quality": slide_quality
+    }
+
+
+def decode_pacing(pacing_codes, message_codes):
+    """
+    Converts code arrays back to (pacing_signal, time_remaining_projection) string lists.
+    """
+    return (
+        [PACING_SIGNALS[c] for c in pacing_codes],
+        [PROJECTION_MESSAGES[c] for c in message_codes]
+    )
+
+
+def slide_dwell_columns(session_codes, timestamps, slides, total_slides):
+    """
+    Seconds spent on each slide of each recorded session, in one pass.
+
+    Frames must be grouped by session and in time order within a session. A slide's
+    dwell runs from its first frame to the first frame of the next slide; the last
+    slide of a session ends at the session's last frame.
+
+    Args:
+        session_codes (array-like[int]): Session index per frame (0..n_sessions-1).
+        timestamps (array-like[float]): Current time in seconds per frame.
+        slides (array-like[int]): Current slide number (1-indexed) per frame.
+        total_slides (int): Deck size; slides outside 1..total_slides are ignored.
+
+    Returns:
+        float64 array of shape (n_sessions, total_slides): dwell per slide (slide - 1).
+    """
+    session_codes = np.asarray(session_codes, dtype=np.int64)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    slides = np.asarray(slides, dtype=np.int64)
+    n_sessions = int(session_codes.max()) + 1 if session_codes.size else 0
+    dwell = np.zeros((n_sessions, total_slides), dtype=np.float64)
+    if not session_codes.size:
+        return dwell
+
+    # Run starts: first frame, or a change of session or slide
+    starts = np.ones(session_codes.size, dtype=bool)
+    starts[1:] = (session_codes[1:] != session_codes[:-1]) | (slides[1:] != slides[:-1])
+    run_index = np.flatnonzero(starts)
+
+    # A run ends where the next run starts (same session) or at the session's last frame
+    next_start = np.append(run_index[1:], session_codes.size)
+    same_session = np.append(session_codes[run_index[1:]] == session_codes[run_index[:-1]], False)
+    end_time = np.where(
+        same_session,
+        timestamps[np.minimum(next_start, session_codes.size - 1)],
+        timestamps[next_start - 1]
+    )
+    run_dwell = np.maximum(end_time - timestamps[run_index], 0.0)
+
+    run_slides = slides[run_index]
+    valid = (run_slides >= 1) & (run_slides <= total_slides)
+    np.add.at(dwell, (session_codes[run_index][valid], run_slides[valid] - 1), run_dwell[valid])
+    return dwell
+
+
+def calibrate_budget_shares(dwell):
+    """
+    Per-slide share of total speaking time, averaged over sessions (each session's
+    shares sum to 1, so long and short pitches weigh the same). Sessions with no
+    recorded time are skipped.
+
+    Each share is floored at half an even split before normalizing, so a slide
+    that was rarely (or never) dwelt on still gets a usable time budget.
+
+    Returns:
+        list[float]: One share per slide, summing to 1.0 (even split without data).
+    """
+    dwell = np.asarray(dwell, dtype=np.float64)
+    totals = dwell.sum(axis=1)
+    used = totals > 0
+    if not used.any():
+        return [1.0 / dwell.shape[1]] * dwell.shape[1]
+    shares = (dwell[used] / totals[used, None]).mean(axis=0)
+    shares = np.maximum(shares, MIN_SHARE_OF_EVEN_SPLIT / dwell.shape[1])
+    return (shares / shares.sum()).tolist()
@@ -0,0 +1,80 @@
+try:
+    import msgpack
+except ImportError:  # optional; only JSON is accepted and served without it
+    msgpack = None
+
+from services.models import dumps, loads
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+# Spellings clients send for MessagePack bodies
+MSGPACK_TYPES = frozenset({MSGPACK, "application/x-msgpack", "application/vnd.msgpack"})
+
+
+class UnsupportedFormatError(ValueError):
+    """
+    A request body in a format this process cannot decode (MessagePack without
+    the msgpack package installed).
+    """
+
+
+class PayloadError(ValueError):
+    """
+    A request body that does not decode in its declared format.
+    """
+
+
+def decode_payload(body, mimetype):
+    """
+    Decodes a request body by its Content-Type.
+
+    Args:
+        body (bytes): Raw request body.
+        mimetype (str): Content-Type without parameters.
+
+    Returns:
+        The decoded object (None for an empty body).
+
+    Raises:
+        UnsupportedFormatError: MessagePack body without msgpack installed.
+        PayloadError: The body is not valid in its format.
+    """
+    if not body:
+        return None
+    if mimetype in MSGPACK_TYPES:
+        if msgpack is None:
+            raise UnsupportedFormatError("MessagePack bodies need the msgpack package")
+        try:
+            return msgpack.unpackb(body, raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise PayloadError(f"Invalid MessagePack body: {e}") from None
+    try:
+        return loads(body)
+    except (ValueError, TypeError) as e:
+        raise PayloadError(f"Invalid JSON body: {e}") from None
+
+
+def negotiate(accept):
+    """
+    The response format for an Accept header: MessagePack only when the client
+    asks for it (and prefers it to JSON) and msgpack is installed, JSON otherwise.
+
+    Args:
+        accept (werkzeug MIMEAccept): request.accept_mimetypes.
+    """
+    if msgpack is None or not any(mimetype in MSGPACK_TYPES for mimetype, _ in accept):
+        return JSON
+    preferred = accept.best_match([JSON, *sorted(MSGPACK_TYPES)], default=JSON)
+    return MSGPACK if preferred in MSGPACK_TYPES else JSON
+
+
+def encode_payload(payload, mimetype=JSON):
+    """
+    Encodes a response body in a format returned by negotiate.
+
+    Returns:
+        bytes
+    """
+    if mimetype == MSGPACK:
+        return msgpack.packb(payload)
+    return dumps(payload)
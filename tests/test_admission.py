@@ -0,0 +1,92 @@
+import pytest
+
+import app as app_module
+from services.admission import (
+    FULL,
+    HEURISTIC,
+    LLM_SAMPLED,
+    PACING_ONLY,
+    REJECTED,
+    AdmissionController,
+    local_queue_delay,
+    note_request_queued,
+    parse_request_start,
+    should_sample_llm,
+    tier_for_load,
+)
+from services.pipeline import analyze_frame
+from services.session_store import SessionState
+
+FRAME = {
+    "current_timestamp": 60,
+    "audio_analysis": {"transcription": "We have 500 users.", "wpm": 130},
+    "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 80, "emotional_tone": "Neutral"},
+    "deck_content": {"current_slide_number": 2, "total_slides": 10, "ocr_text": "Traction: 10,000 users"}
+}
+
+def test_tiers_degrade_in_order_with_load():
+    assert [tier_for_load(load) for load in (0.1, 0.6, 0.8, 0.9, 1.0, 3.0)] == [
+        FULL, LLM_SAMPLED, HEURISTIC, PACING_ONLY, REJECTED, REJECTED
+    ]
+
+def test_request_start_header_units():
+    assert parse_request_start("t=1700000000.5", now=1700000000.6) == pytest.approx(0.1, abs=1e-3)
+    assert parse_request_start("1700000000500", now=1700000000.6) == pytest.approx(0.1, abs=1e-3)
+    assert parse_request_start("1700000000500000", now=1700000000.6) == pytest.approx(0.1, abs=1e-3)
+    assert parse_request_start(None) is None and parse_request_start("soon") is None
+
+def test_in_flight_and_queue_delay_drive_the_tier():
+    controller = AdmissionController(max_in_flight=4, target_queue_seconds=0.1)
+    with controller.admit() as first, controller.admit() as second, controller.admit() as third:
+        assert (first, second, third) == (FULL, FULL, LLM_SAMPLED)
+        with controller.admit() as fourth, controller.admit() as fifth:
+            assert (fourth, fifth) == (HEURISTIC, REJECTED)
+    assert controller.in_flight == 0
+
+    for _ in range(20):
+        with controller.admit(queue_delay=0.5) as tier:
+            pass
+    assert tier == REJECTED
+
+def test_outstanding_llm_calls_and_thread_queueing_count_as_load():
+    calls = [0]
+    controller = AdmissionController(max_in_flight=8, llm_calls=lambda: calls[0])
+    with controller.admit() as tier:
+        assert tier == FULL
+    calls[0] = 24  # 24 / (8 slots * 4 calls per slot)
+    with controller.admit() as tier:
+        assert tier == HEURISTIC
+
+    note_request_queued(100.0)
+    assert local_queue_delay(now=100.25) == 0.25
+    assert local_queue_delay(now=101) is None
+
+def test_pacing_only_skips_coherence_and_scoring():
+    full = analyze_frame(FRAME)
+    degraded = analyze_frame(FRAME, service_tier=PACING_ONLY)
+    assert full["real_time_feedback"][0]["type"] == "CRITICAL_MISMATCH"
+    assert degraded["real_time_feedback"] == [] and degraded["tiered_analysis"] == {}
+    assert degraded["dashboard_status"]["pacing_signal"] == full["dashboard_status"]["pacing_signal"]
+    assert degraded["dashboard_status"]["service_tier"] == PACING_ONLY
+    assert degraded["progress_tracker"] == full["progress_tracker"]
+
+def test_sampled_tier_calls_llm_every_nth_tick():
+    state = SessionState()
+    sampled = []
+    for _ in range(6):
+        sampled.append(should_sample_llm(state, every=3))
+        analyze_frame(FRAME, session_state=state, service_tier=LLM_SAMPLED)
+    assert sampled == [True, False, False, True, False, False]
+
+def test_saturated_app_returns_503(monkeypatch):
+    monkeypatch.setattr(app_module, "admission", AdmissionController(max_in_flight=1))
+    client = app_module.app.test_client()
+    with app_module.admission.admit():
+        response = client.post("/analyze", json=FRAME)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+
+    response = client.post("/analyze", json=FRAME)
+    assert response.status_code == 200
+    assert response.get_json()["dashboard_status"]["service_tier"] == FULL
+    assert app_module.admission.in_flight == 0
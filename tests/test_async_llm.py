@@ -0,0 +1,136 @@
+import time
+
+import pytest
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from services.async_llm import LLMDispatcher
+from services.llm_agent import GravityOrchestrator
+from services.pipeline import analyze_frame, merge_feedback
+
+
+@pytest.fixture
+def slow_server():
+    with FakeOpenAIServer(delay=0.5) as server:
+        yield server
+
+def make_dispatcher(server, deadline):
+    orchestrator = GravityOrchestrator(api_key="test", base_url=server.base_url)
+    return LLMDispatcher(orchestrator, deadline=deadline)
+
+AUDIO = {"transcription": "We have 100 users.", "wpm": 120}
+VIDEO = {"facial_confidence": 90, "eye_contact_percent": 90, "emotional_tone": "Happy"}
+DECK = {"current_slide_number": 2, "total_slides": 10, "slide_topic": "Traction", "ocr_text": "Users: 100"}
+
+def test_fast_llm_within_deadline():
+    with FakeOpenAIServer(delay=0) as server:
+        dispatcher = make_dispatcher(server, deadline=5)
+        result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, DECK, 60)
+    assert source == "llm"
+    assert result.tiered_analysis.coherence_score == 88
+
+def test_missed_deadline_falls_back_then_delivers_late(slow_server):
+    dispatcher = make_dispatcher(slow_server, deadline=0.05)
+
+    start = time.perf_counter()
+    result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, DECK, 60)
+    elapsed = time.perf_counter() - start
+
+    # Deadline missed: caller gets nothing and was not held for the full LLM latency
+    assert result is None and source is None
+    assert elapsed < 0.4
+    assert dispatcher.pending_count() == 1
+
+    time.sleep(0.7)
+    result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, DECK, 61)
+    assert source == "llm_late"
+    assert result.tiered_analysis.delivery_confidence == 82
+    assert slow_server.request_count == 1
+
+def test_missed_deadline_without_session_is_dropped(slow_server):
+    dispatcher = make_dispatcher(slow_server, deadline=0.05)
+    result, source = dispatcher.evaluate(None, AUDIO, VIDEO, DECK, 60)
+    assert result is None and source is None
+    assert dispatcher.pending_count() == 0
+
+def test_analyze_serves_heuristic_when_deadline_missed(slow_server, monkeypatch):
+    import app as app_module
+    monkeypatch.setattr(app_module, "dispatcher", make_dispatcher(slow_server, deadline=0.05))
+
+    client = app_module.app.test_client()
+    payload = {
+        "session_id": "pitch-1",
+        "current_timestamp": 60,
+        "audio_analysis": AUDIO,
+        "video_analysis": VIDEO,
+        "deck_content": DECK
+    }
+    response = client.post('/analyze', json=payload)
+    assert response.status_code == 200
+    assert response.get_json()["dashboard_status"]["analysis_source"] == "heuristic"
+
+    time.sleep(0.7)
+    response = client.post('/analyze', json=payload)
+    assert response.get_json()["dashboard_status"]["analysis_source"] == "llm_late"
+
+def frame(transcript, **extra):
+    return {
+        "current_timestamp": 60,
+        "audio_analysis": {"transcription": transcript, "wpm": 120},
+        "video_analysis": VIDEO,
+        "deck_content": DECK,
+        **extra
+    }
+
+def test_llm_scores_are_merged_with_heuristic_alerts():
+    with FakeOpenAIServer(delay=0) as server:
+        response = analyze_frame(frame("We have 50 users."), make_dispatcher(server, deadline=5))
+    assert response["dashboard_status"]["analysis_source"] == "llm"
+    assert response["tiered_analysis"]["coherence_score"] == 88
+    assert [item["type"] for item in response["real_time_feedback"]] == ["KUDOS", "CRITICAL_MISMATCH"]
+
+def test_heuristic_alert_is_kept_unless_the_llm_raised_the_same_one():
+    llm = [{"timestamp": "01:00", "type": "CRITICAL_MISMATCH", "message": "You said 50 users; the slide shows 100."}]
+    same = {"timestamp": "01:00", "type": "CRITICAL_MISMATCH",
+            "message": "You mentioned '50' but the slide displays values ['100']. Verify your data."}
+    other = {"timestamp": "01:00", "type": "CRITICAL_MISMATCH",
+             "message": "You mentioned '$3M' but the slide displays values ['$2M']. Verify your data."}
+    assert merge_feedback(llm, [same, other]) == llm + [other]
+    assert merge_feedback([dict(llm[0], message="You said 150 users.")], [same])[-1] == same
+
+def test_latency_budget_bounds_the_whole_request(slow_server):
+    dispatcher = make_dispatcher(slow_server, deadline=5)
+    start = time.perf_counter()
+    response = analyze_frame(frame("We have 50 users.", latency_budget_ms=50), dispatcher)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.3
+    assert response["dashboard_status"]["analysis_source"] == "heuristic"
+    assert response["real_time_feedback"][0]["type"] == "CRITICAL_MISMATCH"
+
+def test_parked_calls_are_bounded(slow_server, monkeypatch):
+    from services import async_llm
+    monkeypatch.setattr(async_llm, "MAX_PENDING_SESSIONS", 2)
+    dispatcher = make_dispatcher(slow_server, deadline=0.01)
+    for session_id in ("a", "b", "c"):
+        dispatcher.evaluate(session_id, AUDIO, VIDEO, DECK, 60)
+    assert dispatcher.pending_count() == 2
+
+    # Sessions that never come back expire
+    monkeypatch.setattr(async_llm, "PENDING_TTL_SECONDS", 0.0)
+    dispatcher.evaluate("d", AUDIO, VIDEO, DECK, 60)
+    assert dispatcher.pending_count() == 1
+
+def test_latency_budget_counts_from_the_start_of_the_request():
+    class SlowDecks:
+        def expand(self, deck):
+            time.sleep(0.3)
+            return deck
+
+    frame = {"current_timestamp": 60, "latency_budget_ms": 400, "audio_analysis": {"transcription": "Budget test."},
+             "video_analysis": VIDEO, "deck_content": DECK}
+    with FakeOpenAIServer(delay=0.2) as server:
+        start = time.perf_counter()
+        response = analyze_frame(frame, make_dispatcher(server, deadline=5), decks=SlowDecks())
+        elapsed = time.perf_counter() - start
+    assert response["dashboard_status"]["analysis_source"] == "heuristic"
+    assert elapsed < 0.5
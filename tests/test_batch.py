@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from app import app
+from services.batch import replay_files, replay_session
+
+
+def make_timeline(n=6):
+    frames = []
+    transcript = ""
+    for i in range(n):
+        transcript += " We have 500 users." if i == 3 else " Moving on."
+        frames.append({
+            "current_timestamp": 10 * (i + 1),
+            "audio_analysis": {"transcription": transcript.strip(), "wpm": 130},
+            "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 70, "emotional_tone": "Neutral"},
+            "deck_content": {"current_slide_number": 1 + i // 2, "total_slides": 6,
+                             "slide_topic": "Traction", "ocr_text": "Users: 100"}
+        })
+    return frames
+
+def test_replay_session_dedups_mismatch_alerts():
+    results = list(replay_session(make_timeline(), session_id="rec-1"))
+    assert [r["frame_index"] for r in results] == list(range(6))
+    alerts = [f for r in results for f in r["real_time_feedback"] if f["type"] == "CRITICAL_MISMATCH"]
+    assert len(alerts) == 1
+    assert all(r["session_id"] == "rec-1" for r in results)
+
+def test_batch_endpoint_streams_ndjson():
+    client = app.test_client()
+    body = "\n".join(json.dumps(f) for f in make_timeline())
+    response = client.post('/analyze/batch?session_id=rec-2', data=body, content_type='application/x-ndjson')
+    lines = [json.loads(l) for l in response.get_data(as_text=True).splitlines()]
+    assert response.status_code == 200
+    assert len(lines) == 6
+    assert lines[0]["dashboard_status"]["pacing_signal"]
+
+    response = client.post('/analyze/batch', json={"frames": make_timeline(2)})
+    assert len(response.get_data(as_text=True).splitlines()) == 2
+
+def test_replay_files_across_processes(tmp_path):
+    paths = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.jsonl"
+        path.write_text("\n".join(json.dumps(f) for f in make_timeline()))
+        paths.append(str(path))
+
+    done = dict(replay_files(paths, str(tmp_path / "out"), workers=2))
+    assert done == {paths[0]: 6, paths[1]: 6}
+    assert len((tmp_path / "out" / "a.scores.jsonl").read_text().splitlines()) == 6
+
+def test_replay_files_rejects_colliding_outputs(tmp_path):
+    paths = []
+    for folder in ("day1", "day2"):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "pitch.jsonl"
+        path.write_text("\n".join(json.dumps(f) for f in make_timeline(2)))
+        paths.append(str(path))
+
+    with pytest.raises(ValueError, match="pitch.scores.jsonl"):
+        list(replay_files(paths, str(tmp_path / "out"), workers=1))
+    assert not (tmp_path / "out").exists()
@@ -0,0 +1,44 @@
+import json
+
+from scripts.synthetic_timelines import generate_timeline
+from services.context_builder import ContextBuilder, compact_context, estimate_tokens
+from services.llm_agent import GravityOrchestrator
+
+
+def contexts(timeline):
+    orchestrator = GravityOrchestrator(api_key="test")
+    for frame in timeline:
+        yield orchestrator.build_context(
+            frame["audio_analysis"], frame["video_analysis"], frame["deck_content"], frame["current_timestamp"]
+        )
+
+def test_prompt_size_stays_flat_over_full_pitch():
+    builder = ContextBuilder()
+    sizes = [estimate_tokens(builder.build(c)) for c in contexts(generate_timeline(seed=1, duration=180))]
+
+    assert max(sizes) <= builder.token_budget
+    # Late-pitch prompts are about the same size as mid-pitch ones, not 2x
+    assert sizes[-1] < sizes[len(sizes) // 2] * 1.3
+
+def test_earlier_slides_are_summarized():
+    builder = ContextBuilder()
+    for c in contexts(generate_timeline(seed=2, duration=120, total_slides=6)):
+        text = builder.build(c)
+    compact = json.loads(text)
+    numbers = [s["n"] for s in compact["earlier_slides"]]
+    assert numbers and numbers == sorted(numbers)
+    assert compact["slide_context"]["number"] not in numbers
+    assert compact["recent_transcription"].startswith("... ")
+
+def test_stateless_compaction_is_windowed_and_unindented():
+    context = {
+        "current_timestamp": 90,
+        "audio_transcription": " ".join(f"word{i}" for i in range(1000)),
+        "slide_context": {"number": 3, "topic": "Traction", "ocr_text": "x" * 5000}
+    }
+    text = compact_context(context, window_words=50)
+    compact = json.loads(text)
+    assert "\n" not in text
+    assert compact["recent_transcription"].split()[-1] == "word999"
+    assert len(compact["recent_transcription"].split()) == 51  # "..." + 50 words
+    assert len(compact["slide_context"]["ocr_text"]) <= 600
@@ -0,0 +1,72 @@
+import pytest
+
+from app import app
+from scripts.fake_redis_server import FakeRedisServer
+from services.deck_store import DeckStore, UnknownDeckError, build_deck, deck_id_for
+from services.pipeline import analyze_frame
+from services.session_store import RedisSessionStore
+
+SLIDES = [
+    {"ocr_text": "Acme\nAI copilots for pitch practice", "slide_topic": "Intro"},
+    "The Problem\nFounders rehearse alone",
+    {"ocr_text": "Traction: 2,000 users, $1.2M ARR, 40% MoM", "slide_topic": "Traction"},
+]
+
+def frame(deck_content, transcript="We are building the future."):
+    return {
+        "current_timestamp": 60,
+        "audio_analysis": {"transcription": transcript, "wpm": 130},
+        "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 80, "emotional_tone": "Neutral"},
+        "deck_content": deck_content
+    }
+
+def test_features_are_computed_per_slide():
+    deck = build_deck(SLIDES)
+    assert deck.deck_id == deck_id_for(SLIDES)
+    problem, traction = deck.slide(2), deck.slide(3)
+    assert problem.topic == "Problem" and problem.stage == "Problem"
+    assert traction.stage == "Business Model"
+    assert traction.facts.labels() == ["40%", "2,000", "$1.2M"]
+    assert deck.slide(0) is None and deck.slide(4) is None
+
+def test_deck_reference_matches_inline_ocr():
+    store = DeckStore()
+    deck, created = store.add(SLIDES)
+    transcript = "We now have 2,000 users and 5 million in ARR."
+    by_reference = analyze_frame(frame({"deck_id": deck.deck_id, "current_slide_number": 3}, transcript), decks=store)
+    inline = analyze_frame(frame({"current_slide_number": 3, "total_slides": 3, "slide_topic": "Traction",
+                                  "ocr_text": SLIDES[2]["ocr_text"]}, transcript))
+    assert created and store.add(SLIDES) == (deck, False)
+    assert by_reference == inline
+    assert by_reference["real_time_feedback"][0]["type"] == "CRITICAL_MISMATCH"
+
+def test_unknown_deck_or_slide_raises():
+    store = DeckStore()
+    deck, _ = store.add(SLIDES)
+    with pytest.raises(UnknownDeckError):
+        store.expand({"deck_id": "missing", "current_slide_number": 1})
+    with pytest.raises(UnknownDeckError):
+        store.expand({"deck_id": deck.deck_id, "current_slide_number": 9})
+
+def test_workers_share_uploads_through_redis():
+    with FakeRedisServer() as server:
+        worker_a = DeckStore(shared=RedisSessionStore(server.url, prefix="pitch:deck:"))
+        worker_b = DeckStore(shared=RedisSessionStore(server.url, prefix="pitch:deck:"))
+        deck, _ = worker_a.add(SLIDES, "demo_day")
+        rebuilt = worker_b.get(deck.deck_id)
+        assert rebuilt.to_dict() == deck.to_dict()
+        assert len(worker_b) == 1
+
+def test_deck_endpoints():
+    client = app.test_client()
+    uploaded = client.post('/decks', json={"slides": SLIDES})
+    assert uploaded.status_code == 201
+    deck_id = uploaded.get_json()["deck_id"]
+    assert client.post('/decks', json={"slides": SLIDES}).status_code == 200
+    assert client.get(f'/decks/{deck_id}').get_json()["total_slides"] == 3
+    assert client.post('/decks', json={"slides": []}).status_code == 400
+
+    tick = frame({"deck_id": deck_id, "current_slide_number": 2})
+    assert client.post('/analyze', json=tick).get_json()["progress_tracker"]["current_stage"] == "Problem"
+    missing = frame({"deck_id": "nope", "current_slide_number": 1})
+    assert client.post('/analyze', json=missing).status_code == 404
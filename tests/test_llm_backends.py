@@ -0,0 +1,38 @@
+from services.async_llm import LLMDispatcher
+from services.llm_agent import GravityOrchestrator
+from services.llm_backends import OpenAIBackend, RulesBackend, backend_from_env
+from services.pipeline import analyze_frame
+
+FRAME = {
+    "session_id": "offline-1",
+    "current_timestamp": 75,
+    "audio_analysis": {"transcription": "We have 50 users and grew fast.", "wpm": 190},
+    "video_analysis": {"facial_confidence": 90, "eye_contact_percent": 80, "emotional_tone": "Neutral"},
+    "deck_content": {"current_slide_number": 4, "total_slides": 10, "slide_topic": "Traction", "ocr_text": "Users: 100"}
+}
+
+def test_backend_selection(monkeypatch):
+    monkeypatch.delenv("LLM_BACKEND", raising=False)
+    assert backend_from_env(api_key=None) is None
+    assert isinstance(backend_from_env(api_key="test", base_url="http://127.0.0.1:9"), OpenAIBackend)
+    monkeypatch.setenv("LLM_BACKEND", "rules")
+    assert isinstance(backend_from_env(api_key=None), RulesBackend)
+    monkeypatch.setenv("LLM_BACKEND", "none")
+    assert backend_from_env(api_key="test") is None
+
+def test_rules_backend_output_matches_schema():
+    orchestrator = GravityOrchestrator(backend=RulesBackend())
+    audio, video, deck = FRAME["audio_analysis"], FRAME["video_analysis"], FRAME["deck_content"]
+    result = orchestrator.evaluate_pitch(audio, video, deck, 75)
+
+    assert orchestrator.cache is None
+    assert result.tiered_analysis.coherence_score == 80
+    assert result.tiered_analysis.delivery_confidence == 75  # (90 + 80) / 2, minus 10 for 190 wpm
+    assert [item.type for item in result.real_time_feedback] == ["CRITICAL_MISMATCH", "BEHAVIOR_ALERT"]
+    assert result == orchestrator.evaluate_pitch(audio, video, deck, 75)  # deterministic
+
+def test_pipeline_runs_llm_path_offline():
+    dispatcher = LLMDispatcher(GravityOrchestrator(backend=RulesBackend()), deadline=1)
+    response = analyze_frame(FRAME, dispatcher)
+    assert response["dashboard_status"]["analysis_source"] == "llm"
+    assert response["tiered_analysis"]["slide_quality"] == 70
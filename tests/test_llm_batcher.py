@@ -0,0 +1,74 @@
+import asyncio
+import json
+
+import pytest
+
+from scripts.fake_openai_server import DEFAULT_CONTENT, FakeOpenAIServer
+from services.llm_agent import GravityOrchestrator
+from services.llm_backends import OpenAIBackend
+from services.llm_batcher import BatchingBackend
+from services.llm_client import ManagedLLMClient
+
+VIDEO = {"facial_confidence": 90, "eye_contact_percent": 80, "emotional_tone": "Neutral"}
+DECK = {"current_slide_number": 2, "total_slides": 10, "slide_topic": "Traction", "ocr_text": "Users: 100"}
+
+@pytest.fixture(autouse=True)
+def no_cache(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_SIZE", "0")
+
+def make_orchestrator(server, **kwargs):
+    backend = BatchingBackend(OpenAIBackend(ManagedLLMClient("test", server.base_url)), **kwargs)
+    return GravityOrchestrator(backend=backend)
+
+def evaluate_many(orchestrator, count):
+    async def run():
+        return await asyncio.gather(*(
+            orchestrator.evaluate_pitch_async({"transcription": f"Pitch number {i} is live."}, VIDEO, DECK, 60,
+                                              session_id=f"s{i}")
+            for i in range(count)
+        ))
+    return asyncio.run(run())
+
+def test_concurrent_sessions_share_one_call():
+    with FakeOpenAIServer() as server:
+        results = evaluate_many(make_orchestrator(server, max_batch=8, max_wait=0.05), 6)
+        request = server.requests[0]
+    assert server.request_count == 1
+    assert [r.tiered_analysis.coherence_score for r in results] == [88] * 6
+    # One system prompt for the whole batch, one section per pitch
+    assert len(request["messages"]) == 2
+    assert request["messages"][1]["content"].count("### Pitch ") == 6
+
+def test_full_batch_is_sent_without_waiting():
+    with FakeOpenAIServer() as server:
+        results = evaluate_many(make_orchestrator(server, max_batch=3, max_wait=5), 6)
+    assert server.request_count == 2
+    assert all(results)
+
+def test_single_call_is_sent_as_is():
+    with FakeOpenAIServer() as server:
+        result, = evaluate_many(make_orchestrator(server, max_batch=8, max_wait=0.01), 1)
+        assert "### Pitch" not in server.requests[0]["messages"][1]["content"]
+    assert result.tiered_analysis.slide_quality == 90
+
+def test_pitch_missing_from_reply_fails_only_that_session():
+    partial = json.dumps({"evaluations": {"p0": DEFAULT_CONTENT}})
+    with FakeOpenAIServer(content=partial) as server:
+        first, second = evaluate_many(make_orchestrator(server, max_batch=2, max_wait=0.05), 2)
+    assert first.tiered_analysis.coherence_score == 88
+    assert second is None
+
+def test_batches_form_under_the_default_config(monkeypatch):
+    monkeypatch.setenv("LLM_BATCH_MAX", "8")
+    monkeypatch.delenv("LLM_BATCH_WAIT_MS", raising=False)
+    monkeypatch.delenv("LLM_DEADLINE_SECONDS", raising=False)
+    with FakeOpenAIServer() as server:
+        backend = BatchingBackend.wrap_from_env(OpenAIBackend(ManagedLLMClient("test", server.base_url)))
+        assert isinstance(backend, BatchingBackend) and backend.max_batch == 8
+        results = evaluate_many(GravityOrchestrator(backend=backend), 6)
+    assert server.request_count == 1 and all(results)
+
+def test_failed_batch_call_fails_every_waiting_session():
+    with FakeOpenAIServer(error_statuses=[400]) as server:
+        results = evaluate_many(make_orchestrator(server, max_batch=2, max_wait=0.05), 2)
+    assert results == [None, None] and server.request_count == 1
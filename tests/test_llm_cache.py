@@ -0,0 +1,61 @@
+from scripts.fake_openai_server import FakeOpenAIServer
+from services.llm_agent import GravityOrchestrator
+from services.llm_cache import LLMCache, SQLiteCacheBackend, context_cache_key
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    def __call__(self):
+        return self.now
+
+def make_context(transcript="We have 100 users.", confidence=81, timestamp=60):
+    return {
+        "current_timestamp": timestamp,
+        "total_time_limit": 180,
+        "audio_transcription": transcript,
+        "detected_wpm": 120,
+        "visual_signals": {"facial_confidence": confidence, "eye_contact": 90, "emotion": "Happy"},
+        "slide_context": {"number": 2, "total": 10, "topic": "Traction", "ocr_text": "Users: 100"}
+    }
+
+def test_key_ignores_jitter_but_not_content():
+    base = context_cache_key(make_context())
+    assert context_cache_key(make_context(transcript="We have  100 users. ", confidence=79, timestamp=62)) == base
+    assert context_cache_key(make_context(transcript="We have 500 users.")) != base
+
+def test_lru_eviction_and_ttl():
+    clock = FakeClock()
+    cache = LLMCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"
+    cache.set("c", "3")  # evicts least recently used "b"
+    assert cache.get("b") is None
+    clock.now = 11
+    assert cache.get("a") is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2 and stats["evictions"] == 1
+
+def test_sqlite_backend_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    LLMCache(backend=SQLiteCacheBackend(path)).set("k", '{"ok": true}')
+    assert LLMCache(backend=SQLiteCacheBackend(path)).get("k") == '{"ok": true}'
+
+def test_orchestrator_reuses_cached_response():
+    with FakeOpenAIServer() as server:
+        orchestrator = GravityOrchestrator(api_key="test", base_url=server.base_url, cache=LLMCache())
+        audio = {"transcription": "We have 100 users.", "wpm": 120}
+        video = {"facial_confidence": 90, "eye_contact_percent": 90, "emotional_tone": "Happy"}
+        deck = {"current_slide_number": 2, "total_slides": 10, "slide_topic": "Traction", "ocr_text": "Users: 100"}
+
+        first = orchestrator.evaluate_pitch(audio, video, deck, 60)
+        second = orchestrator.evaluate_pitch(audio, video, deck, 62)
+
+    assert first.tiered_analysis == second.tiered_analysis
+    # Served from the cache, but stamped with the tick that asked
+    assert [item.timestamp for item in first.real_time_feedback] == ["01:00"]
+    assert [item.timestamp for item in second.real_time_feedback] == ["01:02"]
+    assert server.request_count == 1
+    assert orchestrator.cache.stats()["hits"] == 1
@@ -0,0 +1,78 @@
+import asyncio
+import threading
+
+import openai
+import pytest
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from services.llm_client import ManagedLLMClient, RateLimiter, backoff_delay
+
+MESSAGES = [{"role": "user", "content": "ping"}]
+
+def make_client(server, **kwargs):
+    kwargs.setdefault("backoff_base", 0.01)
+    kwargs.setdefault("timeout", 5)
+    return ManagedLLMClient("test", server.base_url, **kwargs)
+
+def test_retries_429_then_succeeds():
+    with FakeOpenAIServer(error_statuses=[429, 503]) as server:
+        response = make_client(server).create(MESSAGES, model="gpt-4o")
+    assert response.choices[0].message.content
+    assert server.request_count == 3
+
+def test_gives_up_after_max_retries():
+    with FakeOpenAIServer(error_statuses=[429] * 5) as server, pytest.raises(openai.RateLimitError):
+        make_client(server, max_retries=2).create(MESSAGES, model="gpt-4o")
+    assert server.request_count == 3
+
+def test_does_not_retry_client_errors():
+    with FakeOpenAIServer(error_statuses=[400]) as server, pytest.raises(openai.BadRequestError):
+        make_client(server).create(MESSAGES, model="gpt-4o")
+    assert server.request_count == 1
+
+def test_async_path_retries():
+    with FakeOpenAIServer(error_statuses=[429]) as server:
+        client = make_client(server)
+        response = asyncio.run(client.acreate(MESSAGES, model="gpt-4o"))
+    assert response.usage.total_tokens == 680
+    assert server.request_count == 2
+
+def test_retry_after_is_a_floor():
+    assert backoff_delay(0, base=0.01, cap=8, retry_after=1.5) >= 1.5
+    assert backoff_delay(0, base=0.01, cap=8, retry_after=20) == 20
+
+def test_gives_up_instead_of_retrying_before_a_long_retry_after():
+    with FakeOpenAIServer(error_statuses=[429], retry_after=120) as server, pytest.raises(openai.RateLimitError):
+        make_client(server).create(MESSAGES, model="gpt-4o")
+    assert server.request_count == 1
+
+def test_failed_attempts_hand_back_their_token_reservation():
+    limiter = RateLimiter(tokens_per_minute=1000, clock=lambda: 0.0)
+    with FakeOpenAIServer(error_statuses=[503, 503, 400]) as server, pytest.raises(openai.BadRequestError):
+        make_client(server, limiter=limiter).create(MESSAGES, model="gpt-4o")
+    assert limiter.reserve(1000) == 0.0
+
+def test_request_bucket_spaces_out_bursts():
+    now = [0.0]
+    limiter = RateLimiter(requests_per_minute=60, clock=lambda: now[0])
+    waits = [limiter.reserve() for _ in range(62)]
+    assert waits[:60] == [0.0] * 60
+    assert waits[60] == pytest.approx(1.0)
+    assert waits[61] == pytest.approx(2.0)
+
+def test_token_bucket_reconciles_actual_usage():
+    limiter = RateLimiter(tokens_per_minute=1000, clock=lambda: 0.0)
+    assert limiter.reserve(800) == 0.0
+    limiter.adjust_tokens(-600)  # actually used 200
+    assert limiter.reserve(500) == 0.0
+
+def test_concurrency_cap():
+    with FakeOpenAIServer(delay=0.1) as server:
+        client = make_client(server, limiter=RateLimiter(max_concurrency=2))
+        threads = [threading.Thread(target=client.create, args=(MESSAGES,), kwargs={"model": "gpt-4o"}) for _ in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    assert server.request_count == 6
+    assert server.max_in_flight <= 2
@@ -0,0 +1,70 @@
+import time
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from scripts.synthetic_timelines import generate_timeline
+from services.async_llm import LLMDispatcher
+from services.llm_agent import GravityOrchestrator
+from services.llm_scheduler import LLMScheduler
+
+AUDIO = {"transcription": "Hello everyone, thanks for having us.", "wpm": 120}
+VIDEO = {"facial_confidence": 90, "eye_contact_percent": 90, "emotional_tone": "Happy"}
+DECK = {"current_slide_number": 1, "total_slides": 10, "slide_topic": "Intro", "ocr_text": "Acme"}
+
+def check(scheduler, frame):
+    return scheduler.check("s1", frame["audio_analysis"], frame["video_analysis"],
+                           frame["deck_content"], frame["current_timestamp"])
+
+def test_significant_events_dispatch():
+    scheduler = LLMScheduler(min_new_words=20, max_staleness=30)
+    assert scheduler.check("s1", AUDIO, VIDEO, DECK, 0) == "first"
+    assert scheduler.check("s1", AUDIO, VIDEO, DECK, 1) is None
+
+    audio = {"transcription": AUDIO["transcription"] + " We grew 40% last month."}
+    assert scheduler.check("s1", audio, VIDEO, DECK, 2) == "numbers"
+    assert scheduler.check("s1", audio, dict(VIDEO, emotional_tone="Anxious"), DECK, 3) == "emotion"
+    assert scheduler.check("s1", audio, dict(VIDEO, emotional_tone="Anxious"), dict(DECK, current_slide_number=2), 4) == "slide"
+    assert scheduler.check("s1", audio, dict(VIDEO, emotional_tone="Anxious"), dict(DECK, current_slide_number=2), 40) == "stale"
+    assert scheduler.stats()["skipped"] == 1
+
+def test_cuts_calls_over_a_pitch():
+    scheduler = LLMScheduler()
+    timeline = generate_timeline(seed=3, duration=180, rate_hz=2.0, number_density=0.02)
+    dispatched = sum(1 for frame in timeline if check(scheduler, frame) is not None)
+    assert dispatched * 5 <= len(timeline)
+    assert scheduler.stats()["skipped"] == len(timeline) - dispatched
+
+def test_dispatcher_reuses_last_analysis_on_skipped_ticks():
+    with FakeOpenAIServer(delay=0) as server:
+        orchestrator = GravityOrchestrator(api_key="test", base_url=server.base_url)
+        dispatcher = LLMDispatcher(orchestrator, deadline=5, scheduler=LLMScheduler())
+
+        result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, DECK, 0)
+        assert source == "llm" and result.real_time_feedback
+
+        result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, DECK, 1)
+        assert source == "llm_reused"
+        assert result.tiered_analysis.coherence_score == 88
+        assert result.real_time_feedback == ()
+        assert server.request_count == 1
+
+        dispatcher.discard("s1")
+        assert dispatcher.scheduler.skipped_count("s1") == 0
+
+def test_change_during_an_in_flight_call_gets_its_own_call():
+    with FakeOpenAIServer(delay=0.3) as server:
+        orchestrator = GravityOrchestrator(api_key="test", base_url=server.base_url)
+        dispatcher = LLMDispatcher(orchestrator, deadline=0.01, scheduler=LLMScheduler())
+
+        dispatcher.evaluate("s1", AUDIO, VIDEO, DECK, 0)
+        slide_2 = dict(DECK, current_slide_number=2, slide_topic="Problem")
+        # Slide changes while the slide-1 call is still running
+        assert dispatcher.evaluate("s1", AUDIO, VIDEO, slide_2, 1) == (None, None)
+        time.sleep(0.5)
+        result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, slide_2, 2)
+        assert source == "llm_late"
+
+        dispatcher.deadline = 5
+        result, source = dispatcher.evaluate("s1", AUDIO, VIDEO, slide_2, 3)
+        assert source == "llm"
+        assert server.request_count == 2
+        assert dispatcher.evaluate("s1", AUDIO, VIDEO, slide_2, 4)[1] == "llm_reused"
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import random
+import time
+
+import pytest
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from services.async_llm import LLMDispatcher
+from services.llm_agent import GravityOrchestrator
+from services.llm_stream import FEEDBACK, TIERED_ANALYSIS, EvaluationStreamParser
+from services.models import LLMOutputError
+from services.pipeline import analyze_frame
+from services.session import PitchSession
+
+CONTENT = {
+    "tiered_analysis": {"coherence_score": 70, "delivery_confidence": 85, "slide_quality": 90},
+    "real_time_feedback": [
+        {"timestamp": "01:00", "type": "CRITICAL_MISMATCH", "message": "You said 50 users; the slide says 100."},
+        {"timestamp": "01:00", "type": "BEHAVIOR_ALERT", "message": "Smiling through \"the pain\" {slide} reads as [unserious]."},
+        {"timestamp": "01:00", "type": "KUDOS", "message": "Strong, steady eye contact."}
+    ]
+}
+AUDIO = {"transcription": "We have 50 users.", "wpm": 120}
+VIDEO = {"facial_confidence": 90, "eye_contact_percent": 80, "emotional_tone": "Happy"}
+DECK = {"current_slide_number": 2, "total_slides": 10, "slide_topic": "Traction", "ocr_text": "Users: 100"}
+
+def test_parser_emits_each_piece_at_any_chunking():
+    text = json.dumps(CONTENT, indent=2)
+    for seed in range(50):
+        rng = random.Random(seed)
+        parser, events, i = EvaluationStreamParser(), [], 0
+        while i < len(text):
+            size = rng.randint(1, 9)
+            events += parser.feed(text[i:i + size])
+            i += size
+        assert [kind for kind, _ in events] == [TIERED_ANALYSIS, FEEDBACK, FEEDBACK, FEEDBACK]
+        assert events[2][1].message == CONTENT["real_time_feedback"][1]["message"]
+        assert parser.content() == text
+
+def test_parser_reports_an_item_as_soon_as_it_closes():
+    parser = EvaluationStreamParser()
+    assert parser.feed('{"tiered_analysis": {"coherence_score": 70, "delivery_confidence": 85') == []
+    events = parser.feed(', "slide_quality": 90}, "real_time_feedback": [')
+    assert [(kind, value.slide_quality) for kind, value in events] == [(TIERED_ANALYSIS, 90)]
+    events = parser.feed('{"timestamp": "01:00", "type": "KUDOS", "message": "Nice."}, {"time')
+    assert [(kind, item.message) for kind, item in events] == [(FEEDBACK, "Nice.")]
+    with pytest.raises(LLMOutputError):
+        parser.feed('stamp": "01:01", "type": "SHOUT", "message": "?"}')
+
+def test_time_to_first_event_is_well_below_completion(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_SIZE", "0")
+    seen = []
+    with FakeOpenAIServer(content=CONTENT, stream_delay=0.04, stream_chunk_chars=16) as server:
+        orchestrator = GravityOrchestrator(api_key="test", base_url=server.base_url)
+        start = time.perf_counter()
+        result = asyncio.run(orchestrator.evaluate_pitch_async(
+            AUDIO, VIDEO, DECK, 60, on_event=lambda kind, value: seen.append((time.perf_counter() - start, kind))
+        ))
+        total = time.perf_counter() - start
+
+    assert result.to_dict() == CONTENT
+    assert [kind for _, kind in seen] == [TIERED_ANALYSIS, FEEDBACK, FEEDBACK, FEEDBACK]
+    assert seen[0][0] < total * 0.4
+    assert seen[1][0] < total * 0.6
+
+def test_session_subscribers_get_partial_events_before_the_tick_finishes(monkeypatch):
+    monkeypatch.setenv("LLM_CACHE_SIZE", "0")
+    session = PitchSession("stream-1", {"audio_analysis": AUDIO, "video_analysis": VIDEO, "deck_content": DECK})
+    events = session.subscribe()
+    with FakeOpenAIServer(content=CONTENT, stream_delay=0.02) as server:
+        dispatcher = LLMDispatcher(GravityOrchestrator(api_key="test", base_url=server.base_url), deadline=5)
+        with session.lock:
+            response = analyze_frame(session.frame, dispatcher, session_state=session.state,
+                                     on_llm_event=session.publish_partial)
+
+    partials = [events.get_nowait()["partial"] for _ in range(events.qsize())]
+    assert partials[0] == {"tiered_analysis": CONTENT["tiered_analysis"]}
+    assert [p["real_time_feedback"][0]["type"] for p in partials[1:]] == ["CRITICAL_MISMATCH", "BEHAVIOR_ALERT", "KUDOS"]
+    assert response["dashboard_status"]["analysis_source"] == "llm"
@@ -0,0 +1,29 @@
+from app import app
+from services.metrics import MetricsRegistry
+
+
+def test_histogram_renders_cumulative_buckets():
+    registry = MetricsRegistry()
+    hist = registry.histogram("demo_seconds", "Demo.", ("stage",), buckets=(0.1, 1.0))
+    hist.observe(0.05, "tier1")
+    hist.observe(0.5, "tier1")
+    hist.observe(5.0, "tier1")
+
+    text = registry.render()
+    assert 'demo_seconds_bucket{stage="tier1",le="0.1"} 1' in text
+    assert 'demo_seconds_bucket{stage="tier1",le="1.0"} 2' in text
+    assert 'demo_seconds_bucket{stage="tier1",le="+Inf"} 3' in text
+    assert 'demo_seconds_count{stage="tier1"} 3' in text
+
+def test_metrics_endpoint_reports_pipeline_stages():
+    client = app.test_client()
+    client.post('/analyze', json={
+        "current_timestamp": 30,
+        "audio_analysis": {"transcription": "Hello"},
+        "deck_content": {"current_slide_number": 1, "total_slides": 5, "slide_topic": "Intro"}
+    })
+    text = client.get('/metrics').get_data(as_text=True)
+    for stage in ("tier1", "tier2", "tier3", "progress", "serialize"):
+        assert f'pitch_stage_seconds_count{{stage="{stage}"}}' in text
+    assert 'pitch_request_seconds_count{endpoint="analyze"}' in text
+    assert 'pitch_analysis_source_total{source="heuristic"}' in text
@@ -0,0 +1,59 @@
+import json
+
+import pytest
+
+from scripts.fake_openai_server import FakeOpenAIServer
+from services.async_llm import LLMDispatcher
+from services.llm_agent import GravityOrchestrator
+from services.models import LLMOutputError, TieredAnalysis, dumps, parse_llm_output
+from services.pipeline import analyze_frame
+
+VALID = {
+    "tiered_analysis": {"coherence_score": 88, "delivery_confidence": 81.6, "slide_quality": 90},
+    "real_time_feedback": [{"timestamp": "01:00", "type": "KUDOS", "message": "Nice."}]
+}
+
+FRAME = {
+    "session_id": "m1",
+    "current_timestamp": 60,
+    "audio_analysis": {"transcription": "We have 100 users.", "wpm": 120},
+    "video_analysis": {"facial_confidence": 90, "eye_contact_percent": 90, "emotional_tone": "Happy"},
+    "deck_content": {"current_slide_number": 3, "total_slides": 10, "slide_topic": "Traction", "ocr_text": "Users: 100"}
+}
+
+def test_parse_valid_output():
+    evaluation = parse_llm_output(json.dumps(VALID))
+    assert evaluation.tiered_analysis == TieredAnalysis(88, 82, 90)
+    assert evaluation.real_time_feedback[0].type == "KUDOS"
+    assert evaluation.to_dict()["tiered_analysis"]["delivery_confidence"] == 82
+
+@pytest.mark.parametrize("content", [
+    "not json",
+    "[]",
+    json.dumps({"real_time_feedback": []}),
+    json.dumps({"tiered_analysis": {"coherence_score": "high", "delivery_confidence": 80, "slide_quality": 80}}),
+    json.dumps({"tiered_analysis": {"coherence_score": 80, "delivery_confidence": 80}}),
+    json.dumps({"tiered_analysis": {"coherence_score": 180, "delivery_confidence": 80, "slide_quality": 80}}),
+    json.dumps(dict(VALID, real_time_feedback=[{"timestamp": "01:00", "type": "SHRUG", "message": "?"}])),
+    json.dumps(dict(VALID, real_time_feedback="none")),
+])
+def test_malformed_output_is_rejected(content):
+    with pytest.raises(LLMOutputError):
+        parse_llm_output(content)
+
+def test_malformed_llm_output_falls_back_to_heuristics():
+    broken = {"tiered_analysis": {"coherence_score": None}}
+    with FakeOpenAIServer(content=broken) as server:
+        orchestrator = GravityOrchestrator(api_key="test", base_url=server.base_url)
+        dispatcher = LLMDispatcher(orchestrator, deadline=5)
+        response = analyze_frame(FRAME, dispatcher)
+
+    assert server.request_count == 1
+    assert response["dashboard_status"]["analysis_source"] == "heuristic"
+    assert response["tiered_analysis"]["coherence_score"] > 0
+
+def test_dumps_is_compact_json():
+    body = dumps({"a": [1, 2], "b": "é"})
+    assert isinstance(body, bytes)
+    assert json.loads(body) == {"a": [1, 2], "b": "é"}
+    assert b" " not in body
@@ -0,0 +1,91 @@
+import pytest
+
+from services.numeric_facts import FactIndex, extract_facts, slide_fact_index
+from services.tier2_coherence import CoherenceTracker, analyze_coherence
+
+
+def values(text):
+    return [(f.value, f.kind) for f in extract_facts(text)]
+
+@pytest.mark.parametrize("text, expected", [
+    ("We raised $2M", [(2e6, "currency")]),
+    ("2,000,000 dollars", [(2e6, "currency")]),
+    ("two million dollars", [(2e6, "currency")]),
+    ("growing 40% month over month", [(40, "percent")]),
+    ("forty five percent", [(45, "percent")]),
+    ("a $1.5 billion market", [(1.5e9, "currency")]),
+    ("twenty five thousand users", [(25000, "number")]),
+    ("we are one of the two best teams", []),
+])
+def test_units_are_normalized(text, expected):
+    assert values(text) == expected
+
+@pytest.mark.parametrize("spoken, slide, matches", [
+    ("2,000,000", "ARR: $2M", True),
+    ("about two million in revenue", "ARR: $2.3M", True),   # rounded to the million
+    ("2.0 million", "ARR: $2.3M", False),
+    ("40 percent", "Growth 40%", True),
+    ("40 dollars", "Growth 40%", False),                   # currency vs percent
+    ("500 users", "Users: 100", False),
+])
+def test_index_matches_with_tolerance(spoken, slide, matches):
+    index = FactIndex(extract_facts(slide))
+    assert index.matches(extract_facts(spoken)[0]) is matches
+
+def test_no_false_alert_for_equivalent_units():
+    res = analyze_coherence("We closed $2M in revenue, two million dollars!", "Revenue: 2,000,000", "Neutral", "Traction")
+    assert res["real_time_feedback"] == []
+    assert res["coherence_score"] == 100
+
+def test_tracker_waits_for_scale_word_across_chunks():
+    tracker = CoherenceTracker()
+    res = tracker.update("Our revenue is 2", "Revenue $2M", "Neutral", "Traction", "00:10", 4)
+    assert res["real_time_feedback"] == []
+    res = tracker.update("Our revenue is 2 million this year", "Revenue $2M", "Neutral", "Traction", "00:11", 4)
+    assert res["real_time_feedback"] == [] and res["coherence_score"] == 100
+
+def test_slide_index_is_built_once_per_slide_text():
+    slide_fact_index.cache_clear()
+    for _ in range(50):
+        analyze_coherence("We have 100 users", "Users: 100, MRR $20k", "Neutral", "Traction")
+    info = slide_fact_index.cache_info()
+    assert info.misses == 1 and info.hits == 49
+
+@pytest.mark.parametrize("text, expected", [
+    ("We launched in 2019 with 500 users", [(500, "number")]),
+    ("Slide 3 shows our growth", []),
+    ("As you can see on page 12, churn is 4%", [(4, "percent")]),
+    ("Q3 2024 revenue hit $1.2M", [(1.2e6, "currency")]),
+    ("It runs 10x faster", []),
+    ("We beat 3 competitors in 2 weeks", [(3, "number"), (2, "number")]),
+    ("2,019 users", [(2019, "number")]),
+    ("We now have 2000 customers", [(2000, "number")]),
+    ("Revenue grew from 2019-2021 and since FY 2015", []),
+])
+def test_years_and_references_are_not_facts(text, expected):
+    assert values(text) == expected
+
+def test_no_mismatch_for_years_and_slide_references():
+    res = analyze_coherence("We launched in 2019 with 500 users. Slide 3 shows Q3 2024.", "Users: 500",
+                            "Neutral", "Traction")
+    assert res["real_time_feedback"] == []
+
+@pytest.mark.parametrize("spoken, slide", [
+    ("We now have 2000 customers", "Customers: 1,500"),
+    ("Team of 8 engineers", "Team: 4 engineers"),
+    ("We beat 5 competitors", "Competitors: 3"),
+])
+def test_counts_and_small_integers_are_still_checked(spoken, slide):
+    res = analyze_coherence(spoken, slide, "Neutral", "Traction")
+    assert [item["type"] for item in res["real_time_feedback"]] == ["CRITICAL_MISMATCH"]
+
+def test_tracker_keeps_slide_reference_context_across_chunks():
+    tracker = CoherenceTracker()
+    assert tracker.update("As shown on slide", "Users: 500", "Neutral", "Traction", "00:10", 2)["real_time_feedback"] == []
+    res = tracker.update("As shown on slide 14 we have 500 users", "Users: 500", "Neutral", "Traction", "00:11", 2)
+    assert res["real_time_feedback"] == []
+    res = tracker.update("As shown on slide 14 we have 500 users since", "Users: 500", "Neutral", "Traction", "00:12", 2)
+    assert res["real_time_feedback"] == []
+    res = tracker.update("As shown on slide 14 we have 500 users since 2019", "Users: 500", "Neutral", "Traction",
+                         "00:13", 2)
+    assert res["real_time_feedback"] == []
@@ -0,0 +1,69 @@
+import pytest
+
+from services import tier1_pacing
+from services.tier1_pacing import PacingTracker, analyze_pacing, register_budget_shares
+from services.vectorized import calibrate_budget_shares, slide_dwell_columns
+
+
+@pytest.fixture(autouse=True)
+def clear_budgets():
+    yield
+    tier1_pacing._BUDGET_SHARES.clear()
+
+def run(tracker, ticks, total_slides=10, **kwargs):
+    result = None
+    for t, slide in ticks:
+        result = tracker.update(t, slide, total_slides, **kwargs)
+    return result
+
+@pytest.mark.parametrize("timestamp, slide, total", [(50, 1, 10), (181, 3, 3), (10, 0, 5), (30, 1, 10)])
+def test_matches_analyze_pacing_before_any_slide_completes(timestamp, slide, total):
+    result = PacingTracker().update(timestamp, slide, total)
+    expected = analyze_pacing(timestamp, slide, total)
+    assert result["pacing_signal"] == expected["pacing_signal"]
+    assert result["time_remaining_projection"] == expected["time_remaining_projection"]
+
+def test_recent_slides_dominate_the_projection():
+    # Same position and time; one presenter sped up, the other slowed down
+    speeding_up, slowing_down = PacingTracker(), PacingTracker()
+    fast_late = run(speeding_up, [(0, 1), (30, 2), (60, 3), (70, 4), (80, 5), (90, 6)])
+    slow_late = run(slowing_down, [(0, 1), (10, 2), (20, 3), (30, 4), (60, 5), (90, 6)])
+
+    assert speeding_up.dwell == {1: 30, 2: 30, 3: 10, 4: 10, 5: 10}
+    # The cumulative average (analyze_pacing) cannot tell them apart
+    assert slow_late["projected_total_seconds"] - fast_late["projected_total_seconds"] > 25
+
+def test_configurable_time_limit():
+    ticks = [(0, 1), (30, 2), (60, 3), (90, 4)]
+    assert run(PacingTracker(), ticks)["pacing_signal"] == "Behind Pace"
+    assert run(PacingTracker(), ticks, total_time_limit=300)["pacing_signal"] == "Perfect"
+
+def test_calibrated_budgets_replace_the_intro_rule():
+    register_budget_shares(4, [0.4, 0.2, 0.2, 0.2])  # 72s allowed on the intro
+    tracker = PacingTracker()
+    assert tracker.update(0, 1, 4)["pacing_signal"] != "Behind Pace"
+    assert tracker.update(60, 1, 4)["pacing_signal"] != "Behind Pace"  # past INTRO_DWELL_LIMIT
+    result = tracker.update(100, 1, 4)
+    assert result["time_remaining_projection"] == "You spent too long on the intro slide."
+
+def test_round_trip():
+    tracker = PacingTracker(total_time_limit=240)
+    run(tracker, [(0, 1), (20, 2), (45, 3)])
+    restored = PacingTracker.from_dict(tracker.to_dict())
+    assert restored.to_dict() == tracker.to_dict()
+    assert restored.update(50, 3, 10) == tracker.update(50, 3, 10)
+
+def test_bulk_dwell_and_calibration():
+    sessions = [0, 0, 0, 0, 1, 1, 1]
+    timestamps = [0, 10, 20, 50, 0, 30, 90]
+    slides = [1, 1, 2, 3, 1, 2, 2]
+    dwell = slide_dwell_columns(sessions, timestamps, slides, 3)
+    assert dwell.tolist() == [[20, 30, 0], [30, 60, 0]]
+
+    # Slide 3 was never dwelt on: floored at half an even split, then normalized
+    shares = calibrate_budget_shares(dwell)
+    raw = [(0.4 + 1 / 3) / 2, (0.6 + 2 / 3) / 2, 1 / 6]
+    assert shares == pytest.approx([share / sum(raw) for share in raw])
+
+    with pytest.raises(ValueError):
+        register_budget_shares(3, [0.5, 0.5, 0.0])
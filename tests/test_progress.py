@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from services.progress import STANDARD_STAGES, analyze_progress, register_pitch_format
+from services.tier2_coherence import match_emotion_topic
+from services.topic_matcher import TopicMatcher
+
+
+def linear_stage_index(topic):
+    # Original analyze_progress scan
+    clean = topic.strip().lower()
+    for i, stage in enumerate(STANDARD_STAGES):
+        if stage.lower() in clean or clean in stage.lower():
+            return i
+    return -1
+
+def test_canonical_stages_match_linear_scan():
+    rng = random.Random(7)
+    words = ["the", "Problem", "model", "Market", "ask", "team", "x", "Solution", "intro", "Busi"]
+    matcher = TopicMatcher([(s, i) for i, s in enumerate(STANDARD_STAGES)], reverse=set(STANDARD_STAGES))
+    for _ in range(2000):
+        topic = " ".join(rng.choice(words) for _ in range(rng.randint(1, 4)))
+        assert matcher.match(topic.strip(), default=-1) == linear_stage_index(topic)
+
+@pytest.mark.parametrize("topic, stage", [
+    ("Problem", "Problem"),
+    ("Our Traction", "Business Model"),
+    ("GTM Strategy", "Market"),
+    ("Financials", "Business Model"),
+    ("Meet the Founders", "Team"),
+])
+def test_aliases_resolve_to_stage(topic, stage):
+    assert analyze_progress(topic)["current_stage"] == stage
+
+def test_short_aliases_are_whole_word_only():
+    # "tam" inside "Stamina" must not match the TAM alias
+    assert analyze_progress("Stamina")["current_stage"] == "Stamina"
+
+def test_pitch_formats_and_registration():
+    res = analyze_progress("Customer Case Studies", "sales_pitch")
+    assert res["current_stage"] == "Proof"
+    assert res["stages_missing"] == ["Pricing", "Next Steps"]
+
+    register_pitch_format("investor_update", ["Highlights", "Lowlights", "Asks"], {"Lowlights": ["Challenges"]})
+    assert analyze_progress("Key Challenges", "investor_update")["current_stage"] == "Lowlights"
+
+def test_emotion_topic_lookup():
+    assert match_emotion_topic("Market Pain Points") == "Market Pain"
+    assert match_emotion_topic("Competition") == "Competition"
+    assert match_emotion_topic("Solution") is None
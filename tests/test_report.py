@@ -0,0 +1,84 @@
+import json
+
+from app import app
+from services.batch import replay_files
+from services.report import SessionReport, build_report
+
+
+def make_timeline(n=6):
+    frames = []
+    transcript = ""
+    for i in range(n):
+        transcript += " We have 500 users." if i == 3 else " Moving on."
+        frames.append({
+            "current_timestamp": 10 * (i + 1),
+            "audio_analysis": {"transcription": transcript.strip(), "wpm": 130},
+            "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 70, "emotional_tone": "Neutral"},
+            "deck_content": {"current_slide_number": 1 + i // 2, "total_slides": 6,
+                             "slide_topic": "Traction", "ocr_text": "Users: 100"}
+        })
+    return frames
+
+def status(score):
+    return {"dashboard_status": {"overall_score": score, "analysis_source": "heuristic", "service_tier": "full"},
+            "real_time_feedback": []}
+
+def test_report_aggregates_a_timeline():
+    report = build_report(make_timeline(), session_id="rec-1")
+    assert report["session_id"] == "rec-1" and report["ticks"] == 6
+    assert report["duration_seconds"] == 50
+    assert report["slide_dwell_seconds"] == {"1": 20.0, "2": 20.0, "3": 10.0}
+    assert sum(report["pacing_signals"].values()) == 6
+    assert report["stage_coverage"]["stages_covered"] == ["Business Model"]
+    assert "Ask" in report["stage_coverage"]["stages_missing"]
+    assert [item["type"] for item in report["feedback"]] == ["CRITICAL_MISMATCH"]
+    assert report["feedback"][0]["count"] == 1
+    assert report["score"]["min"] <= report["score"]["mean"] <= report["score"]["max"]
+
+def test_trajectory_stays_bounded_for_long_pitches():
+    report = SessionReport(max_points=10)
+    for second in range(3600):
+        report.add({"current_timestamp": second}, status(second % 100))
+    rendered = report.to_dict()
+    assert len(report.buckets) <= 10
+    assert rendered["trajectory"][0]["start"] == 0 and rendered["trajectory"][-1]["end"] >= 3599
+    assert sum(point["min"] <= point["mean"] <= point["max"] for point in rendered["trajectory"]) == len(rendered["trajectory"])
+    assert rendered["score"]["mean"] == 49.5
+
+def test_feedback_is_deduplicated_and_capped():
+    report = SessionReport(max_feedback=2)
+    for i in range(5):
+        response = status(50)
+        response["real_time_feedback"] = [
+            {"timestamp": f"00:0{i}", "type": "BEHAVIOR_ALERT", "message": "Slow down."},
+            {"timestamp": f"00:0{i}", "type": "KUDOS", "message": f"Nice point {i}."}
+        ]
+        report.add({"current_timestamp": i}, response)
+    rendered = report.to_dict()
+    assert rendered["feedback"][0] == {"type": "BEHAVIOR_ALERT", "message": "Slow down.",
+                                       "first_timestamp": "00:00", "last_timestamp": "00:04", "count": 5}
+    assert len(rendered["feedback"]) == 2 and rendered["feedback_dropped"] == 4
+    assert rendered["feedback_counts"] == {"BEHAVIOR_ALERT": 5, "KUDOS": 5}
+
+def test_report_endpoints():
+    client = app.test_client()
+    body = "\n".join(json.dumps(f) for f in make_timeline())
+    response = client.post('/reports?session_id=rec-2', data=body, content_type='application/x-ndjson')
+    assert response.status_code == 200
+    assert response.get_json() == build_report(make_timeline(), session_id="rec-2")
+    assert client.post('/reports', json={"frames": "nope"}).status_code == 400
+
+    session_id = client.post('/sessions', json={}).get_json()["session_id"]
+    for frame in make_timeline(3):
+        client.post(f'/sessions/{session_id}/frames', json=frame)
+    report = client.get(f'/sessions/{session_id}/report').get_json()
+    assert report["session_id"] == session_id and report["ticks"] == 3
+    client.delete(f'/sessions/{session_id}')
+    assert client.get(f'/sessions/{session_id}/report').status_code == 404
+
+def test_replay_files_writes_reports(tmp_path):
+    path = tmp_path / "a.jsonl"
+    path.write_text("\n".join(json.dumps(f) for f in make_timeline()))
+    assert dict(replay_files([str(path)], str(tmp_path / "out"), workers=1, reports=True)) == {str(path): 6}
+    report = json.loads((tmp_path / "out" / "a.report.json").read_text())
+    assert report["session_id"] == "a" and report["ticks"] == 6
@@ -0,0 +1,119 @@
+import socket
+import threading
+import time
+
+import pytest
+
+import app as app_module
+from scripts.fake_redis_server import FakeRedisServer
+from services.pipeline import analyze_frame
+from services.session_store import (
+    SESSION_STORE_ERRORS,
+    InMemorySessionStore,
+    RedisSessionStore,
+    SessionState,
+)
+
+
+def frame(t, slide, topic, transcript="We are building the future."):
+    return {
+        "session_id": "p1",
+        "current_timestamp": t,
+        "audio_analysis": {"transcription": transcript, "wpm": 130},
+        "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 80, "emotional_tone": "Neutral"},
+        "deck_content": {"current_slide_number": slide, "total_slides": 10, "slide_topic": topic, "ocr_text": ""}
+    }
+
+@pytest.fixture
+def redis_url():
+    with FakeRedisServer() as server:
+        yield server.url
+
+def test_progress_reports_visited_stages():
+    state = SessionState()
+    analyze_frame(frame(10, 1, "Introduction"), session_state=state)
+    analyze_frame(frame(30, 2, "Market Size"), session_state=state)  # skipped Problem/Solution
+    progress = analyze_frame(frame(50, 3, "Business Model"), session_state=state)["progress_tracker"]
+
+    assert progress["current_stage"] == "Business Model"
+    assert progress["stages_completed"] == ["Intro", "Market"]
+    assert "Problem" in progress["stages_missing"] and "Solution" in progress["stages_missing"]
+
+def test_feedback_is_not_repeated_for_stateless_callers():
+    state = SessionState()
+    tick = frame(60, 3, "Traction", "We have 50 users.")
+    tick["deck_content"]["ocr_text"] = "Users: 100"
+    first = analyze_frame(tick, session_state=state)["real_time_feedback"]
+    second = analyze_frame(dict(tick, current_timestamp=61), session_state=state)["real_time_feedback"]
+    assert first and second == []
+
+def test_state_round_trip_and_bounded_size():
+    state = SessionState("demo_day")
+    for t in range(500):
+        state.pacing.update(t, t // 50 + 1, 10)
+        state.record_tick(t, t % 4, "Perfect", "demo_day")
+        state.new_feedback([{"type": "KUDOS", "message": f"m{t}"}])
+    data = state.to_dict()
+    assert len(data["feedback_keys"]) == 32
+    assert data["pacing_counts"] == {"Perfect": 500}
+    assert SessionState.from_dict(data).to_dict() == data
+
+def test_in_memory_store_lru_and_ttl():
+    now = [0.0]
+    store = InMemorySessionStore(max_sessions=2, ttl_seconds=10, clock=lambda: now[0])
+    store.put("a", SessionState())
+    store.put("b", SessionState())
+    store.put("c", SessionState())
+    assert store.get("a") is None and len(store) == 2
+    now[0] = 11
+    assert store.get("b") is None
+
+def test_redis_store_shares_state_between_instances(redis_url):
+    worker_a = RedisSessionStore(redis_url)
+    worker_b = RedisSessionStore(redis_url)
+    assert worker_a.ping()
+
+    state = SessionState()
+    analyze_frame(frame(10, 1, "Introduction"), session_state=state)
+    worker_a.put("p1", state)
+
+    shared = worker_b.get("p1")
+    progress = analyze_frame(frame(40, 2, "Problem"), session_state=shared)["progress_tracker"]
+    assert progress["stages_completed"] == ["Intro"]
+
+    worker_b.delete("p1")
+    assert worker_a.get("p1") is None
+
+def test_unreachable_store_serves_the_tick_statelessly(monkeypatch):
+    with FakeRedisServer() as server:
+        url = server.url
+    monkeypatch.setattr(app_module, "session_store", RedisSessionStore(url))  # nothing listens there now
+    failures = SESSION_STORE_ERRORS.value("get"), SESSION_STORE_ERRORS.value("put")
+    response = app_module.app.test_client().post("/analyze", json=frame(10, 1, "Introduction"))
+    assert response.status_code == 200
+    assert response.get_json()["dashboard_status"]["overall_score"] is not None
+    assert SESSION_STORE_ERRORS.value("get") == failures[0] + 1
+    assert SESSION_STORE_ERRORS.value("put") == failures[1]
+
+def test_reconnect_only_replaces_the_failing_threads_connection(redis_url):
+    store = RedisSessionStore(redis_url)
+    store.put("p1", SessionState())
+    main_reconnected = threading.Event()
+    conns = []
+
+    def worker():
+        store.get("p1")
+        conns.append(store._local.conn)
+        main_reconnected.wait(5)
+        store.get("p1")
+        conns.append(store._local.conn)
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    while not conns:
+        time.sleep(0.01)
+    store._local.conn._sock.shutdown(socket.SHUT_RDWR)  # this thread's connection goes stale
+    assert store.get("p1") is not None
+    main_reconnected.set()
+    thread.join()
+    assert conns[0] is conns[1]
@@ -0,0 +1,69 @@
+import pytest
+
+from app import app
+from services.session import (
+    PitchSession,
+    SessionExistsError,
+    SessionRegistry,
+    diff_response,
+)
+
+
+def test_apply_delta_appends_transcript_and_merges_sections():
+    session = PitchSession("s1", {"deck_content": {"current_slide_number": 1, "total_slides": 5}})
+    session.apply_delta({"transcript_delta": "We have", "current_timestamp": 5})
+    session.apply_delta({"transcript_delta": "100 users", "deck_content": {"current_slide_number": 2}})
+
+    assert session.frame["audio_analysis"]["transcription"] == "We have 100 users"
+    assert session.frame["deck_content"] == {"current_slide_number": 2, "total_slides": 5}
+    assert session.frame["current_timestamp"] == 5
+
+def test_diff_response_only_reports_changed_fields():
+    before = {"dashboard_status": {"overall_score": 80, "pacing_signal": "Perfect"}, "real_time_feedback": []}
+    after = {"dashboard_status": {"overall_score": 75, "pacing_signal": "Perfect"}, "real_time_feedback": []}
+    assert diff_response(before, after) == {"dashboard_status": {"overall_score": 75}}
+
+def test_session_endpoint_returns_deltas():
+    client = app.test_client()
+    session_id = client.post('/sessions', json={
+        "current_timestamp": 20,
+        "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 80, "emotional_tone": "Neutral"},
+        "deck_content": {"current_slide_number": 1, "total_slides": 9, "slide_topic": "Intro", "ocr_text": "Acme"}
+    }).get_json()["session_id"]
+
+    first = client.post(f'/sessions/{session_id}/frames', json={"transcript_delta": "Hi, we are Acme."}).get_json()
+    assert "dashboard_status" in first["changes"]
+    assert "progress_tracker" in first["changes"]
+
+    # Nothing meaningful changed -> nothing sent back
+    second = client.post(f'/sessions/{session_id}/frames', json={"transcript_delta": "Thanks."}).get_json()
+    assert second["changes"] == {}
+    assert second["version"] == first["version"]
+
+    assert client.delete(f'/sessions/{session_id}').status_code == 200
+    assert client.post(f'/sessions/{session_id}/frames', json={"current_timestamp": 30}).status_code == 404
+
+def test_registry_expires_idle_sessions_and_bounds_size():
+    now = [0.0]
+    expired = []
+    registry = SessionRegistry(max_sessions=2, idle_seconds=60, on_expire=expired.append, clock=lambda: now[0])
+    stream = registry.create(session_id="a").subscribe()
+    registry.create(session_id="b")
+    now[0] = 30
+    assert registry.get("a") is not None
+    registry.create(session_id="c")  # over the cap: "b" was least recently used
+    assert expired == ["b"] and len(registry) == 2
+
+    now[0] = 100
+    assert registry.get("c") is not None
+    assert expired == ["b", "a"]
+    assert stream.get_nowait() is None  # its event stream was closed
+
+    with pytest.raises(SessionExistsError):
+        registry.create(session_id="c")
+
+def test_duplicate_session_id_conflicts():
+    client = app.test_client()
+    assert client.post('/sessions', json={"session_id": "dup-1"}).status_code == 201
+    assert client.post('/sessions', json={"session_id": "dup-1"}).status_code == 409
+    client.delete('/sessions/dup-1')
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_heuristic_only_import_skips_openai():
+    env = dict(os.environ)
+    env.pop("OPENAI_API_KEY", None)
+    code = "import sys, app; app.warm_up(); app.after_fork(); print('openai' in sys.modules)"
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, env=env)
+    assert output.decode().strip().splitlines()[-1] == "False"
+
+def test_dispatcher_reset_after_fork():
+    from services.async_llm import LLMDispatcher
+    dispatcher = LLMDispatcher(None)
+    dispatcher._pending["s1"] = object()
+    dispatcher._loop = object()
+    dispatcher.reset_after_fork()
+    assert dispatcher.pending_count() == 0
+    assert dispatcher._loop is None
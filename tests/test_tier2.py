@@ -0,0 +1,76 @@
+import pytest
+
+from services.tier2_coherence import CoherenceTracker, analyze_coherence
+
+
+def test_analyze_coherence_number_mismatch():
+    res = analyze_coherence("We have 500 users", "Users: 100", "Happy", "Traction")
+    assert res["coherence_score"] == 80
+    assert res["real_time_feedback"][0]["type"] == "CRITICAL_MISMATCH"
+
+def test_analyze_coherence_emotion_mismatch():
+    res = analyze_coherence("This problem is terrible", "Market Pain Points", "Happy", "Market Pain")
+    assert res["coherence_score"] == 85
+    assert res["real_time_feedback"][0]["type"] == "BEHAVIOR_ALERT"
+
+def test_tracker_reports_mismatch_once_but_keeps_score():
+    tracker = CoherenceTracker()
+    first = tracker.update("We have 500 users", "Users: 100", "Neutral", "Traction", "00:10", 2)
+    second = tracker.update("We have 500 users and growing", "Users: 100", "Neutral", "Traction", "00:11", 2)
+
+    assert [f["type"] for f in first["real_time_feedback"]] == ["CRITICAL_MISMATCH"]
+    assert second["real_time_feedback"] == []
+    assert first["coherence_score"] == second["coherence_score"] == 80
+
+def test_tracker_only_scans_new_text():
+    tracker = CoherenceTracker()
+    tracker.update("We have 100 users.", "Users: 100", "Neutral", "Traction", "00:10", 2)
+    assert tracker.consumed == len("We have 100 users.")
+
+    # Numbers split across chunks are not flagged until complete
+    res = tracker.update("We have 100 users. Revenue is 1", "Users: 100", "Neutral", "Traction", "00:11", 2)
+    assert res["real_time_feedback"] == []
+    res = tracker.update("We have 100 users. Revenue is 100 dollars", "Users: 100", "Neutral", "Traction", "00:12", 2)
+    assert res["real_time_feedback"] == []
+
+def test_tracker_resets_numbers_per_slide():
+    tracker = CoherenceTracker()
+    tracker.update("We have 500 users.", "Users: 100", "Neutral", "Traction", "00:10", 2)
+    res = tracker.update("We have 500 users. Next slide.", "Team of 5", "Neutral", "Team", "00:20", 3)
+    # 500 was said on slide 2, it is not re-compared against slide 3
+    assert res["real_time_feedback"] == []
+    assert res["coherence_score"] == 100
+
+def test_number_held_back_at_a_slide_change_belongs_to_the_old_slide():
+    tracker = CoherenceTracker()
+    tracker.update("We have 400", "Users: 100", "Neutral", "Traction", "00:10", 2)
+    res = tracker.update("We have 400 users. Next", "Team of 400 engineers", "Neutral", "Team", "00:20", 3)
+    alerts = res["real_time_feedback"]
+    assert len(alerts) == 1 and "'400'" in alerts[0]["message"] and "'100'" in alerts[0]["message"]
+    assert res["coherence_score"] == 100  # the new slide has no open mismatch
+
+def test_same_length_rewrite_is_rescanned():
+    tracker = CoherenceTracker()
+    tracker.update("We have 100 users today.", "Users: 100", "Neutral", "Traction", "00:10", 2)
+    res = tracker.update("We have 900 users today.", "Users: 100", "Neutral", "Traction", "00:11", 2)
+    assert [item["type"] for item in res["real_time_feedback"]] == ["CRITICAL_MISMATCH"]
+
+def test_rewrite_after_a_slide_change_does_not_recheck_old_slides():
+    tracker = CoherenceTracker()
+    tracker.update("We have 100 users today.", "Users: 100", "Neutral", "Traction", "00:10", 2)
+    tracker.update("We have 100 users today. Next we", "Revenue: $2M", "Neutral", "Traction", "00:20", 3)
+    res = tracker.update("We have 100 users today. Next us", "Revenue: $2M", "Neutral", "Traction", "00:21", 3)
+    assert res["real_time_feedback"] == [] and res["coherence_score"] == 100
+    assert tracker.consumed == len("We have 100 users today. Next us")
+
+    res = tracker.update("We have 100 users today. Next us 5M", "Revenue: $2M", "Neutral", "Traction", "00:22", 3)
+    res = tracker.update("We have 100 users today. Next us $5M ok", "Revenue: $2M", "Neutral", "Traction", "00:23", 3)
+    assert [item["type"] for item in res["real_time_feedback"]] == ["CRITICAL_MISMATCH"]
+
+@pytest.mark.parametrize("emotion, expected", [("Sad", 85), ("Happy", 100)])
+def test_tracker_emotion_alert_deduped(emotion, expected):
+    tracker = CoherenceTracker()
+    first = tracker.update("Meet the founders", "", emotion, "Team", "00:30", 5)
+    second = tracker.update("Meet the founders again", "", emotion, "Team", "00:31", 5)
+    assert first["coherence_score"] == second["coherence_score"] == expected
+    assert second["real_time_feedback"] == []
@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from services.tier1_pacing import analyze_pacing
+from services.tier3_viability import calculate_scores
+from services.vectorized import (
+    PACING_SIGNALS,
+    analyze_pacing_columns,
+    calculate_scores_columns,
+    decode_pacing,
+)
+
+
+def random_frames(n, seed=1234):
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(n):
+        frames.append({
+            # Bias towards the rule boundaries (45s intro, 160/180/200s projections)
+            "timestamp": rng.choice([0, 45, 45.5, 60, 90, 180, 180.5, rng.uniform(0, 240), rng.randint(0, 240)]),
+            "slide": rng.randint(-1, 12),
+            "total": rng.choice([0, 1, 3, 9, 10, 12]),
+            "coherence": rng.choice([0, 45, 65, 80, 85, 100]),
+            "facial": rng.choice([0, 33, 85, 99.5, rng.uniform(0, 100)]),
+            "eye": rng.choice([0, 20, 90, 100, rng.uniform(0, 100)]),
+            "text_len": rng.choice([0, 1, 19, 20, 200, 201, rng.randint(0, 400)]),
+        })
+    return frames
+
+@pytest.mark.parametrize("timestamp, slide, total", [
+    (60, 1, 3), (90, 1, 3), (60, 2, 3), (50, 1, 10), (181, 3, 3), (75, 3, 10), (10, 0, 5)
+])
+def test_pacing_columns_match_tier1_cases(timestamp, slide, total):
+    cols = analyze_pacing_columns([timestamp], [slide], [total])
+    signals, messages = decode_pacing(cols["pacing_code"], cols["message_code"])
+    expected = analyze_pacing(timestamp, slide, total)
+    assert signals[0] == expected["pacing_signal"]
+    assert messages[0] == expected["time_remaining_projection"]
+
+def test_columns_match_scalar_on_random_frames():
+    frames = random_frames(5000)
+    cols = analyze_pacing_columns(
+        [f["timestamp"] for f in frames], [f["slide"] for f in frames], [f["total"] for f in frames]
+    )
+    signals, messages = decode_pacing(cols["pacing_code"], cols["message_code"])
+    scores = calculate_scores_columns(
+        cols["pacing_code"],
+        [f["coherence"] for f in frames],
+        [f["facial"] for f in frames],
+        [f["eye"] for f in frames],
+        [f["text_len"] for f in frames],
+    )
+
+    for i, f in enumerate(frames):
+        tier1 = analyze_pacing(f["timestamp"], f["slide"], f["total"])
+        assert (signals[i], messages[i]) == (tier1["pacing_signal"], tier1["time_remaining_projection"])
+
+        tier3 = calculate_scores(
+            tier1,
+            {"coherence_score": f["coherence"]},
+            {"video_analysis": {"facial_confidence": f["facial"], "eye_contact_percent": f["eye"]},
+             "deck_content": {"ocr_text": "x" * f["text_len"]}}
+        )
+        assert scores["overall_score"][i] == tier3["overall_score"]
+        for key, value in tier3["tiered_analysis"].items():
+            assert scores[key][i] == value
+
+def test_scalar_total_slides_broadcasts():
+    cols = analyze_pacing_columns(np.array([60.0, 170.0]), np.array([2, 3]), 3)
+    assert [PACING_SIGNALS[c] for c in cols["pacing_code"]] == ["Too Fast", "Perfect"]
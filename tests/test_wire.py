@@ -0,0 +1,50 @@
+import pytest
+
+from app import app
+from services import wire
+
+msgpack = pytest.importorskip("msgpack")
+
+FRAME = {
+    "current_timestamp": 60,
+    "audio_analysis": {"transcription": "We have 500 users.", "wpm": 130},
+    "video_analysis": {"facial_confidence": 80, "eye_contact_percent": 80, "emotional_tone": "Neutral"},
+    "deck_content": {"current_slide_number": 2, "total_slides": 10, "ocr_text": "Traction: 10,000 users"}
+}
+
+def test_msgpack_request_and_response_match_json():
+    client = app.test_client()
+    as_json = client.post('/analyze', json=FRAME)
+    as_msgpack = client.post('/analyze', data=msgpack.packb(FRAME), content_type=wire.MSGPACK,
+                             headers={"Accept": wire.MSGPACK})
+    assert as_msgpack.status_code == 200 and as_msgpack.mimetype == wire.MSGPACK
+    assert msgpack.unpackb(as_msgpack.get_data()) == as_json.get_json()
+
+    # MessagePack in, JSON out unless asked for
+    response = client.post('/analyze', data=msgpack.packb(FRAME), content_type="application/x-msgpack")
+    assert response.mimetype == wire.JSON and response.get_json() == as_json.get_json()
+
+def test_session_frames_accept_msgpack_deltas():
+    client = app.test_client()
+    session_id = client.post('/sessions', json=FRAME).get_json()["session_id"]
+    response = client.post(f'/sessions/{session_id}/frames', content_type=wire.MSGPACK,
+                           data=msgpack.packb({"current_timestamp": 70, "transcript_delta": "Now 600."}),
+                           headers={"Accept": "application/json;q=0.5, application/msgpack"})
+    assert response.status_code == 200 and response.mimetype == wire.MSGPACK
+    assert msgpack.unpackb(response.get_data())["version"] == 1
+
+def test_negotiation_defaults_to_json(monkeypatch):
+    client = app.test_client()
+    headers = {"Accept": "application/json, application/msgpack;q=0.5"}
+    assert client.post('/analyze', json=FRAME, headers=headers).mimetype == wire.JSON
+    assert client.post('/analyze', json=FRAME, headers={"Accept": "*/*"}).mimetype == wire.JSON
+
+    monkeypatch.setattr(wire, "msgpack", None)
+    assert client.post('/analyze', json=FRAME, headers={"Accept": wire.MSGPACK}).mimetype == wire.JSON
+    assert client.post('/analyze', data=msgpack.packb(FRAME), content_type=wire.MSGPACK).status_code == 415
+
+def test_malformed_bodies_are_rejected():
+    client = app.test_client()
+    assert client.post('/analyze', data=b"\xc1", content_type=wire.MSGPACK).status_code == 400
+    assert client.post('/analyze', data=b"{nope", content_type=wire.JSON).status_code == 400
+    assert client.post('/analyze', data=b"", content_type=wire.MSGPACK).status_code == 400